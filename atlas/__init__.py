@@ -12,6 +12,8 @@ from atlas.services.market_analysis import MarketAnalyzer
 from atlas.clients.tavily import TavilyClient
 from atlas.clients.perplexity import PerplexityClient
 from atlas.clients.claude import ClaudeClient
+from atlas.clients.llm import llm_response_cache
+from atlas.clients.base import http_pool
 from atlas.services.zoning import ZoningService
 
 logger = logging.getLogger(__name__)
@@ -25,7 +27,19 @@ class ATLAS:
         self.process = PropertyProcessor(self.config)
         self.analyze = AnalysisService(self.config)
         self.market_analysis = MarketAnalyzer(PerplexityClient(self.config))
-        self.claude = ClaudeClient(self.config)
+        self.claude = ClaudeClient(self.config, cache=llm_response_cache(getattr(self.config, 'llm_cache_path', None)))
+
+    async def aclose(self) -> None:
+        """Close the search service, the Claude client and the shared HTTP pool of the running loop."""
+        await self.search.aclose()
+        await self.claude.aclose()
+        await http_pool.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
         
     async def analyze_property(self, address: str) -> Dict:
         logger.info(f"Starting analysis for property: {address}")
@@ -1,6 +1,15 @@
-from .base import BaseClient
+from .base import BaseClient, QueryResult
+from .cache import ResponseCache
+from .singleflight import SingleFlight
+from .ratelimit import RateGovernor, RateLimit
+from .latency import ProviderLatencies
+from .resilience import CircuitOpenError, Resilience, RetryPolicy
 from .tavily import TavilyClient
 from .serper import SerperClient
 from .serpapi import SerpApiClient
+from .hedge import HedgedSearch
+from .llm import LLMClient, LLMRequest
+from .batch import LLMBatcher
+from .fake import FakeLLMClient
 
-__all__ = ['BaseClient', 'TavilyClient', 'SerperClient', 'SerpApiClient']
+__all__ = ['BaseClient', 'QueryResult', 'ResponseCache', 'SingleFlight', 'RateGovernor', 'RateLimit', 'ProviderLatencies', 'Resilience', 'RetryPolicy', 'CircuitOpenError', 'TavilyClient', 'SerperClient', 'SerpApiClient', 'HedgedSearch', 'LLMClient', 'LLMRequest', 'LLMBatcher', 'FakeLLMClient']
@@ -1,53 +1,291 @@
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
+from dataclasses import dataclass
 import httpx
 import asyncio
-from urllib.parse import urljoin
+import importlib.util
+import time
+import logging
+import weakref
+from urllib.parse import urljoin, urlsplit
 from abc import ABC, abstractmethod
+from atlas.clients.cache import ResponseCache
+from atlas.clients.singleflight import SingleFlight, request_flights
+from atlas.clients.ratelimit import RateGovernor, rate_governor
+from atlas.clients.latency import ProviderLatencies, provider_latencies
+from atlas.clients.resilience import RETRYABLE_STATUS, Resilience, UpstreamError
+from atlas.clients.resilience import resilience as shared_resilience
 
-__all__ = ['BaseClient', 'BaseAPIClient']
+__all__ = ['BaseClient', 'BaseAPIClient', 'PoolLimits', 'ConnectionPoolManager', 'QueryResult', 'http_pool']
+
+logger = logging.getLogger(__name__)
+
+# Queries of one fan-out sent at once; the provider's rate limiter still applies on top
+DEFAULT_MAX_CONCURRENCY = 4
+
+@dataclass
+class PoolLimits:
+    """Connection pool settings for one host."""
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+    def to_httpx(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+class ConnectionPoolManager:
+    """Long-lived httpx.AsyncClient per host, shared by all API clients.
+
+    Each host gets its own client, and with it its own connection pool
+    and limits, so connections (and their TCP/TLS handshakes) are reused
+    across requests and across client instances. httpx connections are
+    bound to the event loop that opened them, so clients are kept per
+    running loop; `aclose` closes those of the current loop.
+    """
+
+    def __init__(self, default_limits: Optional[PoolLimits] = None,
+                 host_limits: Optional[Dict[str, PoolLimits]] = None):
+        self.default_limits = default_limits or PoolLimits()
+        self.host_limits: Dict[str, PoolLimits] = dict(host_limits or {})
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = \
+            weakref.WeakKeyDictionary()
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = \
+            weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def host(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def configure(self, host: str, limits: PoolLimits) -> None:
+        """Set the limits for a host; applies to clients opened afterwards."""
+        self.host_limits[self.host(host) if '://' in host else host] = limits
+
+    def limits_for(self, host: str) -> PoolLimits:
+        return self.host_limits.get(host, self.default_limits)
+
+    def _open(self, host: str) -> httpx.AsyncClient:
+        limits = self.limits_for(host)
+        http2 = limits.http2
+        if http2 and importlib.util.find_spec('h2') is None:
+            logger.warning(f"HTTP/2 requested for {host} but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        return httpx.AsyncClient(limits=limits.to_httpx(), http2=http2)
+
+    async def client(self, url: str) -> httpx.AsyncClient:
+        """The shared client for the host of `url`, opened on first use."""
+        loop = asyncio.get_running_loop()
+        host = self.host(url)
+        clients = self._clients.setdefault(loop, {})
+        if host in clients:
+            return clients[host]
+        lock = self._locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            if host not in clients:
+                clients[host] = await self._open(host).__aenter__()
+                logger.debug(f"Opened pooled HTTP client for {host}")
+            return clients[host]
+
+    async def aclose(self) -> None:
+        """Close all clients opened on the running loop."""
+        clients = self._clients.pop(asyncio.get_running_loop(), {})
+        for host, client in clients.items():
+            try:
+                await client.__aexit__(None, None, None)
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client for {host}: {e}")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+# Process-wide pool used by every client unless one is passed explicitly
+http_pool = ConnectionPoolManager()
+
+@dataclass
+class QueryResult:
+    """Outcome of one query of a fan-out; `error` is set instead of raising."""
+    index: int
+    query: Any
+    result: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+async def fan_out(fn: Callable[..., Awaitable[Any]], queries: Sequence[Any],
+                  max_concurrency: int = DEFAULT_MAX_CONCURRENCY, **kwargs) -> AsyncIterator[QueryResult]:
+    """Run `fn(query, **kwargs)` for every query, yielding results as they finish.
+
+    At most `max_concurrency` calls run at once. Exceptions are captured
+    per query. Calls still running when the consumer stops iterating are
+    cancelled.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(index: int, query: Any) -> QueryResult:
+        async with semaphore:
+            try:
+                return QueryResult(index, query, result=await fn(query, **kwargs))
+            except Exception as e:
+                return QueryResult(index, query, error=e)
+
+    tasks = [asyncio.ensure_future(run(i, query)) for i, query in enumerate(queries)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
 class BaseClient(ABC):
     """Base class for API clients"""
-    
-    def __init__(self, api_key: str):
+
+    # Name of the upstream provider, used for cache keys and TTLs
+    provider = ""
+
+    def __init__(self, api_key: str, pool: Optional[ConnectionPoolManager] = None,
+                 cache: Optional[ResponseCache] = None, flights: Optional[SingleFlight] = None,
+                 governor: Optional[RateGovernor] = None, latencies: Optional[ProviderLatencies] = None,
+                 resilience: Optional[Resilience] = None):
         self.api_key = api_key
-        self.client = httpx.Client()
-        
+        self.pool = pool or http_pool
+        self.cache = cache
+        self.flights = flights or request_flights
+        self.governor = governor or rate_governor
+        self.latencies = latencies or provider_latencies
+        self.resilience = resilience or shared_resilience
+
+    async def _http(self, url: str) -> httpx.AsyncClient:
+        """Shared pooled client for `url`; must not be closed by the caller."""
+        return await self.pool.client(url)
+
+    async def _cached(self, query: str, params: Optional[Dict],
+                      fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Result of `fetch`, served from the response cache when one is set.
+
+        Concurrent identical requests share a single upstream call, which
+        waits for the provider's rate limiter.
+        """
+        key = ResponseCache.key(self.provider, query, params)
+
+        async def governed():
+            async with self.governor.slot(self.provider):
+                started = time.monotonic()
+                try:
+                    result = await fetch()
+                except asyncio.CancelledError:
+                    # A call cancelled after t seconds took at least t; dropping it would hide the tail
+                    self.latencies.observe(self.provider, time.monotonic() - started)
+                    raise
+                self.latencies.observe(self.provider, time.monotonic() - started)
+                return result
+
+        async def coalesced():
+            return await self.flights.do(key, governed)
+
+        if self.cache is None:
+            return await coalesced()
+        return await self.cache.get_or_fetch(self.provider, query, params, coalesced)
+
+    async def _send(self, method: str, url: str, client: Optional[httpx.AsyncClient] = None,
+                    **kwargs) -> httpx.Response:
+        """`client.<method>(url, **kwargs)` behind the host's circuit breaker.
+
+        Transport errors and throttling / server error statuses are retried
+        with jittered backoff within the host's retry budget. The last
+        response is returned even if it is an error, so callers report it
+        as before. Runs inside the provider's governor slot (see `_cached`),
+        whose token covers the first attempt; every retry takes a token of
+        its own.
+        """
+        attempts = 0
+
+        async def attempt() -> httpx.Response:
+            nonlocal attempts
+            if attempts:
+                await self.governor.limiter(self.provider).acquire()
+            attempts += 1
+            http = client or await self._http(url)
+            response = await getattr(http, method)(url, **kwargs)
+            self._observe(response)
+            if response.status_code in RETRYABLE_STATUS:
+                raise UpstreamError(f"{self.provider} returned {response.status_code}", response)
+            return response
+
+        try:
+            return await self.resilience.call(self.pool.host(url), attempt)
+        except UpstreamError as e:
+            return e.response
+
+    def _observe(self, response: httpx.Response) -> None:
+        """Let the rate limiter adapt to throttling (429, Retry-After) and recovery."""
+        self.governor.limiter(self.provider).observe(
+            response.status_code, response.headers.get('Retry-After')
+        )
+
     @abstractmethod
     def search(self, query: str, **kwargs) -> Dict[str, Any]:
         """Execute search query"""
         pass
-        
-    def __del__(self):
-        self.client.close()
+
+    async def search_many(self, queries: Sequence[str], max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                          **kwargs) -> List[QueryResult]:
+        """Run `search` for every query concurrently; results come back in input order."""
+        results = [result async for result in fan_out(self.search, queries, max_concurrency, **kwargs)]
+        return sorted(results, key=lambda result: result.index)
+
+    def search_as_completed(self, queries: Sequence[str], max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                            **kwargs) -> AsyncIterator[QueryResult]:
+        """Like `search_many`, but yields each result as soon as its query finishes."""
+        return fan_out(self.search, queries, max_concurrency, **kwargs)
 
 
 class BaseAPIClient:
     """Base class for API clients with common functionality"""
-    
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None,
+                 pool: Optional[ConnectionPoolManager] = None, resilience: Optional[Resilience] = None):
         self.base_url = base_url
         self.api_key = api_key
-        self._client = httpx.AsyncClient()
-        
+        self.pool = pool or http_pool
+        self.resilience = resilience or shared_resilience
+
     async def __aenter__(self):
         return self
-        
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self._client.aclose()
-        
+        # Connections belong to the shared pool and outlive this client
+        pass
+
     async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make HTTP request with error handling"""
+        """Make HTTP request with error handling, retries and circuit breaking"""
         url = urljoin(self.base_url, endpoint)
-        
+
         # Add API key if provided
         headers = kwargs.pop('headers', {})
         if self.api_key:
             headers['Authorization'] = f'Bearer {self.api_key}'
-            
-        try:
-            response = await self._client.request(method, url, headers=headers, **kwargs)
+
+        async def attempt() -> Dict[str, Any]:
+            client = await self.pool.client(url)
+            response = await client.request(method, url, headers=headers, **kwargs)
             response.raise_for_status()
             return response.json()
+
+        try:
+            return await self.resilience.call(self.pool.host(url), attempt)
         except httpx.HTTPError as e:
             raise Exception(f"API request failed: {str(e)}")
@@ -0,0 +1,120 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import json
+import logging
+
+from atlas.clients.base import DEFAULT_MAX_CONCURRENCY, QueryResult, fan_out
+from atlas.clients.llm import LLMClient
+
+__all__ = ['LLMBatcher']
+
+logger = logging.getLogger(__name__)
+
+Batch = List[Tuple[int, Any]]
+
+class LLMBatcher:
+    """Sends many small items to an LLM in a few structured prompts.
+
+    Items are packed `batch_size` at a time into one prompt listing them
+    as JSON objects with an `id`, and the model answers with a JSON array
+    of `{"id", "result"}` objects. Answers are mapped back to items by id;
+    items with a missing answer, or one rejected by `validate`, are
+    retried in fresh batches up to `max_attempts` times, and so are the
+    items of a batch whose call failed or whose reply was not JSON. The
+    first round runs at temperature 0 (cacheable); retries sample at
+    `retry_temperature` so they neither hit the cached bad reply nor
+    repeat it.
+    """
+
+    def __init__(self, llm: LLMClient, instructions: str, result_format: str, batch_size: int = 50,
+                 max_attempts: int = 3, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_tokens: int = 4096, system: Optional[str] = None,
+                 validate: Optional[Callable[[Any, Any], bool]] = None, retry_temperature: float = 0.2):
+        if batch_size < 1 or max_attempts < 1:
+            raise ValueError("batch_size and max_attempts must be at least 1")
+        self.llm = llm
+        self.instructions = instructions
+        self.result_format = result_format
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.max_concurrency = max_concurrency
+        self.max_tokens = max_tokens
+        self.system = system
+        self.validate = validate
+        self.retry_temperature = retry_temperature
+        self.round_trips = 0
+        self.retried = 0
+
+    def prompt(self, batch: Batch) -> str:
+        inputs = json.dumps([{"id": index, "input": item} for index, item in batch], default=str)
+        return (
+            f"{self.instructions}\n\n"
+            f"Inputs, as a JSON array of objects with \"id\" and \"input\":\n{inputs}\n\n"
+            f"Respond with ONLY a JSON array holding one object per input, in the form "
+            f"{{\"id\": <id of the input>, \"result\": {self.result_format}}}."
+        )
+
+    @staticmethod
+    def parse(text: str) -> Dict[int, Any]:
+        """Results by id from a reply; entries without a usable id are skipped."""
+        start, end = text.find('['), text.rfind(']')
+        if start < 0 or end < start:
+            raise ValueError("No JSON array in LLM reply")
+        answers = json.loads(text[start:end + 1])
+        if not isinstance(answers, list):
+            raise ValueError("LLM reply is not a JSON array")
+        results = {}
+        for answer in answers:
+            if not isinstance(answer, dict) or "result" not in answer:
+                continue
+            try:
+                results[int(answer.get("id"))] = answer["result"]
+            except (TypeError, ValueError):
+                continue
+        return results
+
+    async def _send(self, batch: Batch, temperature: float) -> Dict[int, Any]:
+        reply = await self.llm.complete(self.prompt(batch), system=self.system,
+                                        max_tokens=self.max_tokens, temperature=temperature)
+        return self.parse(reply)
+
+    def _accepts(self, item: Any, result: Any) -> bool:
+        return self.validate is None or self.validate(item, result)
+
+    async def run(self, items: Sequence[Any]) -> List[QueryResult]:
+        """One result per item, in input order; `error` is set for items never answered."""
+        results: Dict[int, Any] = {}
+        errors: Dict[int, Exception] = {}
+        pending: Batch = list(enumerate(items))
+
+        for attempt in range(self.max_attempts):
+            if not pending:
+                break
+            if attempt:
+                self.retried += len(pending)
+                logger.info(f"Retrying {len(pending)} unanswered items (attempt {attempt + 1})")
+            temperature = self.retry_temperature if attempt else 0.0
+            batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+            self.round_trips += len(batches)
+            failed: Batch = []
+            async for outcome in fan_out(self._send, batches, self.max_concurrency, temperature=temperature):
+                if not outcome.ok:
+                    logger.warning(f"LLM batch of {len(outcome.query)} items failed: {outcome.error}")
+                    errors.update((index, outcome.error) for index, _ in outcome.query)
+                    failed.extend(outcome.query)
+                    continue
+                for index, item in outcome.query:
+                    if index in outcome.result and self._accepts(item, outcome.result[index]):
+                        results[index] = outcome.result[index]
+                    else:
+                        errors[index] = ValueError(f"No valid answer for item {index}")
+                        failed.append((index, item))
+            pending = sorted(failed, key=lambda entry: entry[0])
+
+        return [
+            QueryResult(index, item, result=results[index]) if index in results
+            else QueryResult(index, item, error=errors.get(index))
+            for index, item in enumerate(items)
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        return {"round_trips": self.round_trips, "retried": self.retried}
@@ -0,0 +1,211 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from dataclasses import dataclass
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from atlas.core.cache import LRUCache, content_hash
+
+__all__ = ['CachedResponse', 'ResponseCache', 'DEFAULT_TTLS', 'normalize_query']
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600.0
+
+# Seconds a provider response is served without revalidation
+DEFAULT_TTLS = {
+    "tavily": 6 * HOUR,
+    "serper": 24 * HOUR,
+    "serpapi": 24 * HOUR,
+    "unstructured": 30 * 24 * HOUR,
+    # Temperature-0 completions; only a model or prompt change should invalidate them
+    "anthropic": 30 * 24 * HOUR
+}
+DEFAULT_TTL = 24 * HOUR
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return " ".join(str(query).lower().split())
+
+@dataclass
+class CachedResponse:
+    value: Any
+    stored_at: float
+    expires_at: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+class ResponseCache:
+    """TTL cache for provider responses: an in-memory LRU in front of SQLite.
+
+    Entries are keyed by provider, normalized query and request params.
+    A response is fresh for the provider's TTL. After that it is stale
+    but, for another `stale_while_revalidate` seconds, still served
+    immediately while a background fetch refreshes it; older entries are
+    refetched before returning. Without `path` only the in-memory level
+    is used. Values must be JSON-serializable.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None,
+                 stale_while_revalidate: float = HOUR, max_memory_entries: int = 1024,
+                 max_disk_entries: int = 100_000, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_disk_entries = max_disk_entries
+        self.clock = clock
+        self.memory = LRUCache(max_memory_entries)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, provider TEXT, value TEXT, "
+                "stored_at REAL, expires_at REAL, accessed_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+
+    def ttl(self, provider: str) -> float:
+        return self.ttls.get(provider, DEFAULT_TTL)
+
+    @staticmethod
+    def key(provider: str, query: str, params: Optional[Dict] = None) -> str:
+        return f"{provider}:{content_hash(normalize_query(query), params or {})}"
+
+    def _load(self, key: str) -> Tuple[Optional[CachedResponse], bool]:
+        """The entry for `key` and whether it had to be read from disk."""
+        entry = self.memory.get(key)
+        if entry is not None or self._db is None:
+            return entry, False
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, stored_at, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, False
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (self.clock(), key))
+        entry = CachedResponse(json.loads(row[0]), row[1], row[2])
+        self.memory.put(key, entry)
+        return entry, True
+
+    def get(self, provider: str, query: str, params: Optional[Dict] = None) -> Optional[CachedResponse]:
+        """Cached entry, fresh or stale, without counting a lookup."""
+        return self._load(self.key(provider, query, params))[0]
+
+    def lookup(self, provider: str, query: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """Fresh cached value or None, counted as a hit or miss (for callers that store with `set`)."""
+        entry, from_disk = self._load(self.key(provider, query, params))
+        if entry is None or not entry.is_fresh(self.clock()):
+            self.misses += 1
+            return None
+        if from_disk:
+            self.disk_hits += 1
+        else:
+            self.memory_hits += 1
+        return entry.value
+
+    def set(self, provider: str, query: str, value: Any, params: Optional[Dict] = None) -> None:
+        self._store(self.key(provider, query, params), provider, value)
+
+    def _store(self, key: str, provider: str, value: Any) -> None:
+        now = self.clock()
+        entry = CachedResponse(value, now, now + self.ttl(provider))
+        self.memory.put(key, entry)
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, json.dumps(value), entry.stored_at, entry.expires_at, now)
+            )
+            # Evict least recently used rows beyond the cap
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)", (self.max_disk_entries,)
+            )
+
+    async def get_or_fetch(self, provider: str, query: str, params: Optional[Dict],
+                           fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached response if usable, otherwise the result of `fetch` (which is then cached).
+
+        Errors raised by `fetch` propagate and are never cached.
+        """
+        key = self.key(provider, query, params)
+        entry, from_disk = self._load(key)
+        now = self.clock()
+        if entry is not None:
+            if entry.is_fresh(now):
+                if from_disk:
+                    self.disk_hits += 1
+                else:
+                    self.memory_hits += 1
+                return entry.value
+            if now < entry.expires_at + self.stale_while_revalidate:
+                self.stale_hits += 1
+                self._revalidate(key, provider, fetch)
+                return entry.value
+        self.misses += 1
+        value = await fetch()
+        self._store(key, provider, value)
+        return value
+
+    def _revalidate(self, key: str, provider: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                self._store(key, provider, await fetch())
+                self.refreshes += 1
+            except Exception as e:
+                logger.warning(f"Background refresh of {provider} response failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.get_running_loop().create_task(refresh())
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self._db is not None:
+            with self._lock:
+                self._db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def disk_size(self) -> int:
+        if self._db is None:
+            return 0
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        hits = self.memory_hits + self.disk_hits + self.stale_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "memory_size": len(self.memory),
+            "disk_size": self.disk_size(),
+            "evictions": self.memory.evictions,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
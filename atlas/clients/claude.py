@@ -1,27 +1,82 @@
 import anthropic
+import json
 import logging
-from typing import Dict
+from typing import AsyncIterator, Dict, Optional
 from ..core.config import AIConfig
+from .cache import ResponseCache
+from .llm import LLMClient, LLMRequest
+from .ratelimit import rate_governor
+from .resilience import is_retryable, resilience
 
 logger = logging.getLogger(__name__)
 
-class ClaudeClient:
-    def __init__(self, config: AIConfig):
-        self.client = anthropic.Client(api_key=config.claude_api_key)
-    
+DEFAULT_MODEL = "claude-3-sonnet-20240229"
+ANTHROPIC_HOST = "api.anthropic.com"
+ANALYST_SYSTEM = "You are an expert CRE analyst. Analyze the provided property data and generate insights."
+
+def _retryable(error: BaseException) -> bool:
+    return is_retryable(error) or isinstance(error, anthropic.APIConnectionError)
+
+class ClaudeClient(LLMClient):
+    """Claude over the async Anthropic SDK, so generations never block the event loop."""
+
+    provider = "anthropic"
+
+    def __init__(self, config: AIConfig, model: str = DEFAULT_MODEL,
+                 max_concurrency: Optional[Dict[str, int]] = None, cache: Optional[ResponseCache] = None):
+        super().__init__(model, max_concurrency, cache=cache)
+        # Retries are left to the shared resilience layer
+        self.client = anthropic.AsyncAnthropic(api_key=config.claude_api_key, max_retries=0)
+
+    def _params(self, request: LLMRequest) -> Dict:
+        params = {
+            "model": request.model,
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature,
+            "messages": request.messages()
+        }
+        if request.system:
+            params["system"] = request.system
+        return params
+
+    async def _complete(self, request: LLMRequest) -> str:
+        async def call() -> str:
+            async with rate_governor.slot("anthropic"):
+                response = await self.client.messages.create(**self._params(request))
+            return "".join(block.text for block in response.content if getattr(block, "type", "text") == "text")
+        return await resilience.call(ANTHROPIC_HOST, call, retryable=_retryable)
+
+    async def _stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        # Behind the breaker but not retried: chunks may already have reached the caller
+        breaker = resilience.breaker(ANTHROPIC_HOST)
+        breaker.before_call()
+        try:
+            async with rate_governor.slot("anthropic"):
+                async with self.client.messages.stream(**self._params(request)) as stream:
+                    async for text in stream.text_stream:
+                        yield text
+        except Exception as e:
+            # Same rule as Resilience: throttling (429) is not an outage
+            if _retryable(e) and getattr(e, 'status_code', None) != 429:
+                breaker.on_failure()
+            else:
+                breaker.on_neutral()
+            raise
+        except BaseException:
+            # Cancelled or closed early by the consumer
+            breaker.on_neutral()
+            raise
+        breaker.on_success()
+
+    async def aclose(self) -> None:
+        await self.client.close()
+        await super().aclose()
+
     async def generate(self, context: Dict) -> str:
         try:
-            response = await self.client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=4096,
-                temperature=0.0,
-                system="You are an expert CRE analyst. Analyze the provided property data and generate insights.",
-                messages=[{
-                    "role": "user",
-                    "content": str(context)
-                }]
-            )
-            return response.content
+            # Sorted keys: the same context always gives the same prompt, and cache key
+            prompt = json.dumps(context, sort_keys=True, default=str)
+            return await self.complete(prompt, system=ANALYST_SYSTEM, max_tokens=4096, temperature=0.0)
         except Exception as e:
             logger.error(f"Claude generation error: {e}")
-            return "" 
\ No newline at end of file
+            return ""
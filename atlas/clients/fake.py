@@ -0,0 +1,49 @@
+from typing import AsyncIterator, Callable, List
+import asyncio
+import json
+import re
+
+from atlas.clients.llm import LLMClient, LLMRequest
+
+__all__ = ['FakeLLMClient', 'echo_batch']
+
+_BATCH_INPUTS = re.compile(r'Inputs, as a JSON array[^\n]*\n(\[.*?\])\n\nRespond', re.S)
+
+def echo_batch(answer: Callable[[object], object]) -> Callable[[LLMRequest], str]:
+    """Responder that answers every input of an `LLMBatcher` prompt with `answer(input)`."""
+    def respond(request: LLMRequest) -> str:
+        match = _BATCH_INPUTS.search(request.prompt)
+        inputs = json.loads(match.group(1)) if match else []
+        return json.dumps([{"id": entry["id"], "result": answer(entry["input"])} for entry in inputs])
+    return respond
+
+class FakeLLMClient(LLMClient):
+    """Local stand-in for an LLM provider, for tests and offline runs.
+
+    Replies come from `responder(request)`, which may also raise to
+    simulate provider errors. Every request is recorded in `requests`.
+    Streams split the reply on whitespace.
+    """
+
+    provider = "fake"
+
+    def __init__(self, responder: Callable[[LLMRequest], str], model: str = "fake-model",
+                 delay: float = 0.0, **kwargs):
+        super().__init__(model, **kwargs)
+        self.responder = responder
+        self.delay = delay
+        self.requests: List[LLMRequest] = []
+
+    async def _reply(self, request: LLMRequest) -> str:
+        self.requests.append(request)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.responder(request)
+
+    async def _complete(self, request: LLMRequest) -> str:
+        return await self._reply(request)
+
+    async def _stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        for word in (await self._reply(request)).split(" "):
+            await asyncio.sleep(0)
+            yield word + " "
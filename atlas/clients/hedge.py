@@ -0,0 +1,87 @@
+from typing import Any, Dict, List, Optional, Sequence
+import asyncio
+import logging
+
+from atlas.clients.base import DEFAULT_MAX_CONCURRENCY, BaseClient, QueryResult, fan_out
+from atlas.clients.latency import ProviderLatencies, provider_latencies
+
+__all__ = ['HedgedSearch']
+
+logger = logging.getLogger(__name__)
+
+class HedgedSearch:
+    """Sends a query to `primary` and, if it is slow, a duplicate to `secondary`.
+
+    The duplicate goes out once the primary has been pending for its
+    recent p95 latency (`quantile`), so roughly one query in twenty is
+    hedged. The first successful answer wins and the other request is
+    cancelled. A primary that fails before the hedge delay falls over to
+    the secondary straight away. Until `min_samples` latencies have been
+    seen the hedge waits `default_delay`. Latencies are recorded by the
+    clients for upstream calls only, so cache hits do not skew them.
+    """
+
+    def __init__(self, primary: BaseClient, secondary: BaseClient,
+                 latencies: Optional[ProviderLatencies] = None, quantile: float = 0.95,
+                 min_delay: float = 0.05, default_delay: float = 1.0, min_samples: int = 20):
+        self.primary = primary
+        self.secondary = secondary
+        self.latencies = latencies or provider_latencies
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedged = 0
+        self.secondary_wins = 0
+
+    def hedge_delay(self) -> float:
+        histogram = self.latencies.histogram(self.primary.provider)
+        delay = histogram.quantile(self.quantile)
+        if delay is None or histogram.samples < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, delay)
+
+    async def search(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+        self.requests += 1
+        primary = asyncio.ensure_future(self.primary.search(query, **kwargs))
+        tasks = {primary: self.primary}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay())
+            if done and not primary.exception():
+                return primary.result()
+
+            self.hedged += 1
+            secondary = asyncio.ensure_future(self.secondary.search(query, **kwargs))
+            tasks[secondary] = self.secondary
+            pending = {task for task in tasks if not task.done()}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.exception():
+                        if task is secondary:
+                            self.secondary_wins += 1
+                        return task.result()
+            # Both failed: report the primary's error
+            for task, client in tasks.items():
+                if task is not primary:
+                    logger.warning(f"Hedged {client.provider} search also failed: {task.exception()}")
+            raise primary.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def search_many(self, queries: Sequence[str], max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                          **kwargs) -> List[QueryResult]:
+        results = [result async for result in fan_out(self.search, queries, max_concurrency, **kwargs)]
+        return sorted(results, key=lambda result: result.index)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "secondary_wins": self.secondary_wins,
+            "hedge_ratio": self.hedged / self.requests if self.requests else 0.0,
+            "hedge_delay": self.hedge_delay()
+        }
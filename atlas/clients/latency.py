@@ -0,0 +1,80 @@
+from typing import Dict, List, Optional
+import bisect
+import math
+import threading
+
+__all__ = ['LatencyHistogram', 'ProviderLatencies', 'provider_latencies']
+
+def _bucket_bounds(low: float = 0.005, high: float = 60.0, per_doubling: int = 4) -> List[float]:
+    """Log-spaced bucket upper bounds, `per_doubling` buckets per factor of two."""
+    count = int(math.ceil(math.log2(high / low) * per_doubling))
+    return [low * 2 ** (i / per_doubling) for i in range(count + 1)]
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram that favours recent samples.
+
+    Once `window` samples have been recorded all counts are halved, so
+    the quantiles follow a provider whose latency drifts over minutes
+    instead of averaging over its whole history.
+    """
+
+    BOUNDS = _bucket_bounds()
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self.counts = [0.0] * (len(self.BOUNDS) + 1)
+        self.total = 0.0
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+            self.total += 1
+            self.samples += 1
+            if self.total >= self.window:
+                self.counts = [count / 2 for count in self.counts]
+                self.total /= 2
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding quantile `q`, or None without samples."""
+        with self._lock:
+            if not self.total:
+                return None
+            target = q * self.total
+            seen = 0.0
+            for i, count in enumerate(self.counts):
+                seen += count
+                if seen >= target and count:
+                    return self.BOUNDS[min(i, len(self.BOUNDS) - 1)]
+            return self.BOUNDS[-1]
+
+class ProviderLatencies:
+    """Latency histograms per provider, shared by everything that hedges."""
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, provider: str) -> LatencyHistogram:
+        with self._lock:
+            histogram = self._histograms.get(provider)
+            if histogram is None:
+                histogram = self._histograms[provider] = LatencyHistogram(self.window)
+            return histogram
+
+    def observe(self, provider: str, seconds: float) -> None:
+        self.histogram(provider).observe(seconds)
+
+    def quantile(self, provider: str, q: float) -> Optional[float]:
+        return self.histogram(provider).quantile(q)
+
+    def stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        return {
+            name: {"samples": h.samples, "p50": h.quantile(0.5), "p95": h.quantile(0.95), "p99": h.quantile(0.99)}
+            for name, h in list(self._histograms.items())
+        }
+
+# Process-wide, fed by every upstream call so hedging sees each provider's real latency
+provider_latencies = ProviderLatencies()
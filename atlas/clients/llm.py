@@ -0,0 +1,154 @@
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import asyncio
+import logging
+import weakref
+
+from atlas.clients.base import DEFAULT_MAX_CONCURRENCY, QueryResult, fan_out
+from atlas.clients.cache import ResponseCache
+from atlas.core.cache import content_hash
+
+__all__ = ['LLMRequest', 'LLMClient', 'DEFAULT_MODEL_CONCURRENCY', 'canonical_prompt', 'llm_response_cache']
+
+logger = logging.getLogger(__name__)
+
+# Generations of one model in flight at once, per client and event loop
+DEFAULT_MODEL_CONCURRENCY = 4
+
+def canonical_prompt(text: Optional[str]) -> str:
+    """Prompt with whitespace runs collapsed, so indentation changes hit the same cache entry."""
+    return " ".join((text or "").split())
+
+def llm_response_cache(path: Optional[str] = None, max_entries: int = 50_000) -> ResponseCache:
+    """Response cache for completions: never served stale, at most `max_entries` on disk."""
+    return ResponseCache(path, stale_while_revalidate=0, max_disk_entries=max_entries)
+
+@dataclass
+class LLMRequest:
+    """One generation: a user prompt plus model settings."""
+    prompt: str
+    model: str
+    system: Optional[str] = None
+    max_tokens: int = 1024
+    temperature: float = 0.0
+
+    def messages(self) -> List[Dict[str, str]]:
+        return [{"role": "user", "content": self.prompt}]
+
+    @property
+    def cacheable(self) -> bool:
+        # Sampled output differs between calls, so only greedy decoding is reused
+        return self.temperature == 0
+
+    def cache_key(self) -> str:
+        return content_hash(self.model, canonical_prompt(self.system), canonical_prompt(self.prompt),
+                            self.max_tokens)
+
+class LLMClient(ABC):
+    """Async LLM client with a per-model concurrency cap.
+
+    `complete` returns the whole text, `stream` yields it chunk by chunk
+    as the model produces it. Both hold one of the model's slots for the
+    duration of the generation, so a burst of callers queues instead of
+    flooding the provider while the event loop stays free for other
+    pipeline stages. Cancelling the awaiting task, or leaving a `stream`
+    loop early, aborts the generation and releases the slot.
+
+    With a `cache`, temperature-0 completions are stored under the model
+    and a hash of the canonicalized prompt and reused across runs.
+    """
+
+    # Cache namespace and TTL key
+    provider = "llm"
+
+    def __init__(self, model: str, max_concurrency: Optional[Dict[str, int]] = None,
+                 default_concurrency: int = DEFAULT_MODEL_CONCURRENCY, cache: Optional[ResponseCache] = None):
+        self.model = model
+        self.cache = cache
+        self.max_concurrency = dict(max_concurrency or {})
+        self.default_concurrency = default_concurrency
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+            weakref.WeakKeyDictionary()
+        self.in_flight: Dict[str, int] = {}
+
+    def _request(self, prompt: str, model: Optional[str] = None, **options) -> LLMRequest:
+        return LLMRequest(prompt=prompt, model=model or self.model, **options)
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        semaphore = semaphores.get(model)
+        if semaphore is None:
+            limit = self.max_concurrency.get(model, self.default_concurrency)
+            semaphore = semaphores[model] = asyncio.Semaphore(limit)
+        return semaphore
+
+    @asynccontextmanager
+    async def _slot(self, model: str) -> AsyncIterator[None]:
+        async with self._semaphore(model):
+            self.in_flight[model] = self.in_flight.get(model, 0) + 1
+            try:
+                yield
+            finally:
+                self.in_flight[model] -= 1
+
+    async def complete(self, prompt: str, model: Optional[str] = None, **options) -> str:
+        """Full text of one generation; `options` are `LLMRequest` fields."""
+        request = self._request(prompt, model, **options)
+
+        async def generate() -> str:
+            async with self._slot(request.model):
+                return await self._complete(request)
+
+        if self.cache is None or not request.cacheable:
+            return await generate()
+        return await self.cache.get_or_fetch(self.provider, request.cache_key(), None, generate)
+
+    async def stream(self, prompt: str, model: Optional[str] = None, **options) -> AsyncIterator[str]:
+        """Text chunks of one generation as they arrive; a cached completion comes as one chunk."""
+        request = self._request(prompt, model, **options)
+        cacheable = self.cache is not None and request.cacheable
+        if cacheable:
+            cached = self.cache.lookup(self.provider, request.cache_key())
+            if cached is not None:
+                yield cached
+                return
+
+        received = []
+        async with self._slot(request.model):
+            chunks = self._stream(request)
+            try:
+                async for chunk in chunks:
+                    received.append(chunk)
+                    yield chunk
+            finally:
+                await chunks.aclose()
+        # Only reached when the stream ran to completion
+        if cacheable:
+            self.cache.set(self.provider, request.cache_key(), "".join(received))
+
+    async def complete_many(self, prompts: Sequence[str], max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                            **options) -> List[QueryResult]:
+        """Complete several prompts concurrently; results come back in input order."""
+        results = [result async for result in fan_out(self.complete, prompts, max_concurrency, **options)]
+        return sorted(results, key=lambda result: result.index)
+
+    async def aclose(self) -> None:
+        """Release the provider connection and close the response cache."""
+        if self.cache is not None:
+            self.cache.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    @abstractmethod
+    async def _complete(self, request: LLMRequest) -> str:
+        """Run one generation against the provider."""
+
+    @abstractmethod
+    def _stream(self, request: LLMRequest) -> AsyncIterator[str]:
+        """Async generator of text chunks for one generation."""
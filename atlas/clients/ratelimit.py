@@ -0,0 +1,230 @@
+from typing import AsyncIterator, Dict, Iterator, Optional, Union
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import asyncio
+import logging
+import threading
+import time
+import weakref
+
+__all__ = ['RateLimit', 'TokenBucket', 'ProviderLimiter', 'RateGovernor', 'DEFAULT_RATE_LIMITS',
+           'parse_retry_after', 'rate_governor']
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class RateLimit:
+    """Quota for one provider.
+
+    `rate` is the sustained requests per second, `burst` how many can be
+    sent back to back after an idle period and `max_in_flight` how many
+    may be outstanding at once.
+    """
+    rate: float
+    burst: int = 1
+    max_in_flight: int = 4
+
+DEFAULT_RATE_LIMITS = {
+    "tavily": RateLimit(rate=5.0, burst=10, max_in_flight=5),
+    "serper": RateLimit(rate=10.0, burst=20, max_in_flight=10),
+    "serpapi": RateLimit(rate=2.0, burst=5, max_in_flight=4),
+    "unstructured": RateLimit(rate=2.0, burst=4, max_in_flight=2),
+    "anthropic": RateLimit(rate=0.8, burst=5, max_in_flight=4),
+    "google_maps": RateLimit(rate=50.0, burst=50, max_in_flight=10),
+    # Nominatim usage policy: at most one request per second
+    "nominatim": RateLimit(rate=1.0, burst=1, max_in_flight=1)
+}
+DEFAULT_RATE_LIMIT = RateLimit(rate=10.0, burst=10, max_in_flight=10)
+
+# Throttling halves the rate; each success wins back this share of the configured rate
+BACKOFF_FACTOR = 0.5
+RECOVERY_STEP = 0.05
+MIN_RATE_SHARE = 0.05
+
+def parse_retry_after(value: Union[str, float, int, None], default: float = 1.0) -> float:
+    """Seconds to wait from a Retry-After header (delta seconds or HTTP date)."""
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class TokenBucket:
+    """Token bucket where callers reserve a token and are told how long to wait.
+
+    Tokens may go negative: each reservation queues behind the earlier
+    ones, so waiters are released at exactly `rate` per second. Safe to
+    use from several threads.
+    """
+
+    def __init__(self, rate: float, capacity: int, clock=time.monotonic):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it."""
+        with self._lock:
+            self._refill(self.clock())
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for `seconds`; existing reservations move back as well."""
+        with self._lock:
+            self._refill(self.clock())
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill(self.clock())
+            self.rate = rate
+
+class ProviderLimiter:
+    """Token bucket plus in-flight cap for one provider, adapting to throttling.
+
+    A throttled response (429 / Retry-After) pauses the bucket for the
+    requested time and halves the rate; successes raise it again step by
+    step up to the configured rate, so the limiter settles just under the
+    provider's real quota.
+    """
+
+    def __init__(self, name: str, limit: RateLimit, clock=time.monotonic):
+        self.name = name
+        self.limit = limit
+        self.bucket = TokenBucket(limit.rate, limit.burst, clock)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self.requests = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self.waited = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit.max_in_flight)
+        return semaphore
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for an in-flight slot and a token, then hold the slot for one request."""
+        async with self._semaphore():
+            delay = self.bucket.reserve()
+            if delay > 0:
+                self.waited += delay
+                await asyncio.sleep(delay)
+            self.requests += 1
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    async def acquire(self) -> None:
+        """Wait for a token without taking an in-flight slot; for a retry made while holding one."""
+        delay = self.bucket.reserve()
+        if delay > 0:
+            self.waited += delay
+            await asyncio.sleep(delay)
+        self.requests += 1
+
+    def acquire_sync(self) -> None:
+        """Block until a token is available; for synchronous clients (no in-flight cap)."""
+        delay = self.bucket.reserve()
+        if delay > 0:
+            self.waited += delay
+            time.sleep(delay)
+        self.requests += 1
+
+    @contextmanager
+    def sync_slot(self) -> Iterator[None]:
+        self.acquire_sync()
+        yield
+
+    def on_throttled(self, retry_after: Union[str, float, None] = None) -> float:
+        """Record a throttled response; returns the pause applied in seconds."""
+        self.throttled += 1
+        self.bucket.set_rate(max(self.limit.rate * MIN_RATE_SHARE, self.rate * BACKOFF_FACTOR))
+        pause = parse_retry_after(retry_after, default=1.0 / self.rate)
+        self.bucket.pause(pause)
+        logger.warning(f"{self.name} throttled; pausing {pause:.1f}s at {self.rate:.2f} req/s")
+        return pause
+
+    def on_success(self) -> None:
+        if self.rate < self.limit.rate:
+            self.bucket.set_rate(min(self.limit.rate, self.rate + self.limit.rate * RECOVERY_STEP))
+
+    def observe(self, status_code: int, retry_after: Union[str, float, None] = None) -> None:
+        """Adapt to a response status; 429 and 503 with Retry-After count as throttling."""
+        if status_code == 429 or (status_code == 503 and retry_after is not None):
+            self.on_throttled(retry_after)
+        elif status_code < 400:
+            self.on_success()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "in_flight": self.in_flight,
+            "rate": self.rate,
+            "waited_seconds": self.waited
+        }
+
+class RateGovernor:
+    """Process-wide registry of provider limiters."""
+
+    def __init__(self, limits: Optional[Dict[str, RateLimit]] = None, clock=time.monotonic):
+        self.limits = {**DEFAULT_RATE_LIMITS, **(limits or {})}
+        self.clock = clock
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, provider: str, limit: RateLimit) -> None:
+        """Replace the quota of a provider; resets its limiter."""
+        with self._lock:
+            self.limits[provider] = limit
+            self._limiters.pop(provider, None)
+
+    def limiter(self, provider: str) -> ProviderLimiter:
+        with self._lock:
+            limiter = self._limiters.get(provider)
+            if limiter is None:
+                limit = self.limits.get(provider, DEFAULT_RATE_LIMIT)
+                limiter = self._limiters[provider] = ProviderLimiter(provider, limit, self.clock)
+            return limiter
+
+    def slot(self, provider: str):
+        return self.limiter(provider).slot()
+
+    def sync_slot(self, provider: str):
+        return self.limiter(provider).sync_slot()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+
+rate_governor = RateGovernor()
@@ -0,0 +1,278 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from dataclasses import dataclass
+import asyncio
+import logging
+import random
+import threading
+import time
+
+import httpx
+
+from atlas.clients.ratelimit import parse_retry_after
+
+__all__ = ['RetryPolicy', 'RetryBudget', 'CircuitBreaker', 'CircuitOpenError', 'UpstreamError',
+           'Resilience', 'RETRYABLE_STATUS', 'is_retryable', 'resilience']
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+class CircuitOpenError(Exception):
+    """Raised without calling upstream while a host's circuit is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}; retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+class UpstreamError(Exception):
+    """Error status from a provider, carrying the response for the caller."""
+
+    def __init__(self, message: str, response: httpx.Response):
+        super().__init__(message)
+        self.response = response
+        self.status_code = response.status_code
+        self.retry_after = response.headers.get('Retry-After')
+
+def _status(error: BaseException) -> Optional[int]:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    return getattr(error, 'status_code', None)
+
+def _retry_after(error: BaseException) -> Optional[str]:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.headers.get('Retry-After')
+    return getattr(error, 'retry_after', None)
+
+def is_retryable(error: BaseException) -> bool:
+    """Transport failures and throttling / server error statuses are worth retrying."""
+    if isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    return _status(error) in RETRYABLE_STATUS
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter.
+
+    Attempt `n` (from 0) sleeps a uniform random time in
+    [0, min(max_delay, base_delay * 2**n)], but at least as long as a
+    Retry-After the provider sent.
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(self.max_delay, parse_retry_after(retry_after)))
+        return delay
+
+class RetryBudget:
+    """Caps retries at a share of recent requests.
+
+    Every request deposits `ratio` tokens and every retry spends one, so
+    when a host fails everything retries add at most `ratio` extra load
+    instead of multiplying it. `reserve` tokens are available up front
+    (and are the cap) so a quiet client can still retry.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10.0):
+        self.ratio = ratio
+        self.reserve = reserve
+        self.tokens = reserve
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.tokens = min(self.reserve, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            self.exhausted += 1
+            return False
+
+class CircuitBreaker:
+    """Fails fast while a host is down.
+
+    After `failure_threshold` consecutive outage-type failures the circuit
+    opens and calls raise `CircuitOpenError` for `reset_timeout` seconds.
+    Then one trial call is let through (half open): success closes the
+    circuit, failure opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock=time.monotonic):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == self.OPEN:
+                waited = self.clock() - self.opened_at
+                if waited < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.host, self.reset_timeout - waited)
+                self.state = self.HALF_OPEN
+                self._trial = False
+            if self.state == self.HALF_OPEN:
+                if self._trial:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.host, self.reset_timeout)
+                self._trial = True
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit for {self.host} closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial = False
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit for {self.host} opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                self._trial = False
+
+    def on_neutral(self) -> None:
+        """Call ended without telling anything about the host's health (e.g. a 404)."""
+        with self._lock:
+            self.failures = 0
+            self._trial = False
+            if self.state == self.HALF_OPEN:
+                self.state = self.CLOSED
+
+class Resilience:
+    """Retries, retry budgets and circuit breakers, one budget and breaker per host."""
+
+    def __init__(self, retry: Optional[RetryPolicy] = None, budget_ratio: float = 0.2,
+                 budget_reserve: float = 10.0, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock=time.monotonic, sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.retry = retry or RetryPolicy()
+        self.budget_ratio = budget_ratio
+        self.budget_reserve = budget_reserve
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.sleep = sleep
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._lock = threading.Lock()
+        self.retries = 0
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    host, self.failure_threshold, self.reset_timeout, self.clock)
+            return breaker
+
+    def budget(self, host: str) -> RetryBudget:
+        with self._lock:
+            budget = self._budgets.get(host)
+            if budget is None:
+                budget = self._budgets[host] = RetryBudget(self.budget_ratio, self.budget_reserve)
+            return budget
+
+    def _should_retry(self, host: str, error: Exception, attempt: int,
+                      retryable: Callable[[BaseException], bool]) -> bool:
+        return (attempt + 1 < self.retry.max_attempts and retryable(error)
+                and self.budget(host).try_spend())
+
+    def _record(self, breaker: CircuitBreaker, error: Exception,
+                retryable: Callable[[BaseException], bool]) -> None:
+        # Throttling is the rate limiter's business; a 429 does not mean the host is down
+        if retryable(error) and _status(error) != 429:
+            breaker.on_failure()
+        else:
+            breaker.on_neutral()
+
+    async def call(self, host: str, fn: Callable[[], Awaitable[T]],
+                   retryable: Callable[[BaseException], bool] = is_retryable) -> T:
+        """Await `fn()` behind the host's breaker, retrying retryable failures."""
+        breaker = self.breaker(host)
+        self.budget(host).deposit()
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                result = await fn()
+            except Exception as e:
+                self._record(breaker, e, retryable)
+                if not self._should_retry(host, e, attempt, retryable):
+                    raise
+                delay = self.retry.delay(attempt, _retry_after(e))
+                logger.debug(f"Retrying {host} in {delay:.2f}s after: {e}")
+                self.retries += 1
+                attempt += 1
+                await self.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled: release a half-open trial so the next call can probe the host
+                breaker.on_neutral()
+                raise
+            breaker.on_success()
+            return result
+
+    def call_sync(self, host: str, fn: Callable[[], T],
+                  retryable: Callable[[BaseException], bool] = is_retryable) -> T:
+        """Blocking variant of `call` for synchronous clients."""
+        breaker = self.breaker(host)
+        self.budget(host).deposit()
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                result = fn()
+            except Exception as e:
+                self._record(breaker, e, retryable)
+                if not self._should_retry(host, e, attempt, retryable):
+                    raise
+                self.retries += 1
+                time.sleep(self.retry.delay(attempt, _retry_after(e)))
+                attempt += 1
+                continue
+            except BaseException:
+                breaker.on_neutral()
+                raise
+            breaker.on_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "hosts": {
+                host: {
+                    "state": breaker.state,
+                    "failures": breaker.failures,
+                    "rejected": breaker.rejected,
+                    "budget_exhausted": self._budgets[host].exhausted if host in self._budgets else 0
+                }
+                for host, breaker in list(self._breakers.items())
+            }
+        }
+
+# Process-wide, so every client calling a host sees the same breaker and budget
+resilience = Resilience()
@@ -1,12 +1,14 @@
 from typing import List, Dict, Any, Optional
-import httpx
 from atlas.core.config import AIConfig
 from atlas.clients.base import BaseClient
+from atlas.clients.cache import ResponseCache
 
 class SerpApiClient(BaseClient):
     """Client for SerpAPI search."""
+
+    provider = "serpapi"
     
-    def __init__(self, config: Optional[AIConfig] = None):
+    def __init__(self, config: Optional[AIConfig] = None, cache: Optional[ResponseCache] = None):
         if not config:
             raise ValueError("Config is required")
             
@@ -14,7 +16,7 @@ class SerpApiClient(BaseClient):
         if not getattr(config, 'serpapi_api_key', None) or config.serpapi_api_key.strip() == "":
             raise ValueError("SerpAPI key not found in config")
             
-        super().__init__(config)
+        super().__init__(config, cache=cache)
         self.api_key = config.serpapi_api_key
         self.base_url = "https://serpapi.com/search"
     
@@ -41,30 +43,31 @@ class SerpApiClient(BaseClient):
         """
         if not query or not str(query).strip():
             raise ValueError("Search query cannot be empty")
-            
+
+        options = {
+            "num": num_results,
+            "engine": "google",
+            **kwargs
+        }
+        return await self._cached(query, options, lambda: self._search({"q": query, **options}))
+
+    async def _search(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         try:
-            params = {
-                "api_key": self.api_key,
-                "q": query,
-                "num": num_results,
-                "engine": "google",
-                **kwargs
-            }
+            params = {"api_key": self.api_key, **params}
+            response = await self._send(
+                "get",
+                self.base_url,
+                params=params
+            )
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.base_url,
-                    params=params
-                )
+            if response.status_code != 200:
+                raise Exception(f"SerpAPI request failed: {response.text}")
+                
+            data = response.json()
+            if "organic_results" not in data:
+                raise Exception("Invalid response format from SerpAPI")
                 
-                if response.status_code != 200:
-                    raise Exception(f"SerpAPI request failed: {response.text}")
-                    
-                data = response.json()
-                if "organic_results" not in data:
-                    raise Exception("Invalid response format from SerpAPI")
-                    
-                return data["organic_results"]
+            return data["organic_results"]
                 
         except Exception as e:
             raise Exception(f"SerpAPI request failed: {str(e)}") 
\ No newline at end of file
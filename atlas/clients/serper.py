@@ -1,12 +1,14 @@
 from typing import List, Dict, Any, Optional
-import httpx
 from atlas.core.config import AIConfig
 from atlas.clients.base import BaseClient
+from atlas.clients.cache import ResponseCache
 
 class SerperClient(BaseClient):
     """Client for Serper search API."""
+
+    provider = "serper"
     
-    def __init__(self, config: Optional[AIConfig] = None):
+    def __init__(self, config: Optional[AIConfig] = None, cache: Optional[ResponseCache] = None):
         if not config:
             raise ValueError("Config is required")
             
@@ -14,7 +16,7 @@ class SerperClient(BaseClient):
         if not getattr(config, 'serper_api_key', None) or config.serper_api_key.strip() == "":
             raise ValueError("Serper API key not found in config")
             
-        super().__init__(config)
+        super().__init__(config, cache=cache)
         self.api_key = config.serper_api_key
         self.base_url = "https://google.serper.dev/search"
     
@@ -45,36 +47,37 @@ class SerperClient(BaseClient):
         """
         if not query or not str(query).strip():
             raise ValueError("Search query cannot be empty")
-            
+
+        options = {
+            "num": num_results,
+            "gl": country,
+            "hl": language,
+            **kwargs
+        }
+        return await self._cached(query, options, lambda: self._search({"q": query, **options}))
+
+    async def _search(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         try:
             headers = {
                 "X-API-KEY": self.api_key,
                 "Content-Type": "application/json"
             }
             
-            params = {
-                "q": query,
-                "num": num_results,
-                "gl": country,
-                "hl": language,
-                **kwargs
-            }
+            response = await self._send(
+                "post",
+                self.base_url,
+                headers=headers,
+                json=params
+            )
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.base_url,
-                    headers=headers,
-                    json=params
-                )
+            if response.status_code != 200:
+                raise Exception(f"Serper request failed: {response.text}")
+                
+            data = response.json()
+            if "organic" not in data:
+                raise Exception("Invalid response format from Serper")
                 
-                if response.status_code != 200:
-                    raise Exception(f"Serper request failed: {response.text}")
-                    
-                data = response.json()
-                if "organic" not in data:
-                    raise Exception("Invalid response format from Serper")
-                    
-                return data["organic"]
+            return data["organic"]
                 
         except Exception as e:
             raise Exception(f"Serper request failed: {str(e)}") 
\ No newline at end of file
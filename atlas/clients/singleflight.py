@@ -0,0 +1,73 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+import logging
+import weakref
+
+__all__ = ['SingleFlight', 'request_flights']
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one upstream call.
+
+    The first caller for a key starts the call as a task; callers that
+    arrive while it is in flight await the same task and receive its
+    result or exception. The key is forgotten as soon as the call
+    finishes, so later calls go upstream again (caching is left to
+    `ResponseCache`). The task is cancelled only when every caller
+    waiting on it has been cancelled. Flights are tracked per running
+    event loop.
+    """
+
+    def __init__(self):
+        self._flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = \
+            weakref.WeakKeyDictionary()
+        self._waiters: Dict[int, int] = {}
+        self.calls = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+
+    def in_flight(self) -> int:
+        return len(self._flights.get(asyncio.get_running_loop(), {}))
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flights = self._flights.setdefault(asyncio.get_running_loop(), {})
+        self.calls += 1
+        task = flights.get(key)
+        if task is None:
+            self.upstream_calls += 1
+            task = asyncio.ensure_future(fn())
+            flights[key] = task
+            task.add_done_callback(lambda done: self._finish(flights, key, done))
+        else:
+            self.coalesced += 1
+
+        self._waiters[id(task)] = self._waiters.get(id(task), 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(id(task)) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            remaining = self._waiters.pop(id(task), 1) - 1
+            if remaining:
+                self._waiters[id(task)] = remaining
+
+    def _finish(self, flights: Dict[Hashable, asyncio.Task], key: Hashable, task: asyncio.Task) -> None:
+        if flights.get(key) is task:
+            del flights[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Retrieved here so an error nobody awaited anymore is not reported as unhandled
+            logger.debug(f"Coalesced call failed: {task.exception()}")
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "saved_ratio": self.coalesced / self.calls if self.calls else 0.0
+        }
+
+# Process-wide, so identical requests from different services share one call
+request_flights = SingleFlight()
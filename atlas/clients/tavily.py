@@ -2,23 +2,28 @@ from typing import List, Dict, Any, Optional
 import httpx
 from atlas.core.config import AIConfig
 from atlas.clients.base import BaseClient
+from atlas.clients.cache import ResponseCache
 
 class TavilyClient(BaseClient):
     """Client for Tavily API."""
+
+    provider = "tavily"
     
-    def __init__(self, config: Optional[AIConfig] = None):
+    def __init__(self, config: Optional[AIConfig] = None, cache: Optional[ResponseCache] = None):
         self.config = config
         self.api_key = config.tavily_api_key if config else None
         if not self.api_key:
             raise ValueError("Tavily API key not found in config")
             
-        super().__init__(config)
+        super().__init__(config, cache=cache)
         self.base_url = "https://api.tavily.com/search"
 
     async def _make_request(self, client: httpx.AsyncClient, headers: dict, params: dict) -> dict:
         """Make HTTP request to Tavily API"""
-        response = await client.get(
+        response = await self._send(
+            "get",
             self.base_url,
+            client=client,
             headers=headers,
             params=params
         )
@@ -38,7 +43,10 @@ class TavilyClient(BaseClient):
         """
         if not query or not query.strip():
             raise ValueError("Search query cannot be empty")
-            
+
+        return await self._cached(query, None, lambda: self._search(query))
+
+    async def _search(self, query: str) -> List[Dict[str, Any]]:
         headers = {
             "Authorization": f"Bearer {self.api_key}"
         }
@@ -50,7 +58,7 @@ class TavilyClient(BaseClient):
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                return await self._make_request(client, headers, params)
+            client = await self._http(self.base_url)
+            return await self._make_request(client, headers, params)
         except Exception as e:
             raise Exception(f"Tavily request failed: {str(e)}")
\ No newline at end of file
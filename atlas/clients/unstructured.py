@@ -1,19 +1,22 @@
-from typing import List, Dict, Any, Optional
-import httpx
+from typing import List, Dict, Any, Optional, Sequence
 from atlas.core.config import AIConfig
-from atlas.clients.base import BaseClient
+from atlas.clients.base import DEFAULT_MAX_CONCURRENCY, BaseClient, QueryResult, fan_out
+from atlas.clients.cache import ResponseCache
+from atlas.core.cache import content_hash
 
 class UnstructuredClient(BaseClient):
     """Client for Unstructured API."""
+
+    provider = "unstructured"
     
-    def __init__(self, config: Optional[AIConfig] = None):
+    def __init__(self, config: Optional[AIConfig] = None, cache: Optional[ResponseCache] = None):
         if not config:
             raise ValueError("Config is required")
             
         if not getattr(config, 'unstructured_api_key', None) or config.unstructured_api_key.strip() == "":
             raise ValueError("Unstructured API key not found in config")
             
-        super().__init__(config)
+        super().__init__(config, cache=cache)
         self.api_key = config.unstructured_api_key
         self.base_url = "https://api.unstructured.io/general/v0/general"
     
@@ -33,28 +36,42 @@ class UnstructuredClient(BaseClient):
         """
         if not content or not str(content).strip():
             raise ValueError("File content cannot be empty")
-            
+
+        # Keyed by a hash of the exact content, which must not be normalized like a query
+        return await self._cached("", {"content": content_hash(content)}, lambda: self._extract_text(content))
+
+    async def search(self, query: str, **kwargs) -> str:
+        """Unstructured extracts documents rather than searching: `query` is file content."""
+        return await self.extract_text(query)
+
+    async def extract_many(self, contents: Sequence[str],
+                           max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> List[QueryResult]:
+        """Extract text from several files concurrently; results come back in input order."""
+        results = [result async for result in fan_out(self.extract_text, contents, max_concurrency)]
+        return sorted(results, key=lambda result: result.index)
+
+    async def _extract_text(self, content: str) -> str:
         try:
             headers = {
                 "accept": "application/json",
                 "unstructured-api-key": self.api_key
             }
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.base_url,
-                    headers=headers,
-                    json={"content": content}
-                )
+            response = await self._send(
+                "post",
+                self.base_url,
+                headers=headers,
+                json={"content": content}
+            )
+            
+            if response.status_code != 200:
+                raise Exception(f"Unstructured request failed: {response.text}")
+                
+            data = response.json()
+            if not isinstance(data, list):
+                raise Exception("Invalid response format from Unstructured")
                 
-                if response.status_code != 200:
-                    raise Exception(f"Unstructured request failed: {response.text}")
-                    
-                data = response.json()
-                if not isinstance(data, list):
-                    raise Exception("Invalid response format from Unstructured")
-                    
-                return "\n".join(item.get("text", "") for item in data)
+            return "\n".join(item.get("text", "") for item in data)
                 
         except Exception as e:
             raise Exception(f"Unstructured request failed: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,105 @@
+from typing import Any, Dict, Hashable, Optional, Set
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _normalize(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return _normalize(asdict(value))
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if hasattr(value, 'item') and callable(value.item):  # numpy scalars
+        return value.item()
+    return value
+
+def content_hash(*parts: Any) -> str:
+    """Stable hash of dataclasses, dicts and scalars, independent of key order."""
+    payload = json.dumps([_normalize(part) for part in parts], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+class LRUCache:
+    """Size-bounded LRU mapping with hit/miss counters.
+
+    Entries can carry a tag (for example the hash of the market data they
+    were computed from) so that everything derived from one input can be
+    dropped at once with `invalidate_tag`.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        if max_entries < 0:
+            raise ValueError("max_entries cannot be negative")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._tags: Dict[Hashable, Hashable] = {}
+        self._tagged: Dict[Hashable, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, tag: Optional[Hashable] = None) -> None:
+        if self.max_entries == 0:
+            return
+        self.pop(key)
+        self._entries[key] = value
+        if tag is not None:
+            self._tags[key] = tag
+            self._tagged.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self.pop(oldest)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        value = self._entries.pop(key, default)
+        tag = self._tags.pop(key, None)
+        if tag is not None:
+            keys = self._tagged[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tagged[tag]
+        return value
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """Drop every entry stored with `tag`; returns how many were removed."""
+        keys = list(self._tagged.get(tag, ()))
+        for key in keys:
+            self.pop(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self._tagged.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
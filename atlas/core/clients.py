@@ -1,10 +1,44 @@
+from typing import Any, Dict, List, Optional, Union
+
+METRICS_BATCH_SIZE = 100
+
+METRICS_INSTRUCTIONS = """You validate commercial real estate metrics extracted from documents.
+For each input metric set, check that every value is plausible on its own and consistent with the others:
+cap rates between 0 and 0.2, occupancy between 0 and 1, positive square footage and rents, NOI below
+gross income, and value roughly NOI divided by cap rate where both are given."""
+
+METRICS_RESULT_FORMAT = '{"valid": true or false, "issues": [short description of each problem]}'
+
+def _valid_verdict(item: Any, result: Any) -> bool:
+    return (isinstance(result, dict) and isinstance(result.get("valid"), bool)
+            and isinstance(result.get("issues", []), list))
+
 class ClaudeClient:
-    def __init__(self, config):
+    def __init__(self, config, llm=None):
         self.config = config
+        self._llm = llm
 
-    async def validate_metrics(self, metrics):
-        # TODO: Implement validation logic
-        pass
+    @property
+    def llm(self):
+        if self._llm is None:
+            from atlas.clients.claude import ClaudeClient as AsyncClaude
+            from atlas.clients.llm import llm_response_cache
+            self._llm = AsyncClaude(self.config, cache=llm_response_cache(getattr(self.config, 'llm_cache_path', None)))
+        return self._llm
+
+    async def validate_metrics(self, metrics: Union[Dict, List[Dict]]) -> Union[Optional[Dict], List[Optional[Dict]]]:
+        """Plausibility verdicts ({"valid", "issues"}) for one metric set or a list of them.
+
+        Lists are sent METRICS_BATCH_SIZE sets per prompt; a set the model
+        could not answer for gets None.
+        """
+        from atlas.clients.batch import LLMBatcher
+        batcher = LLMBatcher(self.llm, METRICS_INSTRUCTIONS, METRICS_RESULT_FORMAT,
+                             batch_size=METRICS_BATCH_SIZE, validate=_valid_verdict)
+        single = isinstance(metrics, dict)
+        results = await batcher.run([metrics] if single else list(metrics))
+        verdicts = [result.result if result.ok else None for result in results]
+        return verdicts[0] if single else verdicts
 
 class MixtralClient:
     def __init__(self, config):
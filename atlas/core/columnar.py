@@ -0,0 +1,143 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+import logging
+import numpy as np
+import pandas as pd
+from atlas.core.cre_analysis import PropertyMetrics
+
+logger = logging.getLogger(__name__)
+
+PROPERTY_DTYPE = np.dtype([
+    ('noi', 'f8'),
+    ('cap_rate', 'f8'),
+    ('occupancy', 'f8'),
+    ('square_footage', 'i4'),
+    ('rent_per_sf', 'f8'),
+    ('property_type', 'i2'),
+    ('year_built', 'i2'),
+    ('renovation_year', 'i2')
+])
+PROPERTY_FIELDS = PROPERTY_DTYPE.names
+
+# renovation_year is stored as 0 when the property was never renovated
+NO_RENOVATION = 0
+
+def _column(name: str, values) -> np.ndarray:
+    """`values` cast to the field's dtype, refusing casts that would change them.
+
+    Integer fields reject missing, fractional and out-of-range values
+    instead of letting NumPy truncate or wrap them around.
+    """
+    dtype = PROPERTY_DTYPE[name]
+    try:
+        array = np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError(f"Column {name} must be numeric")
+    if dtype.kind == 'f':
+        return array.astype(dtype)
+    if not np.isfinite(array).all():
+        raise ValueError(f"Column {name} has missing or infinite values")
+    if (array != np.round(array)).any():
+        raise ValueError(f"Column {name} must hold whole numbers")
+    info = np.iinfo(dtype)
+    if len(array) and (array.min() < info.min or array.max() > info.max):
+        raise ValueError(f"Column {name} has values outside the {dtype} range [{info.min}, {info.max}]")
+    return array.astype(dtype)
+
+class PropertyMetricsTable:
+    """Columnar store of PropertyMetrics backed by one NumPy structured array.
+
+    Each row takes 42 bytes instead of a dataclass instance with its own
+    dict and boxed floats. `property_type` is dictionary-encoded against
+    `property_types`. The table behaves as a sequence of PropertyMetrics,
+    so it can be passed anywhere a list of metrics is accepted, and the
+    vectorized engines read its columns directly through `column`.
+    """
+
+    def __init__(self, data: np.ndarray, property_types: Sequence[str]):
+        if data.dtype != PROPERTY_DTYPE:
+            raise ValueError("Property data must use PROPERTY_DTYPE")
+        self.data = data
+        self.property_types = list(property_types)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence], property_types: Sequence[str]) -> "PropertyMetricsTable":
+        """Table from one sequence per field, `property_type` holding codes into `property_types`."""
+        data = np.empty(len(columns['noi']), dtype=PROPERTY_DTYPE)
+        for name in PROPERTY_FIELDS:
+            data[name] = _column(name, columns[name])
+        return cls(data, property_types)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Union[PropertyMetrics, Dict]]) -> "PropertyMetricsTable":
+        type_codes: Dict[str, int] = {}
+        columns = {name: [] for name in PROPERTY_FIELDS}
+        for record in records:
+            if isinstance(record, PropertyMetrics):
+                record = record.__dict__
+            for name in PROPERTY_FIELDS:
+                if name not in ('property_type', 'renovation_year'):
+                    columns[name].append(record[name])
+            columns['property_type'].append(type_codes.setdefault(record['property_type'], len(type_codes)))
+            columns['renovation_year'].append(record.get('renovation_year') or NO_RENOVATION)
+        return cls.from_columns(columns, list(type_codes))
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "PropertyMetricsTable":
+        missing = [name for name in PROPERTY_FIELDS if name != 'renovation_year' and name not in df]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+
+        columns = {name: df[name].to_numpy() for name in PROPERTY_FIELDS if name in df}
+        codes, property_types = pd.factorize(df['property_type'])
+        if (codes < 0).any():
+            raise ValueError("Column property_type has missing values")
+        columns['property_type'] = codes
+        if 'renovation_year' in df:
+            columns['renovation_year'] = df['renovation_year'].fillna(NO_RENOVATION).to_numpy()
+        else:
+            columns['renovation_year'] = np.full(len(df), NO_RENOVATION)
+        return cls.from_columns(columns, list(property_types))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self._record(self.data[index])
+        return PropertyMetricsTable(self.data[index], self.property_types)
+
+    def __iter__(self) -> Iterator[PropertyMetrics]:
+        return (self._record(row) for row in self.data)
+
+    def _record(self, row) -> PropertyMetrics:
+        renovation_year = int(row['renovation_year'])
+        return PropertyMetrics(
+            noi=float(row['noi']),
+            cap_rate=float(row['cap_rate']),
+            occupancy=float(row['occupancy']),
+            square_footage=int(row['square_footage']),
+            rent_per_sf=float(row['rent_per_sf']),
+            property_type=self.property_types[row['property_type']],
+            year_built=int(row['year_built']),
+            renovation_year=None if renovation_year == NO_RENOVATION else renovation_year
+        )
+
+    def column(self, name: str) -> np.ndarray:
+        """Typed column view; `property_type` returns the encoded codes."""
+        return self.data[name]
+
+    def property_type_labels(self) -> np.ndarray:
+        return np.asarray(self.property_types, dtype=object)[self.data['property_type']]
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def to_records(self) -> List[PropertyMetrics]:
+        return list(self)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        df = pd.DataFrame({name: self.data[name] for name in PROPERTY_FIELDS})
+        df['property_type'] = self.property_type_labels()
+        df['renovation_year'] = df['renovation_year'].where(df['renovation_year'] != NO_RENOVATION)
+        return df
@@ -18,6 +18,12 @@ class AIConfig:
     perplexity_api_key: Optional[str] = os.getenv('PR_API')
     unstructured_api_key: Optional[str] = os.getenv('UNSTRUCTURED_API_KEY')
     serper_api_key: Optional[str] = os.getenv('SERPER_API_KEY')
+    # SQLite file for provider responses; in-memory caching only when unset
+    response_cache_path: Optional[str] = os.getenv('ATLAS_RESPONSE_CACHE')
+    # SQLite file for temperature-0 LLM completions; in-memory only when unset
+    llm_cache_path: Optional[str] = os.getenv('ATLAS_LLM_CACHE')
+    # Hedge slow Serper/SerpAPI searches with the other provider
+    search_hedging: bool = os.getenv('ATLAS_SEARCH_HEDGING', '1') != '0'
     
     @classmethod
     def from_env(cls):
@@ -29,5 +35,8 @@ class AIConfig:
             serpapi_api_key=os.getenv('SERPAPI_API_KEY'),
             perplexity_api_key=os.getenv('PR_API'),
             unstructured_api_key=os.getenv('UNSTRUCTURED_API_KEY'),
-            serper_api_key=os.getenv('SERPER_API_KEY')
+            serper_api_key=os.getenv('SERPER_API_KEY'),
+            response_cache_path=os.getenv('ATLAS_RESPONSE_CACHE'),
+            llm_cache_path=os.getenv('ATLAS_LLM_CACHE'),
+            search_hedging=os.getenv('ATLAS_SEARCH_HEDGING', '1') != '0'
         ) 
\ No newline at end of file
@@ -1,12 +1,23 @@
-from typing import Dict, Optional, List, TypedDict
+from typing import AsyncIterator, Dict, Optional, List, Sequence, Tuple, TypedDict
 from dataclasses import dataclass
 import pandas as pd
-import re
 import asyncio
 from atlas.core.config import AIConfig
-from atlas.core.metrics import PropertyMetricsExtractor
+from atlas.core.extractors import PropertyMetricsExtractor
+from atlas.core.extraction import MetricExtractionEngine
 from atlas.core.clients import ClaudeClient, MixtralClient
-from datetime import datetime
+from atlas.core.dcf import DCFBatch, generate_dcf_batch, implied_value, metric_column, MarketInputs, DISCOUNT_RATE
+from atlas.core.irr import solve_irr
+from atlas.core.simulation import SimulationConfig, simulate_property, simulate_portfolio
+from atlas.core.sensitivity import sensitivity_analysis
+from atlas.core.cache import LRUCache, content_hash
+from atlas.core.portfolio import IncrementalPortfolio
+from atlas.core.rent_roll import Lease, RentRoll, generate_rent_roll_dcf
+from atlas.core.debt import Loan, LoanBook, debt_metrics, financial_risk_scores, loan_risks
+from atlas.core.portfolio_risk import aggregate_portfolio_risk, correlated_npv_scenarios
+from atlas.core.risk import SubmarketBenchmarks, risk_analyses, score_properties, score_standalone
+from atlas.core.rates import rate_shock_analysis
+from atlas.core.waterfall import DEFAULT_LP_EQUITY_SHARE, DEFAULT_TIERS, WaterfallTier, simulate_waterfall
 import numpy as np
 import numpy_financial as npf
 import logging
@@ -49,20 +60,20 @@ class RiskAnalysis(TypedDict):
     recommendations: Dict[str, str]
 
 class CREAnalysisService:
-    def __init__(self, config: AIConfig):
+    def __init__(self, config: AIConfig, cache_size: int = 1024):
         self.config = config
         self.metrics_extractor = PropertyMetricsExtractor(config)
+        self.metrics_engine = MetricExtractionEngine(metrics=['noi'])
         self.claude = ClaudeClient(config)
         self.mixtral = MixtralClient(config)
+        self.result_cache = LRUCache(cache_size)
 
     async def analyze_property(self, property_data: Dict, market_data: Dict) -> Dict:
         try:
             logger.info(f"Starting analysis for property type: {property_data.get('property_type')}")
             self._validate_inputs(property_data, market_data)
             metrics = await self._extract_property_metrics(property_data)
-            dcf_inputs = await self._prepare_dcf_inputs(metrics)
-            dcf_analysis = await self._generate_dcf_model(dcf_inputs, market_data)
-            risks = await self._assess_risks(metrics, market_data, dcf_analysis)
+            dcf_analysis, risks = await self._cached_dcf_and_risks(metrics, market_data, property_data.get('loan'))
             
             return {
                 "property_metrics": metrics,
@@ -79,6 +90,308 @@ class CREAnalysisService:
             logger.error(f"Analysis failed: {str(e)}")
             raise
 
+    async def analyze_many(self, properties: Sequence[Dict], market: MarketInputs,
+                           max_concurrency: int = 10) -> AsyncIterator[Dict]:
+        """Run `analyze_property` over many properties, yielding as each finishes.
+
+        At most `max_concurrency` analyses are in flight at once. Each yielded
+        item carries the property's index in `properties` and either its
+        result or the error message, so one bad record does not stop the run.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        markets = [market] * len(properties) if isinstance(market, dict) else list(market)
+        if len(markets) != len(properties):
+            raise ValueError(f"Expected {len(properties)} market entries, got {len(markets)}")
+
+        pending = iter(enumerate(zip(properties, markets)))
+        completed: asyncio.Queue = asyncio.Queue()
+
+        async def worker() -> None:
+            for index, (property_data, market_data) in pending:
+                completed.put_nowait(await self._analyze_isolated(index, property_data, market_data))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(max_concurrency, len(properties)))]
+        try:
+            for _ in range(len(properties)):
+                yield await completed.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            # Wait for the cancellations so no task outlives an early exit
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _analyze_isolated(self, index: int, property_data: Dict, market_data: Dict) -> Dict:
+        try:
+            result = await self.analyze_property(property_data, market_data)
+            return {"index": index, "result": result, "error": None}
+        except Exception as e:
+            logger.warning(f"Property {index} failed analysis: {str(e)}")
+            return {"index": index, "result": None, "error": str(e)}
+
+    async def analyze_portfolio(self, metrics: Sequence[PropertyMetrics], market: MarketInputs) -> DCFBatch:
+        """DCF models for a whole portfolio in one vectorized pass.
+
+        `market` is either one market dict for every property or a list with
+        one market dict per property. The result stays columnar; each entry,
+        built when accessed, has the same shape as `_generate_dcf_model`
+        returns for a single property (`to_dicts` materializes them all).
+        """
+        try:
+            logger.info(f"Starting portfolio DCF for {len(metrics)} properties")
+            return generate_dcf_batch(metrics, market)
+        except Exception as e:
+            logger.error(f"Portfolio DCF failed: {str(e)}")
+            raise
+
+    async def build_portfolio(self, metrics: Sequence[PropertyMetrics], submarkets: Sequence[str],
+                              markets: Dict[str, Dict]) -> IncrementalPortfolio:
+        """Portfolio DCF and risk state that can be updated incrementally.
+
+        `submarkets` names the submarket of each property and `markets`
+        holds the market data of every submarket.
+        """
+        try:
+            for market_data in markets.values():
+                self._validate_market_data(market_data)
+            portfolio = IncrementalPortfolio(metrics, submarkets, markets)
+            await self._refresh_portfolio_risks(portfolio, np.arange(len(portfolio)))
+            return portfolio
+        except Exception as e:
+            logger.error(f"Failed to build portfolio: {str(e)}")
+            raise
+
+    async def update_portfolio_market(self, portfolio: IncrementalPortfolio,
+                                      updates: Dict[str, Dict]) -> Dict[str, np.ndarray]:
+        """Apply refreshed market data to a portfolio built by `build_portfolio`.
+
+        Only properties in the updated submarkets are touched, and only the
+        stages that depend on the changed fields are recomputed. Returns the
+        recomputed property indices per stage.
+        """
+        try:
+            for name, update in updates.items():
+                if name in portfolio.markets:
+                    self._validate_market_data({**portfolio.markets[name], **update})
+            rows = portfolio.update_markets(updates)
+            await self._refresh_portfolio_risks(portfolio, rows['risk'])
+            return rows
+        except Exception as e:
+            logger.error(f"Portfolio market update failed: {str(e)}")
+            raise
+
+    async def _refresh_portfolio_risks(self, portfolio: IncrementalPortfolio, rows: np.ndarray) -> None:
+        if portfolio.benchmarks is None:
+            portfolio.benchmarks = SubmarketBenchmarks.build(portfolio.metrics, portfolio.submarkets(),
+                                                             portfolio.markets)
+        else:
+            # Peer breakpoints only depend on the properties; just re-rank the markets
+            portfolio.benchmarks = portfolio.benchmarks.with_markets(portfolio.markets)
+        if not len(rows):
+            return
+        scores = score_properties(portfolio.metrics_at(rows), portfolio.submarkets(rows), portfolio.benchmarks)
+        for i, risk in zip(rows.tolist(), risk_analyses(scores)):
+            portfolio.risks[i] = risk
+
+    async def analyze_rent_roll(self, leases, market: Dict) -> Dict:
+        """DCF model driven by a monthly, lease-level rent roll.
+
+        `leases` is a RentRoll or a sequence of Lease records / dicts. The
+        result has the same shape as `_generate_dcf_model` returns.
+        """
+        try:
+            self._validate_market_data(market)
+            rent_roll = leases if isinstance(leases, RentRoll) else RentRoll.from_leases(leases)
+            logger.info(f"Projecting rent roll with {len(rent_roll)} leases")
+            return generate_rent_roll_dcf(rent_roll, market).to_dict(0)
+        except Exception as e:
+            logger.error(f"Rent roll analysis failed: {str(e)}")
+            raise
+
+    async def rate_shock(self, metrics: Sequence[PropertyMetrics], market: MarketInputs,
+                         shocks: Optional[Dict[str, np.ndarray]] = None, zero_rates=DISCOUNT_RATE) -> Dict:
+        """Portfolio NPV under yield-curve shocks, with duration, convexity and key-rate durations.
+
+        `shocks` maps scenario names to per-period rate shifts; by default
+        parallel, steepener and flattener shocks of 25-200bp are used.
+        """
+        try:
+            cash_flows = generate_dcf_batch(metrics, market).fcf
+            logger.info(f"Running rate shocks for {len(cash_flows)} properties")
+            return rate_shock_analysis(cash_flows, zero_rates, shocks).to_dict()
+        except Exception as e:
+            logger.error(f"Rate shock analysis failed: {str(e)}")
+            raise
+
+    async def assess_portfolio_risks(self, metrics: Sequence[PropertyMetrics], submarkets: Sequence[str],
+                                     markets: Dict[str, Dict], loans=None,
+                                     benchmarks: Optional[SubmarketBenchmarks] = None) -> List[RiskAnalysis]:
+        """Data-driven RiskAnalysis for every property of a portfolio.
+
+        Scores are relative to submarket benchmarks, built from the
+        portfolio itself unless precomputed `benchmarks` are passed in.
+        `loans` (one per property) drive the financial risks; without them
+        the financial risks keep their defaults.
+        """
+        try:
+            for market_data in markets.values():
+                self._validate_market_data(market_data)
+            logger.info(f"Scoring risks for {len(metrics)} properties")
+            if benchmarks is None:
+                benchmarks = SubmarketBenchmarks.build(metrics, submarkets, markets)
+
+            financial = financial_risks = None
+            if loans is not None:
+                book = loans if isinstance(loans, LoanBook) else LoanBook.from_loans(loans)
+                noi = metric_column(metrics, 'noi')
+                debt = debt_metrics(book, noi, noi / metric_column(metrics, 'cap_rate'))
+                financial = financial_risk_scores(debt.min_dscr, debt.ltv, debt.refi_coverage,
+                                                  debt.shocked_min_dscr, debt.floating)
+                financial_risks = loan_risks(debt)
+
+            scores = score_properties(metrics, submarkets, benchmarks, financial)
+            return risk_analyses(scores, financial_risks)
+        except Exception as e:
+            logger.error(f"Portfolio risk scoring failed: {str(e)}")
+            raise
+
+    async def portfolio_risk(self, metrics: Sequence[PropertyMetrics], submarkets: Sequence[str],
+                             markets: Dict[str, Dict], config: Optional[SimulationConfig] = None,
+                             market_correlation: float = 0.5, group_by: str = "submarket",
+                             confidence: float = 0.95) -> Dict:
+        """Correlation-aware portfolio VaR/CVaR over simulated property NPVs.
+
+        Submarkets share a common market factor; risk contributions are
+        reported per property and per submarket or property type
+        (`group_by`).
+        """
+        try:
+            for market_data in markets.values():
+                self._validate_market_data(market_data)
+            if group_by == "submarket":
+                groups = submarkets
+            elif group_by == "property_type":
+                groups = [m.property_type for m in metrics]
+            else:
+                raise ValueError(f"Unknown risk grouping: {group_by}")
+            config = config or SimulationConfig(n_scenarios=10_000, seed=0)
+            logger.info(f"Aggregating {config.n_scenarios} scenarios for {len(metrics)} properties")
+            scenarios = correlated_npv_scenarios(metrics, submarkets, markets, config, market_correlation)
+            return aggregate_portfolio_risk(scenarios, groups, confidence).to_dict()
+        except Exception as e:
+            logger.error(f"Portfolio risk aggregation failed: {str(e)}")
+            raise
+
+    async def simulate_dcf(self, metrics: PropertyMetrics, market: Dict,
+                           config: Optional[SimulationConfig] = None) -> Dict:
+        """Monte Carlo mode of the DCF model for a single property."""
+        try:
+            return simulate_property(metrics, market, config).to_dict()
+        except Exception as e:
+            logger.error(f"DCF simulation failed: {str(e)}")
+            raise
+
+    async def simulate_portfolio(self, metrics: Sequence[PropertyMetrics], market: MarketInputs,
+                                 config: Optional[SimulationConfig] = None,
+                                 processes: Optional[int] = None) -> List[Dict]:
+        """Monte Carlo DCF for every property, optionally across a process pool."""
+        try:
+            logger.info(f"Starting portfolio simulation for {len(metrics)} properties")
+            results = simulate_portfolio(metrics, market, config, processes=processes)
+            return [result.to_dict() for result in results]
+        except Exception as e:
+            logger.error(f"Portfolio simulation failed: {str(e)}")
+            raise
+
+    async def equity_waterfall(self, metrics: PropertyMetrics, market: Dict,
+                               tiers: Sequence[WaterfallTier] = DEFAULT_TIERS,
+                               config: Optional[SimulationConfig] = None,
+                               lp_equity_share: float = DEFAULT_LP_EQUITY_SHARE) -> Dict:
+        """LP/GP returns of a deal's promote structure across Monte Carlo FCF paths."""
+        try:
+            self._validate_market_data(market)
+            return simulate_waterfall(metrics, market, tiers, config, lp_equity_share)
+        except Exception as e:
+            logger.error(f"Equity waterfall failed: {str(e)}")
+            raise
+
+    async def sensitivity(self, metrics: PropertyMetrics, market: Dict,
+                          ranges: Optional[Dict[str, Sequence[float]]] = None,
+                          grids: Sequence[Tuple[str, str]] = (),
+                          purchase_price: Optional[float] = None) -> Dict:
+        """Tornado and heatmap sensitivities of NPV/IRR.
+
+        Works on already-extracted metrics, so sweeping hundreds of
+        assumption combinations costs one vectorized DCF pass per sweep
+        rather than one `analyze_property` call per point.
+        """
+        try:
+            self._validate_market_data(market)
+            return sensitivity_analysis(metrics, market, ranges, grids, purchase_price=purchase_price)
+        except Exception as e:
+            logger.error(f"Sensitivity analysis failed: {str(e)}")
+            raise
+
+    async def _cached_dcf_and_risks(self, metrics: PropertyMetrics, market_data: Dict,
+                                    loan: Optional[Dict] = None):
+        """DCF and risk results memoized on the content of metrics, market and loan data.
+
+        Cached results are shared between callers and must not be mutated.
+        """
+        market_key = content_hash(market_data)
+        key = (market_key, content_hash(metrics, loan))
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        dcf_inputs = await self._prepare_dcf_inputs(metrics)
+        dcf_analysis = await self._generate_dcf_model(dcf_inputs, market_data)
+        if loan is not None:
+            debt = self._analyze_debt([loan], [metrics.noi], [implied_value(metrics)])[0]
+            dcf_analysis = {**dcf_analysis, "debt": debt}
+        risks = await self._assess_risks(metrics, market_data, dcf_analysis)
+        self.result_cache.put(key, (dcf_analysis, risks), tag=market_key)
+        return dcf_analysis, risks
+
+    async def analyze_debt(self, loans, noi, value=None, index_rates=None) -> List[Dict]:
+        """Debt metrics and financial risk assessments for a whole loan book.
+
+        Args:
+            loans: LoanBook, or a sequence of Loan records / dicts
+            noi: NOI per loan, flat or projected (loans x years)
+            value: Property value per loan, used for LTV
+            index_rates: Floating-rate index path per year
+
+        Returns:
+            One {"metrics", "risks"} entry per loan; the risks hold the
+            leverage, refinance and interest-rate RiskAssessments.
+        """
+        try:
+            logger.info(f"Analyzing debt for {len(loans)} loans")
+            return self._analyze_debt(loans, noi, value, index_rates)
+        except Exception as e:
+            logger.error(f"Debt analysis failed: {str(e)}")
+            raise
+
+    def _analyze_debt(self, loans, noi, value=None, index_rates=None) -> List[Dict]:
+        book = loans if isinstance(loans, LoanBook) else LoanBook.from_loans(loans)
+        metrics = debt_metrics(book, noi, value, index_rates=index_rates)
+        return [
+            {"metrics": metrics.to_dict(i), "risks": risks}
+            for i, risks in enumerate(loan_risks(metrics))
+        ]
+
+    def invalidate_cache(self, market_data: Optional[Dict] = None) -> int:
+        """Drop cached results for one market's data, or all of them if None."""
+        if market_data is None:
+            removed = len(self.result_cache)
+            self.result_cache.clear()
+            return removed
+        return self.result_cache.invalidate_tag(content_hash(market_data))
+
+    def cache_stats(self) -> Dict:
+        return self.result_cache.stats()
+
     async def _extract_property_metrics(self, property_data: Dict) -> PropertyMetrics:
         try:
             noi = self._extract_noi(property_data['financial_text'])
@@ -104,35 +417,7 @@ class CREAnalysisService:
             if isinstance(metrics, dict) and 'npv' in metrics:
                 return metrics
             
-            dcf = pd.DataFrame(index=range(10))
-            growth_rate = market['rent_growth']
-            vacancy_rate = market.get('vacancy_rate', 0.05)
-            cap_ex_percent = 0.02
-
-            dcf['revenue'] = metrics.rent_per_sf * metrics.square_footage * (1 - vacancy_rate) * (1 + growth_rate) ** dcf.index
-            dcf['opex'] = -dcf['revenue'] * 0.4
-            dcf['capex'] = -dcf['revenue'] * cap_ex_percent
-            dcf['noi'] = dcf['revenue'] + dcf['opex']
-            dcf['fcf'] = dcf['noi'] + dcf['capex']
-
-            exit_cap_rate = market['market_cap_rate'] + 0.005
-            terminal_value = dcf['noi'].iloc[-1] / exit_cap_rate
-            dcf.loc[9, 'fcf'] += terminal_value
-
-            return {
-                "projections": dcf.to_dict(),
-                "assumptions": {
-                    "growth_rate": growth_rate,
-                    "vacancy_rate": vacancy_rate,
-                    "exit_cap_rate": exit_cap_rate,
-                    "cap_ex_percent": cap_ex_percent
-                },
-                "metrics": {
-                    "npv": self._calculate_npv(dcf['fcf']),
-                    "irr": self._calculate_irr(dcf['fcf']),
-                    "equity_multiple": self._calculate_equity_multiple(dcf['fcf'])
-                }
-            }
+            return generate_dcf_batch([metrics], market).to_dict(0)
         except ZeroDivisionError:
             logger.error("Invalid market data: vacancy rate cannot be 1")
             raise ValueError("Invalid market data: vacancy rate cannot be 1")
@@ -141,42 +426,22 @@ class CREAnalysisService:
             raise
 
     async def _assess_risks(self, metrics: PropertyMetrics, market: Dict, dcf: Dict) -> RiskAnalysis:
-        risk_factors = {
-            "market_risks": {
-                "supply_risk": self._assess_supply_risk(market),
-                "demand_risk": self._assess_demand_risk(market),
-                "cap_rate_risk": self._assess_cap_rate_risk(metrics, market)
-            },
-            "property_risks": {
-                "age_risk": self._assess_age_risk(metrics),
-                "tenant_risk": self._assess_tenant_risk(metrics),
-                "capex_risk": self._assess_capex_risk(metrics)
-            },
-            "financial_risks": {
-                "leverage_risk": await self._assess_leverage_risk(dcf),
-                "refinance_risk": await self._assess_refinance_risk(dcf),
-                "interest_rate_risk": await self._assess_interest_rate_risk(dcf)
-            }
-        }
-        
-        mitigants = {
-            "market_mitigants": ["Diversification", "Long-term leases"],
-            "property_mitigants": ["Regular maintenance", "Tenant improvements"],
-            "financial_mitigants": ["Fixed-rate debt", "Hedging strategies"]
-        }
-        
-        recommendations = {
-            "improve_tenant_mix": "Consider attracting more diverse tenants to reduce risk.",
-            "increase_lease_terms": "Negotiate longer lease terms to stabilize cash flow.",
-            "reduce_operating_expenses": "Implement cost-saving measures to improve NOI."
-        }
-        
-        return {
-            "risk_factors": risk_factors,
-            "risk_score": self._calculate_risk_score(risk_factors),
-            "mitigants": mitigants,
-            "recommendations": recommendations
+        leverage_risk, refinance_risk, interest_rate_risk = await asyncio.gather(
+            self._assess_leverage_risk(dcf),
+            self._assess_refinance_risk(dcf),
+            self._assess_interest_rate_risk(dcf)
+        )
+        financial_risks = {
+            "leverage_risk": leverage_risk,
+            "refinance_risk": refinance_risk,
+            "interest_rate_risk": interest_rate_risk
         }
+        # No peers to rank against, so the property is scored on thresholds
+        financial = {name: np.array([risk["score"]], dtype=float) for name, risk in financial_risks.items()}
+        scores = score_standalone([metrics], [market], financial)
+        analysis = risk_analyses(scores, [financial_risks])[0]
+        analysis["risk_score"] = self._calculate_risk_score(analysis["risk_factors"])
+        return analysis
 
     def _extract_cap_rate(self, data: Dict) -> float:
         return float(data.get('cap_rate', 0.05))
@@ -198,51 +463,6 @@ class CREAnalysisService:
     def _extract_renovation_year(self, data: Dict) -> Optional[int]:
         return None
 
-    def _assess_supply_risk(self, market: Dict) -> RiskAssessment:
-        score = 0.5  # Calculate based on market data
-        self._validate_risk_score(score, "supply")
-        return {
-            "level": "medium",
-            "factors": ["New supply vs absorption rate"],
-            "score": score
-        }
-
-    def _assess_demand_risk(self, market: Dict) -> RiskAssessment:
-        return {
-            "level": "low",
-            "factors": ["Vacancy trend", "Absorption rate"],
-            "score": 0.3
-        }
-
-    def _assess_cap_rate_risk(self, metrics: PropertyMetrics, market: Dict) -> RiskAssessment:
-        return {
-            "level": "low",
-            "factors": ["Market cap rate spread"],
-            "score": 0.2
-        }
-
-    def _assess_age_risk(self, metrics: PropertyMetrics) -> RiskAssessment:
-        age = datetime.now().year - metrics.year_built
-        return {
-            "level": "medium" if age > 20 else "low",
-            "factors": [f"Building age: {age} years"],
-            "score": min(age / 50, 1.0)
-        }
-
-    def _assess_tenant_risk(self, metrics: PropertyMetrics) -> RiskAssessment:
-        return {
-            "level": "low",
-            "factors": ["Occupancy rate", "Tenant mix"],
-            "score": 0.3
-        }
-
-    def _assess_capex_risk(self, metrics: PropertyMetrics) -> RiskAssessment:
-        return {
-            "level": "medium",
-            "factors": ["Building age", "Maintenance history"],
-            "score": 0.5
-        }
-
     def _calculate_risk_score(self, risk_factors: Dict[str, Dict[str, RiskAssessment]]) -> float:
         try:
             scores = []
@@ -262,11 +482,10 @@ class CREAnalysisService:
         return npf.npv(discount_rate, cash_flows)
 
     def _calculate_irr(self, cash_flows: pd.Series) -> float:
-        try:
-            return npf.irr(cash_flows)
-        except:
-            logger.error("Failed to calculate IRR")
-            return 0.0
+        result = solve_irr(np.asarray(cash_flows, dtype=float))
+        if not result.converged[0]:
+            logger.warning("IRR is undefined for the given cash flows")
+        return float(result.rate[0])
 
     def _calculate_equity_multiple(self, cash_flows: pd.Series) -> float:
         if cash_flows[0] == 0:
@@ -274,6 +493,8 @@ class CREAnalysisService:
         return sum(cash_flows[1:]) / abs(cash_flows[0])
 
     async def _assess_leverage_risk(self, dcf: Dict) -> RiskAssessment:
+        if "debt" in dcf:
+            return dcf["debt"]["risks"]["leverage_risk"]
         return {
             "level": "low",
             "factors": ["Debt-to-equity ratio"],
@@ -287,6 +508,8 @@ class CREAnalysisService:
         }
 
     async def _assess_refinance_risk(self, dcf: Dict) -> RiskAssessment:
+        if "debt" in dcf:
+            return dcf["debt"]["risks"]["refinance_risk"]
         return {
             "level": "medium",
             "factors": ["Interest rate environment"],
@@ -294,6 +517,8 @@ class CREAnalysisService:
         }
 
     async def _assess_interest_rate_risk(self, dcf: Dict) -> RiskAssessment:
+        if "debt" in dcf:
+            return dcf["debt"]["risks"]["interest_rate_risk"]
         return {
             "level": "medium",
             "factors": ["Interest rate volatility"],
@@ -337,10 +562,9 @@ class CREAnalysisService:
 
     def _extract_noi(self, financial_text: str) -> float:
         try:
-            noi_pattern = r'NOI.*?\$?([\d,]+)'
-            match = re.search(noi_pattern, financial_text)
+            match = self.metrics_engine.best(financial_text).get('noi')
             if match:
-                return float(match.group(1).replace(',', ''))
+                return match.value
             raise ValueError("Could not extract NOI from financial text")
         except Exception as e:
             logger.error(f"Failed to extract NOI: {str(e)}")
@@ -0,0 +1,249 @@
+from typing import Dict, Iterator, List, Sequence, Union
+from dataclasses import dataclass, fields, replace
+import logging
+import numpy as np
+from atlas.core.irr import solve_irr
+
+logger = logging.getLogger(__name__)
+
+PROJECTION_YEARS = 10
+OPEX_RATIO = 0.4
+CAP_EX_PERCENT = 0.02
+EXIT_CAP_SPREAD = 0.005
+DEFAULT_VACANCY_RATE = 0.05
+DISCOUNT_RATE = 0.08
+PROJECTION_COLUMNS = ('revenue', 'opex', 'capex', 'noi', 'fcf')
+
+MarketInputs = Union[Dict, Sequence[Dict]]
+
+@dataclass
+class DCFBatch:
+    """DCF projections for N properties, stored as (N x years) arrays.
+
+    Only revenue and FCF are stored; opex, capex and NOI are fixed shares
+    of revenue and derived on access. Indexing and iteration yield the
+    per-property result dicts of `_generate_dcf_model`, built on access,
+    so a batch can stand in for a list of results without holding one;
+    slices are batches again.
+    """
+    revenue: np.ndarray
+    fcf: np.ndarray
+    terminal_value: np.ndarray
+    growth_rate: np.ndarray
+    vacancy_rate: np.ndarray
+    exit_cap_rate: np.ndarray
+    cap_ex_percent: float
+    npv: np.ndarray
+    irr: np.ndarray
+    equity_multiple: np.ndarray
+
+    def __len__(self) -> int:
+        return self.fcf.shape[0]
+
+    @property
+    def opex(self) -> np.ndarray:
+        return -self.revenue * OPEX_RATIO
+
+    @property
+    def capex(self) -> np.ndarray:
+        return -self.revenue * self.cap_ex_percent
+
+    @property
+    def noi(self) -> np.ndarray:
+        return self.revenue + self.opex
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return replace(self, **{
+                field.name: getattr(self, field.name)[index]
+                for field in fields(self) if isinstance(getattr(self, field.name), np.ndarray)
+            })
+        if not -len(self) <= index < len(self):
+            raise IndexError("DCFBatch index out of range")
+        return self.to_dict(index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.to_dict(i) for i in range(len(self)))
+
+    def to_dict(self, index: int) -> Dict:
+        """Per-property result in the shape returned by `_generate_dcf_model`."""
+        row = replace(self, revenue=self.revenue[index], fcf=self.fcf[index])
+        return {
+            "projections": {
+                column: dict(enumerate(getattr(row, column).tolist()))
+                for column in PROJECTION_COLUMNS
+            },
+            "assumptions": {
+                "growth_rate": float(self.growth_rate[index]),
+                "vacancy_rate": float(self.vacancy_rate[index]),
+                "exit_cap_rate": float(self.exit_cap_rate[index]),
+                "cap_ex_percent": self.cap_ex_percent
+            },
+            "metrics": {
+                "npv": float(self.npv[index]),
+                "irr": float(self.irr[index]),
+                "equity_multiple": float(self.equity_multiple[index])
+            }
+        }
+
+    def to_dicts(self) -> List[Dict]:
+        return [self.to_dict(i) for i in range(len(self))]
+
+def metric_column(metrics, name: str, dtype=float) -> np.ndarray:
+    """One metric as an array from a columnar table or a sequence of records.
+
+    Tables such as PropertyMetricsTable expose `column(name)` and are read
+    without materializing a record per property.
+    """
+    column = getattr(metrics, 'column', None)
+    if column is not None:
+        return np.asarray(column(name), dtype=dtype)
+    return np.fromiter((getattr(m, name) for m in metrics), dtype=dtype, count=len(metrics))
+
+def market_arrays(market: MarketInputs, n: int) -> Dict[str, np.ndarray]:
+    """Growth, vacancy and exit cap rates as length-n arrays.
+
+    `market` is either one market dict shared by every property or a
+    sequence with one market dict per property.
+    """
+    if isinstance(market, dict):
+        market = [market]
+    elif len(market) != n:
+        raise ValueError(f"Expected {n} market entries, got {len(market)}")
+
+    growth_rate = np.fromiter((m['rent_growth'] for m in market), dtype=float)
+    vacancy_rate = np.fromiter((m.get('vacancy_rate', DEFAULT_VACANCY_RATE) for m in market), dtype=float)
+    exit_cap_rate = np.fromiter((m['market_cap_rate'] for m in market), dtype=float) + EXIT_CAP_SPREAD
+
+    return {
+        "growth_rate": np.broadcast_to(growth_rate, (n,)),
+        "vacancy_rate": np.broadcast_to(vacancy_rate, (n,)),
+        "exit_cap_rate": np.broadcast_to(exit_cap_rate, (n,))
+    }
+
+def project_cash_flows(base_revenue: np.ndarray, growth_rate: np.ndarray, vacancy_rate: np.ndarray,
+                       exit_cap_rate: np.ndarray, years: int = PROJECTION_YEARS,
+                       cap_ex_percent: float = CAP_EX_PERCENT) -> Dict[str, np.ndarray]:
+    """Revenue/opex/capex/NOI/FCF projections for any broadcastable inputs.
+
+    All inputs broadcast against each other; the projection period is
+    appended as the last axis. The terminal value is folded into the
+    final FCF period, as in the single-property model.
+    """
+    periods = np.arange(years)
+    base_revenue, growth_rate, vacancy_rate, exit_cap_rate = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (base_revenue, growth_rate, vacancy_rate, exit_cap_rate))
+    )
+    base = base_revenue * (1 - vacancy_rate)
+    revenue = base[..., None] * (1 + growth_rate)[..., None] ** periods
+    return cash_flows_from_revenue(revenue, exit_cap_rate, cap_ex_percent)
+
+def cash_flows_from_revenue(revenue: np.ndarray, exit_cap_rate: np.ndarray,
+                            cap_ex_percent: float = CAP_EX_PERCENT) -> Dict[str, np.ndarray]:
+    """Opex/capex/NOI/FCF and terminal value for a given (... x years) revenue path."""
+    revenue = np.asarray(revenue, dtype=float)
+    opex = -revenue * OPEX_RATIO
+    capex = -revenue * cap_ex_percent
+    noi = revenue + opex
+    fcf = noi + capex
+
+    terminal_value = noi[..., -1] / exit_cap_rate
+    fcf[..., -1] += terminal_value
+
+    return {
+        "revenue": revenue,
+        "opex": opex,
+        "capex": capex,
+        "noi": noi,
+        "fcf": fcf,
+        "terminal_value": terminal_value
+    }
+
+def implied_value(metrics) -> float:
+    """Going-in value of a property at its own cap rate (noi / cap_rate)."""
+    if metrics.cap_rate <= 0:
+        raise ValueError("Property cap rate must be positive to imply a purchase price")
+    return metrics.noi / metrics.cap_rate
+
+def npv_batch(cash_flows: np.ndarray, discount_rate=DISCOUNT_RATE) -> np.ndarray:
+    """NPV along the last axis, with the first period undiscounted (as `npf.npv`).
+
+    `discount_rate` may be an array that broadcasts against the leading
+    axes of `cash_flows`.
+    """
+    periods = np.arange(cash_flows.shape[-1])
+    return (cash_flows / (1 + np.asarray(discount_rate, dtype=float))[..., None] ** periods).sum(axis=-1)
+
+def npv_from_assumptions(base_revenue, growth_rate, vacancy_rate, exit_cap_rate,
+                         years: int = PROJECTION_YEARS, discount_rate=DISCOUNT_RATE,
+                         cap_ex_percent: float = CAP_EX_PERCENT) -> np.ndarray:
+    """NPV of `project_cash_flows` in closed form, without the period axis.
+
+    Equal to `npv_batch(project_cash_flows(...)["fcf"], discount_rate)`,
+    but only needs memory for the broadcast inputs, which keeps large
+    (scenarios x assets) evaluations cheap.
+    """
+    base_revenue, growth_rate, vacancy_rate, exit_cap_rate, discount_rate = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (base_revenue, growth_rate, vacancy_rate, exit_cap_rate, discount_rate))
+    )
+    revenue = base_revenue * (1 - vacancy_rate)
+    ratio = (1 + growth_rate) / (1 + discount_rate)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(np.isclose(ratio, 1.0, rtol=0, atol=1e-12), years, (1 - ratio ** years) / (1 - ratio))
+    operating = revenue * (1 - OPEX_RATIO - cap_ex_percent) * annuity
+    terminal = revenue * (1 - OPEX_RATIO) * ratio ** (years - 1) / exit_cap_rate
+    return operating + terminal
+
+def irr_batch(cash_flows: np.ndarray) -> np.ndarray:
+    """IRR for every row of a 2-D cash-flow array, matching `npf.irr`."""
+    return solve_irr(cash_flows).rate
+
+def equity_multiple_batch(cash_flows: np.ndarray) -> np.ndarray:
+    initial = np.abs(cash_flows[..., 0])
+    distributions = cash_flows[..., 1:].sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(initial == 0, 0.0, distributions / np.where(initial == 0, 1, initial))
+
+def generate_dcf_batch(metrics: Sequence, market: MarketInputs, years: int = PROJECTION_YEARS,
+                       discount_rate: float = DISCOUNT_RATE) -> DCFBatch:
+    """Vectorized DCF model for many properties at once.
+
+    Args:
+        metrics: PropertyMetrics records or a PropertyMetricsTable
+        market: One market dict for the whole portfolio, or one per property
+        years: Projection horizon in years
+        discount_rate: Rate used for NPV
+
+    Returns:
+        DCFBatch holding (N x years) projections and per-property metrics
+    """
+    n = len(metrics)
+    rent_per_sf = metric_column(metrics, 'rent_per_sf')
+    square_footage = metric_column(metrics, 'square_footage')
+    rates = market_arrays(market, n)
+
+    flows = project_cash_flows(
+        rent_per_sf * square_footage,
+        rates["growth_rate"],
+        rates["vacancy_rate"],
+        rates["exit_cap_rate"],
+        years=years
+    )
+    return dcf_batch_from_flows(flows, rates, discount_rate)
+
+def dcf_batch_from_flows(flows: Dict[str, np.ndarray], rates: Dict[str, np.ndarray],
+                         discount_rate: float = DISCOUNT_RATE) -> DCFBatch:
+    """Wrap projected cash flows and their assumptions into a DCFBatch."""
+    fcf = flows["fcf"]
+    return DCFBatch(
+        revenue=flows["revenue"],
+        fcf=fcf,
+        terminal_value=flows["terminal_value"],
+        growth_rate=rates["growth_rate"],
+        vacancy_rate=rates["vacancy_rate"],
+        exit_cap_rate=rates["exit_cap_rate"],
+        cap_ex_percent=CAP_EX_PERCENT,
+        npv=npv_batch(fcf, discount_rate),
+        irr=irr_batch(fcf),
+        equity_multiple=equity_multiple_batch(fcf)
+    )
@@ -0,0 +1,270 @@
+from typing import Dict, Iterable, List, Tuple, Union
+from dataclasses import dataclass, fields
+import logging
+import numpy as np
+import pandas as pd
+from atlas.core.dcf import PROJECTION_YEARS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_RATE = 0.05
+RATE_SHOCK = 0.02
+REFI_DEBT_YIELD = 0.09
+NO_RATE_CAP = np.inf
+
+@dataclass
+class Loan:
+    """Loan terms. `rate` is the coupon of a fixed loan, or the spread over
+    the index for a floating loan; `rate_cap` caps the all-in floating rate.
+    `amortization_years` of 0 means interest-only for the whole term."""
+    principal: float
+    rate: float
+    term_years: int
+    amortization_years: int = 30
+    io_years: int = 0
+    floating: bool = False
+    rate_cap: float = NO_RATE_CAP
+
+LOAN_FIELDS = tuple(f.name for f in fields(Loan))
+REQUIRED_LOAN_FIELDS = ('principal', 'rate', 'term_years')
+
+@dataclass
+class LoanBook:
+    """Many loans as parallel arrays, one entry per loan."""
+    principal: np.ndarray
+    rate: np.ndarray
+    term_years: np.ndarray
+    amortization_years: np.ndarray
+    io_years: np.ndarray
+    floating: np.ndarray
+    rate_cap: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.principal)
+
+    @classmethod
+    def from_loans(cls, loans: Iterable[Union[Loan, Dict]]) -> "LoanBook":
+        records = [loan if isinstance(loan, Loan) else Loan(**loan) for loan in loans]
+        return cls.from_dataframe(pd.DataFrame([loan.__dict__ for loan in records], columns=LOAN_FIELDS))
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "LoanBook":
+        missing = [name for name in REQUIRED_LOAN_FIELDS if name not in df]
+        if missing:
+            raise ValueError(f"Missing required loan columns: {missing}")
+        defaults = {f.name: f.default for f in fields(Loan)}
+        columns = {}
+        for name in LOAN_FIELDS:
+            column = df[name] if name in df else pd.Series(defaults[name], index=df.index)
+            if name not in REQUIRED_LOAN_FIELDS:
+                column = column.fillna(defaults[name])
+            columns[name] = column.to_numpy(dtype=bool if name == 'floating' else float)
+
+        if (columns['principal'] < 0).any():
+            raise ValueError("Loan principal cannot be negative")
+        if (columns['io_years'] > columns['term_years']).any():
+            raise ValueError("Interest-only period cannot exceed the loan term")
+        return cls(**columns)
+
+@dataclass
+class DebtSchedule:
+    """Annual debt schedules as (loans x years) arrays; balances are end of year.
+
+    Debt service and balances are zero after a loan matures; `balloon` is
+    the balance repaid at maturity, or the outstanding balance at the end
+    of the horizon for loans that mature later.
+    """
+    rate: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    debt_service: np.ndarray
+    balance: np.ndarray
+    balloon: np.ndarray
+    maturity_year: np.ndarray
+
+def amortization_schedule(loans: LoanBook, years: int = PROJECTION_YEARS, index_rates=None,
+                          rate_shock: float = 0.0) -> DebtSchedule:
+    """Amortize every loan of the book at once, one vectorized step per year.
+
+    `index_rates` is the floating-rate index per year, either shared
+    (years,) or per loan (loans x years); it defaults to a flat
+    DEFAULT_INDEX_RATE. `rate_shock` is added to the index. Amortizing
+    payments are re-sized each year on the remaining balance and
+    amortization period, which also covers rate resets of floating loans.
+    """
+    n = len(loans)
+    if index_rates is None:
+        index_rates = DEFAULT_INDEX_RATE
+    index = np.broadcast_to(np.asarray(index_rates, dtype=float), (n, years)) + rate_shock
+    floating_rate = np.minimum(index + loans.rate[:, None], loans.rate_cap[:, None])
+    rate = np.where(loans.floating[:, None], floating_rate, loans.rate[:, None])
+
+    interest = np.zeros((n, years))
+    principal = np.zeros((n, years))
+    balance = np.zeros((n, years))
+    maturity_year = np.minimum(loans.term_years, years).astype(int)
+    remaining = loans.principal.astype(float)
+    amortizing = loans.amortization_years > 0
+
+    for t in range(years):
+        active = t < loans.term_years
+        r = rate[:, t]
+        interest[:, t] = np.where(active, remaining * r, 0.0)
+
+        periods_left = loans.amortization_years - (t - loans.io_years)
+        pays_principal = active & amortizing & (t >= loans.io_years) & (periods_left > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            payment = np.where(
+                r == 0,
+                remaining / periods_left,
+                remaining * r / (1 - (1 + r) ** -periods_left)
+            )
+        principal[:, t] = np.where(pays_principal, np.minimum(payment - remaining * r, remaining), 0.0)
+        remaining = remaining - principal[:, t]
+        balance[:, t] = np.where(active, remaining, 0.0)
+
+    balloon = np.where(
+        maturity_year > 0,
+        np.take_along_axis(balance, np.maximum(maturity_year - 1, 0)[:, None], axis=1)[:, 0],
+        loans.principal
+    )
+    # Repay the balloon at maturity; afterwards the loan carries no balance
+    matured = np.arange(years)[None, :] >= (loans.term_years[:, None] - 1)
+    balance = np.where(matured & (loans.term_years[:, None] <= years), 0.0, balance)
+
+    return DebtSchedule(
+        rate=rate,
+        interest=interest,
+        principal=principal,
+        debt_service=interest + principal,
+        balance=balance,
+        balloon=balloon,
+        maturity_year=maturity_year
+    )
+
+@dataclass
+class DebtMetrics:
+    """Credit metrics per loan, derived from its schedule and property NOI."""
+    dscr: np.ndarray
+    min_dscr: np.ndarray
+    debt_yield: np.ndarray
+    ltv: np.ndarray
+    balloon: np.ndarray
+    refi_coverage: np.ndarray
+    shocked_min_dscr: np.ndarray
+    floating: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.min_dscr)
+
+    def to_dict(self, index: int) -> Dict:
+        return {
+            "min_dscr": float(self.min_dscr[index]),
+            "debt_yield": float(self.debt_yield[index]),
+            "ltv": float(self.ltv[index]),
+            "balloon": float(self.balloon[index]),
+            "refi_coverage": float(self.refi_coverage[index]),
+            "shocked_min_dscr": float(self.shocked_min_dscr[index]),
+            "floating": bool(self.floating[index])
+        }
+
+def _min_dscr(noi: np.ndarray, debt_service: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dscr = np.where(debt_service > 0, noi / debt_service, np.inf)
+    return dscr, dscr.min(axis=1)
+
+def debt_metrics(loans: LoanBook, noi, value=None, years: int = PROJECTION_YEARS,
+                 index_rates=None, rate_shock: float = RATE_SHOCK) -> DebtMetrics:
+    """DSCR, debt yield, LTV and refinance coverage for every loan.
+
+    Args:
+        loans: LoanBook with one loan per property
+        noi: NOI per loan, flat (loans,) or projected (loans x years)
+        value: Property value per loan, for LTV (NaN when omitted)
+        years: Horizon of the schedule
+        index_rates: Floating-rate index path, see `amortization_schedule`
+        rate_shock: Index shock used for `shocked_min_dscr`
+
+    `refi_coverage` is the balloon divided by the loan the property could
+    refinance at maturity at REFI_DEBT_YIELD; above 1 there is a gap.
+    """
+    n = len(loans)
+    noi = np.broadcast_to(np.asarray(noi, dtype=float).reshape(n, -1), (n, years))
+    schedule = amortization_schedule(loans, years, index_rates)
+    shocked = amortization_schedule(loans, years, index_rates, rate_shock=rate_shock)
+
+    dscr, min_dscr = _min_dscr(noi, schedule.debt_service)
+    _, shocked_min_dscr = _min_dscr(noi, shocked.debt_service)
+    maturity_noi = np.take_along_axis(noi, np.maximum(schedule.maturity_year - 1, 0)[:, None], axis=1)[:, 0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        debt_yield = np.where(loans.principal > 0, noi[:, 0] / loans.principal, np.inf)
+        refi_coverage = schedule.balloon / (maturity_noi / REFI_DEBT_YIELD)
+        if value is None:
+            ltv = np.full(n, np.nan)
+        else:
+            ltv = loans.principal / np.asarray(value, dtype=float)
+
+    return DebtMetrics(
+        dscr=dscr,
+        min_dscr=min_dscr,
+        debt_yield=debt_yield,
+        ltv=ltv,
+        balloon=schedule.balloon,
+        refi_coverage=refi_coverage,
+        shocked_min_dscr=shocked_min_dscr,
+        floating=loans.floating
+    )
+
+def _scale(values, low: float, high: float) -> np.ndarray:
+    """Map values linearly onto [0, 1] between `low` (0) and `high` (1)."""
+    return np.clip((np.asarray(values, dtype=float) - low) / (high - low), 0.0, 1.0)
+
+def financial_risk_scores(min_dscr, ltv, refi_coverage, shocked_min_dscr, floating) -> Dict[str, np.ndarray]:
+    """Leverage, refinance and interest-rate risk scores in [0, 1].
+
+    Works on scalars or arrays, so a whole loan book is scored at once.
+    Unknown LTVs (NaN) only count the DSCR half of the leverage score.
+    """
+    dscr_score = _scale(min_dscr, 1.6, 1.0)
+    ltv_score = _scale(np.nan_to_num(ltv, nan=0.0), 0.5, 0.8)
+    leverage = np.where(np.isnan(ltv), dscr_score, 0.5 * dscr_score + 0.5 * ltv_score)
+    refinance = _scale(refi_coverage, 0.6, 1.2)
+    # Fixed-rate loans are only exposed through refinancing
+    interest_rate = np.where(floating, _scale(shocked_min_dscr, 1.5, 1.0), 0.5 * refinance)
+    return {
+        "leverage": leverage,
+        "refinance": refinance,
+        "interest_rate": interest_rate
+    }
+
+def risk_levels(scores) -> np.ndarray:
+    return np.select([np.asarray(scores) < 1 / 3, np.asarray(scores) < 2 / 3], ["low", "medium"], "high")
+
+def loan_risks(metrics: DebtMetrics) -> List[Dict[str, Dict]]:
+    """Leverage/refinance/interest-rate RiskAssessments for every loan."""
+    scores = financial_risk_scores(metrics.min_dscr, metrics.ltv, metrics.refi_coverage,
+                                   metrics.shocked_min_dscr, metrics.floating)
+    levels = {name: risk_levels(values) for name, values in scores.items()}
+    results = []
+    for i in range(len(metrics)):
+        results.append({
+            "leverage_risk": {
+                "level": str(levels["leverage"][i]),
+                "factors": [f"Minimum DSCR: {metrics.min_dscr[i]:.2f}x", f"LTV: {metrics.ltv[i]:.0%}"],
+                "score": float(scores["leverage"][i])
+            },
+            "refinance_risk": {
+                "level": str(levels["refinance"][i]),
+                "factors": [f"Balloon: ${metrics.balloon[i]:,.0f}",
+                            f"Refinance coverage: {metrics.refi_coverage[i]:.2f}"],
+                "score": float(scores["refinance"][i])
+            },
+            "interest_rate_risk": {
+                "level": str(levels["interest_rate"][i]),
+                "factors": [f"{'Floating' if metrics.floating[i] else 'Fixed'} rate debt",
+                            f"DSCR after +{RATE_SHOCK:.0%} shock: {metrics.shocked_min_dscr[i]:.2f}x"],
+                "score": float(scores["interest_rate"][i])
+            }
+        })
+    return results
@@ -0,0 +1,226 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 100
+OUT_OF_RANGE_PENALTY = 0.5
+
+def _number(raw: str) -> float:
+    return float(raw.replace(',', ''))
+
+def _percent(raw: str) -> float:
+    return float(raw.replace(',', '')) / 100
+
+@dataclass
+class MetricPattern:
+    """A regex for one metric plus the literals that must occur near a match.
+
+    `literals` drive the prefilter: a match must start within `before`/
+    `after` characters of an occurrence of one of them, so every literal
+    a match can contain must be listed. The window bounds only where a
+    match starts; the match itself may run on to the end of the line.
+    `valid` bounds the parsed value; values outside it are kept with
+    reduced confidence.
+    """
+    metric: str
+    regex: str
+    literals: Tuple[str, ...]
+    confidence: float = 0.9
+    flags: int = 0
+    parse: Callable[[str], float] = _number
+    valid: Tuple[float, float] = (0.0, float('inf'))
+    before: int = DEFAULT_WINDOW
+    after: int = DEFAULT_WINDOW
+
+    def __post_init__(self):
+        self.compiled = re.compile(self.regex, self.flags)
+
+@dataclass
+class MetricMatch:
+    metric: str
+    value: float
+    text: str
+    start: int
+    end: int
+    confidence: float
+    pattern: str
+
+METRIC_PATTERNS = (
+    # Financial (previously CREAnalysisService._extract_noi)
+    MetricPattern('noi', r'NOI.*?\$?([\d,]+)', ('NOI',), confidence=0.9, after=200,
+                  valid=(1.0, 1e10)),
+    MetricPattern('noi', r'net\s+operating\s+income.*?\$\s?([\d,]+)', ('net',), confidence=0.85,
+                  flags=re.IGNORECASE, after=200, valid=(1.0, 1e10)),
+    MetricPattern('cap_rate', r'cap(?:italization)?\.?\s*rate\D{0,20}?([\d.]+)\s*%', ('cap',),
+                  confidence=0.85, flags=re.IGNORECASE, parse=_percent, valid=(0.01, 0.2)),
+    MetricPattern('occupancy', r'([\d.]+)\s*%\s*(?:occupied|occupancy|leased)', ('occup', 'leased'),
+                  confidence=0.8, flags=re.IGNORECASE, parse=_percent, valid=(0.0, 1.0)),
+    MetricPattern('occupancy', r'occupancy\D{0,20}?([\d.]+)\s*%', ('occup',),
+                  confidence=0.8, flags=re.IGNORECASE, parse=_percent, valid=(0.0, 1.0)),
+    # Document metrics (previously PDFProcessor.metrics_patterns)
+    MetricPattern('square_footage', r'(\d+,?\d*)\s*(?:square\s*feet|sq\s*ft|sf)', ('square', 'sq', 'sf'),
+                  confidence=0.8, valid=(100.0, 1e8)),
+    MetricPattern('far', r'far\s*(?:of)?\s*([\d.]+)', ('far',), confidence=0.7, valid=(0.1, 50.0)),
+    # Physical (previously PropertyMetricsExtractor._extract_physical_metrics)
+    MetricPattern('floor_depth', r'(\d+)\s*(?:ft|foot|feet)\s*(?:depth|deep)', ('depth', 'deep'),
+                  confidence=0.8, valid=(10.0, 500.0)),
+    MetricPattern('window_line', r'(\d+)%?\s*window\s*line', ('window',), confidence=0.7,
+                  valid=(0.0, 100000.0)),
+    MetricPattern('ceiling_height', r'(\d+(?:\.\d+)?)\s*(?:ft|foot|feet)\s*ceiling', ('ceiling',),
+                  confidence=0.8, valid=(6.0, 100.0)),
+    MetricPattern('floor_plate', r'(\d+,?\d*)\s*(?:sf|square\s*feet)\s*floor\s*plate', ('plate',),
+                  confidence=0.8, valid=(1000.0, 1e6))
+)
+
+PHYSICAL_METRICS = ('floor_depth', 'window_line', 'ceiling_height', 'floor_plate')
+DOCUMENT_METRICS = ('square_footage', 'far')
+
+def _merge_windows(windows: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+class MetricExtractionEngine:
+    """Extracts every registered metric from a document with one shared prefilter.
+
+    The document is lower-cased once, then each distinct literal of all
+    patterns is located with `str.find`, one pass per literal. These
+    C-level scans find the places where any metric can occur far faster
+    than running the regexes (or one regex alternation of all literals,
+    which is slower and misses overlapping literals). Each pattern then
+    only runs inside the merged windows around its own literals, and
+    patterns whose literals never occur are skipped altogether.
+    """
+
+    def __init__(self, patterns: Sequence[MetricPattern] = METRIC_PATTERNS,
+                 metrics: Optional[Iterable[str]] = None):
+        if metrics is not None:
+            wanted = set(metrics)
+            patterns = [p for p in patterns if p.metric in wanted]
+            missing = wanted - {p.metric for p in patterns}
+            if missing:
+                raise ValueError(f"No patterns registered for metrics: {sorted(missing)}")
+        self.patterns = list(patterns)
+        self._literal_patterns: Dict[str, List[int]] = {}
+        for index, pattern in enumerate(self.patterns):
+            for literal in pattern.literals:
+                self._literal_patterns.setdefault(literal.lower(), []).append(index)
+        # Only used when lower-casing changes the length of the text
+        literals = sorted(self._literal_patterns, key=len, reverse=True)
+        self._prefilter = re.compile('|'.join(re.escape(literal) for literal in literals), re.IGNORECASE)
+
+    @property
+    def metrics(self) -> List[str]:
+        return sorted({p.metric for p in self.patterns})
+
+    def _literal_hits(self, text: str) -> Iterator[Tuple[str, int]]:
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Lower-casing changed offsets (rare non-ASCII case mappings)
+            for hit in self._prefilter.finditer(text):
+                yield hit.group().lower(), hit.start()
+            return
+        for literal in self._literal_patterns:
+            start = lowered.find(literal)
+            while start != -1:
+                yield literal, start
+                start = lowered.find(literal, start + 1)
+
+    def _windows(self, text: str) -> Dict[int, List[Tuple[int, int]]]:
+        windows: Dict[int, List[Tuple[int, int]]] = {}
+        for literal, start in self._literal_hits(text):
+            end = start + len(literal)
+            for index in self._literal_patterns[literal]:
+                pattern = self.patterns[index]
+                windows.setdefault(index, []).append(
+                    (max(0, start - pattern.before), min(len(text), end + pattern.after))
+                )
+        return windows
+
+    @staticmethod
+    def _matches(pattern: MetricPattern, text: str, start: int, end: int) -> Iterator[re.Match]:
+        # Matches starting in [start, end); searching up to the end of the line
+        # keeps a number that straddles the window edge whole
+        line_end = text.find('\n', end)
+        endpos = len(text) if line_end == -1 else line_end
+        pos = start
+        while pos < end:
+            match = pattern.compiled.search(text, pos, endpos)
+            if match is None or match.start() >= end:
+                return
+            yield match
+            pos = match.end() if match.end() > match.start() else match.start() + 1
+
+    def extract(self, text: str) -> List[MetricMatch]:
+        """All matches in `text`, ordered by offset, with confidence scores."""
+        matches: List[MetricMatch] = []
+        seen = set()
+        for index, windows in self._windows(text).items():
+            pattern = self.patterns[index]
+            for start, end in _merge_windows(windows):
+                for match in self._matches(pattern, text, start, end):
+                    key = (pattern.metric, match.start(1), match.end(1))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    try:
+                        value = pattern.parse(match.group(1))
+                    except ValueError:
+                        continue
+                    low, high = pattern.valid
+                    confidence = pattern.confidence * (1.0 if low <= value <= high else OUT_OF_RANGE_PENALTY)
+                    matches.append(MetricMatch(
+                        metric=pattern.metric,
+                        value=value,
+                        text=match.group(0),
+                        start=match.start(),
+                        end=match.end(),
+                        confidence=confidence,
+                        pattern=pattern.regex
+                    ))
+        matches.sort(key=lambda m: (m.start, m.metric))
+        return matches
+
+    def best(self, text: str) -> Dict[str, MetricMatch]:
+        """The most confident match per metric; the earliest one wins ties."""
+        best: Dict[str, MetricMatch] = {}
+        for match in self.extract(text):
+            current = best.get(match.metric)
+            if current is None or match.confidence > current.confidence:
+                best[match.metric] = match
+        return best
+
+    def values(self, text: str) -> Dict[str, Optional[float]]:
+        """Best value per metric, None for metrics not found."""
+        best = self.best(text)
+        return {metric: best[metric].value if metric in best else None for metric in self.metrics}
+
+    def extract_many(self, texts: Sequence[str], processes: Optional[int] = None) -> List[List[MetricMatch]]:
+        """`extract` over a corpus, optionally spread across a process pool.
+
+        With `processes=None` everything runs in the calling process.
+        """
+        if not processes or processes <= 1:
+            return [self.extract(text) for text in texts]
+
+        logger.info(f"Extracting metrics from {len(texts)} documents across {processes} processes")
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            chunksize = max(1, len(texts) // (processes * 4))
+            return list(pool.map(self.extract, texts, chunksize=chunksize))
+
+_default_engine: Optional[MetricExtractionEngine] = None
+
+def default_engine() -> MetricExtractionEngine:
+    """Shared engine over METRIC_PATTERNS, compiled on first use."""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = MetricExtractionEngine()
+    return _default_engine
@@ -1,9 +1,11 @@
-from typing import Dict
+from typing import Dict, Sequence
 from atlas.core.config import AIConfig
+from atlas.core.extraction import PHYSICAL_METRICS, MetricExtractionEngine
 
 class PropertyMetricsExtractor:
     def __init__(self, config: AIConfig):
         self.config = config
+        self.engine = MetricExtractionEngine(metrics=PHYSICAL_METRICS)
         
     async def extract_metrics(self, data: Dict) -> Dict:
         metrics = {
@@ -18,11 +20,14 @@ class PropertyMetricsExtractor:
         return metrics
         
     def _extract_physical_metrics(self, data: Dict) -> Dict:
-        patterns = {
-            "floor_depth": r'(\d+)\s*(?:ft|foot|feet)\s*(?:depth|deep)',
-            "window_line": r'(\d+)%?\s*window\s*line',
-            "ceiling_height": r'(\d+(?:\.\d+)?)\s*(?:ft|foot|feet)\s*ceiling',
-            "floor_plate": r'(\d+,?\d*)\s*(?:sf|square\s*feet)\s*floor\s*plate'
+        return self._extract_with_patterns(data, PHYSICAL_METRICS)
+
+    def _extract_with_patterns(self, data: Dict, metrics: Sequence[str]) -> Dict:
+        """Best match per metric across all text fields of `data`, scanned once."""
+        text = "\n".join(value for value in data.values() if isinstance(value, str))
+        best = self.engine.best(text)
+        return {
+            metric: {"value": best[metric].value, "confidence": best[metric].confidence}
+            if metric in best else None
+            for metric in metrics
         }
-        
-        return self._extract_with_patterns(data, patterns)
@@ -0,0 +1,186 @@
+from typing import Optional
+from dataclasses import dataclass
+import logging
+import numpy as np
+import numpy_financial as npf
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOLERANCE = 1e-14
+DEFAULT_MAX_ITER = 100
+
+@dataclass
+class IRRResult:
+    """Per-row output of `solve_irr`.
+
+    `rate` is NaN where no IRR exists. `converged` is False for those rows
+    and for rows that hit the iteration limit.
+    """
+    rate: np.ndarray
+    converged: np.ndarray
+    iterations: np.ndarray
+
+def _sign_changes(cash_flows: np.ndarray) -> np.ndarray:
+    """Sign changes per row, ignoring zero entries (Descartes' rule of signs)."""
+    negative = cash_flows < 0
+    if cash_flows.all():
+        return (negative[:, 1:] != negative[:, :-1]).sum(axis=1)
+
+    signs = np.sign(cash_flows)
+    periods = np.arange(cash_flows.shape[1])
+    last_nonzero = np.maximum.accumulate(np.where(signs != 0, periods, 0), axis=1)
+    filled = np.take_along_axis(signs, last_nonzero, axis=1)
+    return ((filled[:, 1:] != filled[:, :-1]) & (filled[:, 1:] != 0) & (filled[:, :-1] != 0)).sum(axis=1)
+
+def _companion_irr(cash_flows: np.ndarray) -> np.ndarray:
+    """`npf.irr` semantics for every row via one stacked eigenvalue call.
+
+    Used for rows with several candidate roots, where `npf.irr` returns the
+    one closest to zero rather than the one a local solver would find.
+    """
+    result = np.full(cash_flows.shape[0], np.nan)
+    # np.roots strips zero end coefficients, which changes the companion size
+    irregular = (cash_flows[:, 0] == 0) | (cash_flows[:, -1] == 0)
+    for i in np.flatnonzero(irregular):
+        result[i] = npf.irr(cash_flows[i])
+
+    rows = np.flatnonzero(~irregular)
+    periods = cash_flows.shape[1]
+    if rows.size == 0 or periods < 2:
+        return result
+
+    # Polynomial sum(v_t * x**t) with x = 1 / (1 + irr), highest power first
+    coefficients = cash_flows[rows, ::-1]
+    companion = np.zeros((rows.size, periods - 1, periods - 1))
+    companion[:, 0, :] = -coefficients[:, 1:] / coefficients[:, :1]
+    companion[:, np.arange(1, periods - 1), np.arange(periods - 2)] = 1
+    roots = np.linalg.eigvals(companion)
+
+    valid = (roots.imag == 0) & (roots.real > 0)
+    with np.errstate(divide='ignore'):
+        rates = np.where(valid, 1 / np.where(valid, roots.real, 1) - 1, np.inf)
+    closest = np.argmin(np.abs(rates), axis=1)
+    chosen = rates[np.arange(rows.size), closest]
+    result[rows] = np.where(valid.any(axis=1), chosen, np.nan)
+    return result
+
+def _newton_bisect(cash_flows: np.ndarray, guess: Optional[float], tol: float, max_iter: int):
+    """Safeguarded Newton on p(x) = sum(v_t * x**t), x = 1 / (1 + irr).
+
+    Every row has exactly one sign change, so p has a single positive root
+    inside [0, 1 + max|v_t / v_last|]. Newton steps that leave the current
+    bracket are replaced by a bisection step, so each row converges.
+    """
+    n, periods = cash_flows.shape
+    # Normalise so that p(0) = v_0 < 0 and p(hi) > 0
+    flows = cash_flows * -np.sign(cash_flows[:, :1])
+    last = np.take_along_axis(
+        flows, (periods - 1 - np.argmax(flows[:, ::-1] != 0, axis=1))[:, None], axis=1
+    )[:, 0]
+
+    lo = np.zeros(n)
+    hi = 1 + np.abs(flows).max(axis=1) / np.abs(last)
+    if guess is None:
+        # Discount factor at which the inflows, collapsed to their
+        # value-weighted mean time, exactly repay the outlay
+        inflows = np.clip(flows[:, 1:], 0, None)
+        total = inflows.sum(axis=1)
+        duration = (inflows * np.arange(1, periods)).sum(axis=1) / np.where(total > 0, total, 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = (-flows[:, 0] / total) ** (1 / duration)
+    else:
+        x = np.full(n, 1 / (1 + guess))
+    x = np.where((x > lo) & (x < hi), x, (lo + hi) / 2)
+
+    converged = np.zeros(n, dtype=bool)
+    iterations = np.zeros(n, dtype=np.int64)
+    active = np.arange(n)
+    # Period-major copy keeps each Horner step on contiguous memory
+    columns = np.ascontiguousarray(flows.T)
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        xa = x[active]
+        lo_a = lo[active]
+        hi_a = hi[active]
+
+        p = columns[-1].copy()
+        dp = np.zeros_like(p)
+        for t in range(periods - 2, -1, -1):
+            dp *= xa
+            dp += p
+            p *= xa
+            p += columns[t]
+
+        below = p < 0
+        lo_a = np.where(below, xa, lo_a)
+        hi_a = np.where(below, hi_a, xa)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = xa - p / dp
+        inside = (newton >= lo_a) & (newton <= hi_a)
+        x_new = np.where(inside, newton, (lo_a + hi_a) / 2)
+
+        done = (p == 0) | (inside & (np.abs(newton - xa) <= tol * xa)) | (hi_a - lo_a <= tol * xa)
+        x[active] = np.where(p == 0, xa, x_new)
+        lo[active] = lo_a
+        hi[active] = hi_a
+        iterations[active] += 1
+        converged[active[done]] = True
+
+        if done.any():
+            keep = ~done
+            active = active[keep]
+            columns = columns[:, keep]
+
+    return 1 / x - 1, converged, iterations
+
+def solve_irr(cash_flows, guess: Optional[float] = None, tol: float = DEFAULT_TOLERANCE,
+              max_iter: int = DEFAULT_MAX_ITER) -> IRRResult:
+    """IRR for every row of a 2-D cash-flow array.
+
+    Rows with exactly one sign change have a unique IRR and are solved
+    together with a vectorized Newton iteration that falls back to
+    bisection. Rows with several sign changes can have several IRRs; those
+    are resolved exactly like `npf.irr` (the root closest to zero). Rows
+    with no sign change have no IRR.
+
+    Args:
+        cash_flows: (N x periods) array, or a single cash-flow vector
+        guess: Starting rate for the Newton iteration; None derives one
+            per row from the cash flows' duration
+        tol: Relative convergence tolerance on the discount factor
+        max_iter: Iteration limit per row
+
+    Returns:
+        IRRResult with per-row rate, convergence flag and iteration count
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    n = cash_flows.shape[0]
+    rate = np.full(n, np.nan)
+    converged = np.zeros(n, dtype=bool)
+    iterations = np.zeros(n, dtype=np.int64)
+
+    finite = np.isfinite(cash_flows).all(axis=1)
+    if finite.all():
+        changes = _sign_changes(cash_flows)
+    else:
+        changes = np.where(finite, _sign_changes(np.where(finite[:, None], cash_flows, 0)), 0)
+
+    unique = np.flatnonzero((changes == 1) & (cash_flows[:, 0] != 0))
+    if unique.size == n:
+        rate, converged, iterations = _newton_bisect(cash_flows, guess, tol, max_iter)
+    elif unique.size:
+        rate[unique], converged[unique], iterations[unique] = _newton_bisect(
+            cash_flows[unique], guess, tol, max_iter
+        )
+
+    multiple = np.flatnonzero((changes > 1) | ((changes == 1) & (cash_flows[:, 0] == 0)))
+    if multiple.size:
+        rate[multiple] = _companion_irr(cash_flows[multiple])
+        converged[multiple] = ~np.isnan(rate[multiple])
+
+    if not converged[unique].all():
+        logger.warning(f"IRR did not converge for {(~converged[unique]).sum()} rows")
+    return IRRResult(rate=rate, converged=converged, iterations=iterations)
@@ -0,0 +1,176 @@
+from typing import Dict, List, Mapping, Optional, Sequence
+import logging
+import numpy as np
+import pandas as pd
+from atlas.core.dcf import (
+    DCFBatch, CAP_EX_PERCENT, DISCOUNT_RATE, PROJECTION_YEARS,
+    equity_multiple_batch, irr_batch, market_arrays, metric_column, npv_batch, project_cash_flows
+)
+from atlas.core.risk import MARKET_METRICS, SubmarketBenchmarks
+
+logger = logging.getLogger(__name__)
+
+# Downstream stages that each market field feeds. Fields that are not
+# listed (absorption_rate, new_supply, ...) only affect the risk stage.
+STAGE_DEPENDENCIES = {
+    'rent_growth': ('revenue', 'terminal_value', 'valuation'),
+    'vacancy_rate': ('revenue', 'terminal_value', 'valuation'),
+    'market_cap_rate': ('terminal_value', 'valuation')
+}
+STAGES = ('revenue', 'terminal_value', 'valuation', 'risk')
+
+class IncrementalPortfolio:
+    """Portfolio DCF state that is updated in place when market data changes.
+
+    Property-derived inputs (base revenue) are computed once. A market
+    update only recomputes the stages that depend on the fields that
+    changed, and only for the properties in the affected submarkets:
+    a new `market_cap_rate` touches the terminal value and valuation,
+    a new `rent_growth` or `vacancy_rate` also re-projects revenue.
+    All affected properties are recomputed in one vectorized pass.
+    """
+
+    def __init__(self, metrics: Sequence, submarkets: Sequence[str], markets: Mapping[str, Dict],
+                 years: int = PROJECTION_YEARS, discount_rate: float = DISCOUNT_RATE):
+        if len(submarkets) != len(metrics):
+            raise ValueError(f"Expected {len(metrics)} submarket entries, got {len(submarkets)}")
+        codes, names = pd.factorize(pd.Series(submarkets, dtype=object))
+        missing = [name for name in names if name not in markets]
+        if missing:
+            raise ValueError(f"No market data for submarkets: {missing}")
+
+        self.metrics = metrics
+        self.years = years
+        self.discount_rate = discount_rate
+        self.submarket_codes = codes
+        self.submarket_names = list(names)
+        self.submarket_index = {name: code for code, name in enumerate(names)}
+        self.markets = {name: dict(markets[name]) for name in names}
+        self.risks: List[Optional[Dict]] = [None] * len(metrics)
+        # Risk benchmarks, set by the service that scores the portfolio
+        self.benchmarks: Optional[SubmarketBenchmarks] = None
+        self.recomputed = dict.fromkeys(STAGES, 0)
+
+        self.base_revenue = metric_column(metrics, 'rent_per_sf') * metric_column(metrics, 'square_footage')
+        rates = market_arrays([self.markets[name] for name in names], len(names))
+        self.growth_rate = rates["growth_rate"][codes]
+        self.vacancy_rate = rates["vacancy_rate"][codes]
+        self.exit_cap_rate = rates["exit_cap_rate"][codes]
+
+        flows = project_cash_flows(self.base_revenue, self.growth_rate, self.vacancy_rate,
+                                   self.exit_cap_rate, years=years)
+        for name, values in flows.items():
+            setattr(self, name, values)
+        self.npv = npv_batch(self.fcf, discount_rate)
+        self.irr = irr_batch(self.fcf)
+        self.equity_multiple = equity_multiple_batch(self.fcf)
+
+    def __len__(self) -> int:
+        return len(self.submarket_codes)
+
+    @property
+    def batch(self) -> DCFBatch:
+        return DCFBatch(
+            revenue=self.revenue,
+            fcf=self.fcf,
+            terminal_value=self.terminal_value,
+            growth_rate=self.growth_rate,
+            vacancy_rate=self.vacancy_rate,
+            exit_cap_rate=self.exit_cap_rate,
+            cap_ex_percent=CAP_EX_PERCENT,
+            npv=self.npv,
+            irr=self.irr,
+            equity_multiple=self.equity_multiple
+        )
+
+    def market_for(self, index: int) -> Dict:
+        return self.markets[self.submarket_names[self.submarket_codes[index]]]
+
+    def submarkets(self, rows: Optional[np.ndarray] = None) -> List[str]:
+        """Submarket name of every property, or of the properties at `rows`."""
+        codes = self.submarket_codes if rows is None else self.submarket_codes[rows]
+        return np.asarray(self.submarket_names, dtype=object)[codes].tolist()
+
+    def metrics_at(self, rows: np.ndarray) -> Sequence:
+        """The metrics of the properties at `rows`, columnar if the portfolio is."""
+        if hasattr(self.metrics, 'column'):
+            return self.metrics[rows]
+        return [self.metrics[i] for i in rows.tolist()]
+
+    def update_markets(self, updates: Mapping[str, Dict]) -> Dict[str, np.ndarray]:
+        """Apply new market data for one or more submarkets.
+
+        Each update may be partial (for example only `rent_growth`); it is
+        merged into the submarket's current data. Returns, per stage, the
+        indices of the properties that stage was recomputed for; a change
+        to a field risk ranks submarkets by marks every property for risk.
+        """
+        # Checked up front so a bad name cannot leave earlier updates half-applied
+        unknown = [name for name in updates if name not in self.submarket_index]
+        if unknown:
+            raise ValueError(f"Unknown submarket: {', '.join(unknown)}")
+        stage_codes = {stage: [] for stage in STAGES}
+        reranked = False
+        for name, update in updates.items():
+            current = self.markets[name]
+            merged = {**current, **update}
+            changed = [field for field in merged if merged[field] != current.get(field)]
+            if not changed:
+                continue
+            self.markets[name] = merged
+            code = self.submarket_index[name]
+            stages = {'risk'}.union(*(STAGE_DEPENDENCIES.get(field, ()) for field in changed))
+            for stage in stages:
+                stage_codes[stage].append(code)
+            reranked = reranked or any(field in MARKET_METRICS for field in changed)
+            logger.info(f"Market update for {name} changed {changed}")
+        if reranked:
+            # Risk ranks submarkets against each other, so every property moves
+            stage_codes['risk'] = list(range(len(self.submarket_names)))
+
+        rows = {stage: np.flatnonzero(np.isin(self.submarket_codes, codes))
+                for stage, codes in stage_codes.items()}
+        self._refresh_rates(rows['terminal_value'])
+        self._recompute(rows)
+        for stage, indices in rows.items():
+            self.recomputed[stage] += len(indices)
+        return rows
+
+    def _refresh_rates(self, rows: np.ndarray) -> None:
+        if not len(rows):
+            return
+        names = self.submarket_names
+        rates = market_arrays([self.markets[name] for name in names], len(names))
+        codes = self.submarket_codes[rows]
+        self.growth_rate[rows] = rates["growth_rate"][codes]
+        self.vacancy_rate[rows] = rates["vacancy_rate"][codes]
+        self.exit_cap_rate[rows] = rates["exit_cap_rate"][codes]
+
+    def _recompute(self, rows: Dict[str, np.ndarray]) -> None:
+        revenue_rows = rows['revenue']
+        if len(revenue_rows):
+            flows = project_cash_flows(
+                self.base_revenue[revenue_rows],
+                self.growth_rate[revenue_rows],
+                self.vacancy_rate[revenue_rows],
+                self.exit_cap_rate[revenue_rows],
+                years=self.years
+            )
+            for name, values in flows.items():
+                getattr(self, name)[revenue_rows] = values
+
+        # Rows whose revenue path is unchanged only need a new terminal value
+        terminal_rows = np.setdiff1d(rows['terminal_value'], revenue_rows, assume_unique=True)
+        if len(terminal_rows):
+            terminal_value = self.noi[terminal_rows, -1] / self.exit_cap_rate[terminal_rows]
+            self.fcf[terminal_rows, -1] = (
+                self.noi[terminal_rows, -1] + self.capex[terminal_rows, -1] + terminal_value
+            )
+            self.terminal_value[terminal_rows] = terminal_value
+
+        valuation_rows = rows['valuation']
+        if len(valuation_rows):
+            fcf = self.fcf[valuation_rows]
+            self.npv[valuation_rows] = npv_batch(fcf, self.discount_rate)
+            self.irr[valuation_rows] = irr_batch(fcf)
+            self.equity_multiple[valuation_rows] = equity_multiple_batch(fcf)
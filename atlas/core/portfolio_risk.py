@@ -0,0 +1,200 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+from dataclasses import dataclass
+import logging
+import numpy as np
+import pandas as pd
+from atlas.core.dcf import metric_column, npv_from_assumptions
+from atlas.core.simulation import SCENARIO_VARIABLES, SimulationConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIDENCE = 0.95
+# Elements of a (scenarios x assets) chunk held in memory at once
+CHUNK_ELEMENTS = 2_000_000
+
+ScenarioSource = Callable[[], Iterable[np.ndarray]]
+
+@dataclass
+class PortfolioRiskResult:
+    """Portfolio VaR/CVaR with per-asset and per-group risk contributions.
+
+    VaR and CVaR are reported as positive losses relative to zero P&L.
+    `asset_contributions` are Euler contributions to CVaR, i.e. each
+    asset's average loss in the portfolio's tail scenarios, and sum to
+    `cvar`. The group covariance is of the summed P&L of each group;
+    `group_contributions` split the portfolio standard deviation the
+    same way (w' S w / sigma) and sum to `std`.
+    """
+    confidence: float
+    n_scenarios: int
+    expected_pnl: float
+    std: float
+    var: float
+    cvar: float
+    asset_contributions: np.ndarray
+    asset_expected_pnl: np.ndarray
+    groups: List[str]
+    group_covariance: np.ndarray
+    group_contributions: np.ndarray
+
+    @property
+    def group_correlation(self) -> np.ndarray:
+        std = np.sqrt(np.diag(self.group_covariance))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.group_covariance / np.outer(std, std)
+
+    @property
+    def diversification_benefit(self) -> float:
+        """Sum of standalone group volatilities minus the portfolio volatility."""
+        return float(np.sqrt(np.diag(self.group_covariance)).sum() - self.std)
+
+    def to_dict(self) -> Dict:
+        return {
+            "confidence": self.confidence,
+            "n_scenarios": self.n_scenarios,
+            "expected_pnl": self.expected_pnl,
+            "std": self.std,
+            "var": self.var,
+            "cvar": self.cvar,
+            "diversification_benefit": self.diversification_benefit,
+            "asset_cvar_contributions": self.asset_contributions.tolist(),
+            "groups": {
+                name: {
+                    "std_contribution": float(self.group_contributions[g]),
+                    "correlation": dict(zip(self.groups, self.group_correlation[g].tolist()))
+                }
+                for g, name in enumerate(self.groups)
+            }
+        }
+
+def array_chunks(scenarios: np.ndarray, chunk_size: Optional[int] = None) -> ScenarioSource:
+    """Scenario source over an in-memory or memory-mapped (scenarios x assets) array."""
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_ELEMENTS // max(scenarios.shape[1], 1))
+
+    def chunks() -> Iterator[np.ndarray]:
+        for start in range(0, len(scenarios), chunk_size):
+            yield np.asarray(scenarios[start:start + chunk_size], dtype=float)
+    return chunks
+
+def aggregate_portfolio_risk(chunks: ScenarioSource, groups: Sequence[str],
+                             confidence: float = DEFAULT_CONFIDENCE) -> PortfolioRiskResult:
+    """VaR/CVaR and risk contributions from per-asset P&L scenarios.
+
+    Args:
+        chunks: Callable returning an iterable of (chunk x assets) P&L
+            arrays; it is called twice and must yield the same scenarios
+            both times
+        groups: Group label (submarket, property type, ...) per asset
+        confidence: VaR/CVaR confidence level
+
+    The first pass reduces each chunk to portfolio P&L and group sums
+    (chunk @ one-hot membership) and accumulates the group cross-product
+    matrix; the second pass sums asset P&L over the tail scenarios. Only
+    one chunk and the (scenarios,) portfolio P&L are ever held in memory.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1")
+    codes, names = pd.factorize(pd.Series(groups, dtype=object))
+    n_assets = len(codes)
+    membership = np.zeros((n_assets, len(names)))
+    membership[np.arange(n_assets), codes] = 1.0
+
+    portfolio = []
+    group_sum = np.zeros(len(names))
+    group_cross = np.zeros((len(names), len(names)))
+    asset_sum = np.zeros(n_assets)
+    for chunk in chunks():
+        if chunk.shape[1] != n_assets:
+            raise ValueError(f"Expected {n_assets} assets per scenario, got {chunk.shape[1]}")
+        grouped = chunk @ membership
+        portfolio.append(grouped.sum(axis=1))
+        group_sum += grouped.sum(axis=0)
+        group_cross += grouped.T @ grouped
+        asset_sum += chunk.sum(axis=0)
+
+    portfolio = np.concatenate(portfolio)
+    n = len(portfolio)
+    if n < 2:
+        raise ValueError("At least two scenarios are needed")
+    group_mean = group_sum / n
+    group_covariance = (group_cross - n * np.outer(group_mean, group_mean)) / (n - 1)
+
+    # The tail is the k worst scenarios, so CVaR and its contributions agree exactly
+    tail_size = max(1, int(np.ceil(round((1 - confidence) * n, 9))))
+    tail = np.zeros(n, dtype=bool)
+    tail[np.argpartition(portfolio, tail_size - 1)[:tail_size]] = True
+    var = -float(portfolio[tail].max())
+    cvar = -float(portfolio[tail].mean())
+
+    tail_sum = np.zeros(n_assets)
+    start = 0
+    for chunk in chunks():
+        stop = start + len(chunk)
+        tail_sum += chunk[tail[start:stop]].sum(axis=0)
+        start = stop
+
+    std = float(np.sqrt(group_covariance.sum()))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        group_contributions = group_covariance.sum(axis=1) / std if std > 0 else np.zeros(len(names))
+
+    return PortfolioRiskResult(
+        confidence=confidence,
+        n_scenarios=n,
+        expected_pnl=float(portfolio.mean()),
+        std=std,
+        var=var,
+        cvar=cvar,
+        asset_contributions=-tail_sum / tail_size,
+        asset_expected_pnl=asset_sum / n,
+        groups=list(names),
+        group_covariance=group_covariance,
+        group_contributions=group_contributions
+    )
+
+def correlated_npv_scenarios(metrics: Sequence, submarkets: Sequence[str], markets: Mapping[str, Dict],
+                             config: Optional[SimulationConfig] = None,
+                             market_correlation: float = 0.5) -> ScenarioSource:
+    """Scenario source of per-property NPV (net of implied purchase price).
+
+    Every submarket draws its own rent growth, vacancy and exit cap rate
+    per scenario from `config.distributions`; the draws share a common
+    factor so that submarkets are correlated with `market_correlation`.
+    Properties of the same submarket move together. Scenario values are
+    regenerated from `config.seed` on every call of the source, chunk by
+    chunk, so the full (scenarios x assets) matrix is never built.
+    """
+    config = config or SimulationConfig()
+    if config.seed is None:
+        raise ValueError("A seed is required so scenarios can be regenerated")
+    if not 0 <= market_correlation <= 1:
+        raise ValueError("Market correlation must be between 0 and 1")
+    codes, names = pd.factorize(pd.Series(submarkets, dtype=object))
+    distributions = [config.distributions(markets[name]) for name in names]
+    base_revenue = metric_column(metrics, 'rent_per_sf') * metric_column(metrics, 'square_footage')
+    purchase_price = metric_column(metrics, 'noi') / metric_column(metrics, 'cap_rate')
+    chunk_size = max(1, min(config.chunk_size, CHUNK_ELEMENTS // max(len(codes), 1)))
+
+    def chunks() -> Iterator[np.ndarray]:
+        rng = np.random.default_rng(config.seed)
+        for start in range(0, config.n_scenarios, chunk_size):
+            size = min(chunk_size, config.n_scenarios - start)
+            common = rng.standard_normal((size, 1, len(SCENARIO_VARIABLES)))
+            own = rng.standard_normal((size, len(names), len(SCENARIO_VARIABLES)))
+            z = np.sqrt(market_correlation) * common + np.sqrt(1 - market_correlation) * own
+            draws = {
+                variable: np.stack([
+                    distributions[j][variable].from_standard_normal(z[:, j, v]) for j in range(len(names))
+                ], axis=1)[:, codes]
+                for v, variable in enumerate(SCENARIO_VARIABLES)
+            }
+            npv = npv_from_assumptions(
+                base_revenue,
+                draws['rent_growth'],
+                draws['vacancy_rate'],
+                draws['exit_cap_rate'],
+                years=config.years,
+                discount_rate=config.discount_rate
+            )
+            yield npv - purchase_price
+    return chunks
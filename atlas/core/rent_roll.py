@@ -0,0 +1,157 @@
+from typing import Dict, Iterable, Optional, Union
+from dataclasses import dataclass, fields
+import logging
+import numpy as np
+import pandas as pd
+from atlas.core.dcf import (
+    DCFBatch, DISCOUNT_RATE, PROJECTION_YEARS, EXIT_CAP_SPREAD,
+    cash_flows_from_revenue, dcf_batch_from_flows
+)
+
+logger = logging.getLogger(__name__)
+
+MONTHS_PER_YEAR = 12
+DEFAULT_ESCALATION = 0.03
+DEFAULT_RENEWAL_PROBABILITY = 0.7
+DEFAULT_DOWNTIME_MONTHS = 6
+DEFAULT_NEW_LEASE_FREE_RENT = 3
+
+@dataclass
+class Lease:
+    """One lease of a rent roll. Months are counted from the analysis start,
+    so leases already in place have a negative `start_month`."""
+    square_footage: float
+    rent_per_sf: float
+    expiration_month: int
+    start_month: int = 0
+    escalation: float = DEFAULT_ESCALATION
+    free_rent_months: int = 0
+    renewal_probability: float = DEFAULT_RENEWAL_PROBABILITY
+    downtime_months: int = DEFAULT_DOWNTIME_MONTHS
+    market_rent_per_sf: Optional[float] = None
+
+LEASE_FIELDS = tuple(f.name for f in fields(Lease))
+REQUIRED_LEASE_FIELDS = ('square_footage', 'rent_per_sf', 'expiration_month')
+
+@dataclass
+class RentRoll:
+    """Leases of one building as parallel arrays, one entry per lease.
+
+    Rents are annual per square foot; `market_rent_per_sf` is the rent a
+    renewing or replacement tenant signs at today's market level.
+    """
+    square_footage: np.ndarray
+    rent_per_sf: np.ndarray
+    expiration_month: np.ndarray
+    start_month: np.ndarray
+    escalation: np.ndarray
+    free_rent_months: np.ndarray
+    renewal_probability: np.ndarray
+    downtime_months: np.ndarray
+    market_rent_per_sf: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.square_footage)
+
+    @classmethod
+    def from_leases(cls, leases: Iterable[Union[Lease, Dict]]) -> "RentRoll":
+        records = [lease if isinstance(lease, Lease) else Lease(**lease) for lease in leases]
+        return cls.from_dataframe(pd.DataFrame([lease.__dict__ for lease in records], columns=LEASE_FIELDS))
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "RentRoll":
+        missing = [name for name in REQUIRED_LEASE_FIELDS if name not in df]
+        if missing:
+            raise ValueError(f"Missing required lease columns: {missing}")
+
+        defaults = {f.name: f.default for f in fields(Lease)}
+        columns = {}
+        for name in LEASE_FIELDS:
+            column = df[name] if name in df else pd.Series(np.nan, index=df.index)
+            if name == 'market_rent_per_sf':
+                column = column.fillna(df['rent_per_sf'])
+            elif name not in REQUIRED_LEASE_FIELDS:
+                column = column.fillna(defaults[name])
+            columns[name] = column.to_numpy(dtype=float)
+
+        if (columns['expiration_month'] < columns['start_month']).any():
+            raise ValueError("Lease expiration cannot precede its start")
+        if not ((columns['renewal_probability'] >= 0) & (columns['renewal_probability'] <= 1)).all():
+            raise ValueError("Renewal probability must be between 0 and 1")
+        return cls(**columns)
+
+def _column(values) -> np.ndarray:
+    return np.asarray(values, dtype=float)[:, None]
+
+def monthly_rent(rent_roll: RentRoll, months: int, market_growth: float = 0.0) -> np.ndarray:
+    """Expected rent of every lease in every month, as a (leases x months) array.
+
+    The contract term pays base rent stepped up by `escalation` on each
+    lease anniversary, after `free_rent_months` of abatement. At
+    expiration the space renews at market rent with `renewal_probability`;
+    otherwise it sits vacant for `downtime_months` and is re-let at market
+    rent with a new-lease free rent period. Market rent grows at
+    `market_growth` per year from the analysis start. The renewal and
+    re-let outcomes are probability-weighted, not simulated.
+    """
+    month = np.arange(months)[None, :]
+    sf = _column(rent_roll.square_footage)
+    start = _column(rent_roll.start_month)
+    expiration = _column(rent_roll.expiration_month)
+    renewal = _column(rent_roll.renewal_probability)
+    relet = expiration + _column(rent_roll.downtime_months)
+
+    elapsed = month - start
+    steps = np.floor_divide(elapsed, MONTHS_PER_YEAR)
+    contract_rent = (sf * _column(rent_roll.rent_per_sf) / MONTHS_PER_YEAR
+                     * (1 + _column(rent_roll.escalation)) ** steps)
+    in_term = (elapsed >= _column(rent_roll.free_rent_months)) & (month >= start) & (month < expiration)
+
+    market_rent = (sf * _column(rent_roll.market_rent_per_sf) / MONTHS_PER_YEAR
+                   * (1 + market_growth) ** (month / MONTHS_PER_YEAR))
+    renewed = month >= expiration
+    relet_paying = month >= relet + DEFAULT_NEW_LEASE_FREE_RENT
+
+    return np.where(in_term, contract_rent, 0.0) + market_rent * (
+        renewal * renewed + (1 - renewal) * relet_paying
+    )
+
+def monthly_occupancy(rent_roll: RentRoll, months: int) -> np.ndarray:
+    """Expected occupied square feet per month (free rent counts as occupied)."""
+    month = np.arange(months)[None, :]
+    start = _column(rent_roll.start_month)
+    expiration = _column(rent_roll.expiration_month)
+    renewal = _column(rent_roll.renewal_probability)
+    relet = expiration + _column(rent_roll.downtime_months)
+    share = (((month >= start) & (month < expiration))
+             + renewal * (month >= expiration) + (1 - renewal) * (month >= relet))
+    return np.asarray(rent_roll.square_footage, dtype=float) @ share
+
+def annual_revenue(rent_roll: RentRoll, years: int = PROJECTION_YEARS, market_growth: float = 0.0) -> np.ndarray:
+    """Rent roll revenue summed to calendar years of the analysis."""
+    rent = monthly_rent(rent_roll, years * MONTHS_PER_YEAR, market_growth).sum(axis=0)
+    return rent.reshape(years, MONTHS_PER_YEAR).sum(axis=1)
+
+def generate_rent_roll_dcf(rent_roll: RentRoll, market: Dict, years: int = PROJECTION_YEARS,
+                           discount_rate: float = DISCOUNT_RATE) -> DCFBatch:
+    """DCF model of one building driven by its rent roll.
+
+    Revenue comes from the lease-level monthly engine instead of a flat
+    growth rate; vacancy is implied by the rent roll (downtime between
+    leases), so the market vacancy rate is not applied on top. The
+    reported vacancy rate is the building's average expected vacancy.
+    """
+    if not len(rent_roll):
+        raise ValueError("Rent roll has no leases")
+    growth = market['rent_growth']
+    revenue = annual_revenue(rent_roll, years, growth)[None, :]
+    exit_cap_rate = np.array([market['market_cap_rate'] + EXIT_CAP_SPREAD])
+    occupancy = monthly_occupancy(rent_roll, years * MONTHS_PER_YEAR).mean() / rent_roll.square_footage.sum()
+
+    flows = cash_flows_from_revenue(revenue, exit_cap_rate)
+    rates = {
+        "growth_rate": np.array([growth], dtype=float),
+        "vacancy_rate": np.array([1 - occupancy]),
+        "exit_cap_rate": exit_cap_rate
+    }
+    return dcf_batch_from_flows(flows, rates, discount_rate)
@@ -0,0 +1,295 @@
+from typing import Dict, List, Mapping, Optional, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import numpy as np
+import pandas as pd
+from atlas.core.dcf import DEFAULT_VACANCY_RATE, metric_column
+from atlas.core.debt import risk_levels
+
+logger = logging.getLogger(__name__)
+
+PERCENTILE_GRID = np.linspace(0, 100, 21)
+PEER_METRICS = ('cap_rate', 'occupancy', 'rent_per_sf')
+MARKET_METRICS = ('new_supply', 'vacancy_rate', 'rent_growth')
+MAX_BUILDING_AGE = 50
+NEUTRAL_SCORE = 0.5
+
+# Thresholds for scoring a property on its own, with no peers to rank against
+HIGH_NEW_SUPPLY_SF = 2_000_000
+HIGH_VACANCY_RATE = 0.2
+RENT_GROWTH_RANGE = (-0.02, 0.05)  # growth scored fully risky / not risky at all
+CAP_RATE_SPREAD_RANGE = 0.01  # spread below the market cap rate that is fully risky
+OCCUPANCY_GAP_RANGE = 0.1  # shortfall against market occupancy that is fully risky
+
+MITIGANTS = {
+    "market_mitigants": ["Diversification", "Long-term leases"],
+    "property_mitigants": ["Regular maintenance", "Tenant improvements"],
+    "financial_mitigants": ["Fixed-rate debt", "Hedging strategies"]
+}
+
+RECOMMENDATIONS = {
+    "improve_tenant_mix": "Consider attracting more diverse tenants to reduce risk.",
+    "increase_lease_terms": "Negotiate longer lease terms to stabilize cash flow.",
+    "reduce_operating_expenses": "Implement cost-saving measures to improve NOI."
+}
+
+# Used for the financial risks when no debt data is available
+DEFAULT_FINANCIAL_RISKS = {
+    "leverage_risk": {"level": "low", "factors": ["Debt-to-equity ratio"], "score": 0.1},
+    "refinance_risk": {"level": "medium", "factors": ["Interest rate environment"], "score": 0.5},
+    "interest_rate_risk": {"level": "medium", "factors": ["Interest rate volatility"], "score": 0.5}
+}
+
+def mitigants() -> Dict[str, List[str]]:
+    """A fresh copy of MITIGANTS, safe for the caller to edit."""
+    return {group: list(items) for group, items in MITIGANTS.items()}
+
+def recommendations() -> Dict[str, str]:
+    """A fresh copy of RECOMMENDATIONS, safe for the caller to edit."""
+    return dict(RECOMMENDATIONS)
+
+def default_financial_risks() -> Dict[str, Dict]:
+    """A fresh copy of DEFAULT_FINANCIAL_RISKS, safe for the caller to edit."""
+    return {name: {**risk, "factors": list(risk["factors"])} for name, risk in DEFAULT_FINANCIAL_RISKS.items()}
+
+def _percentile_rank(grid: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Percentile (0-1) of each value against its own row of percentile breakpoints.
+
+    `grid` is (rows x len(PERCENTILE_GRID)) with one row per value. Values
+    are placed by linear interpolation between breakpoints; rows without
+    spread (no peers, or identical peers) score NEUTRAL_SCORE.
+    """
+    points = grid.shape[1]
+    position = (grid <= values[:, None]).sum(axis=1)
+    upper = np.clip(position, 1, points - 1)
+    lo = np.take_along_axis(grid, (upper - 1)[:, None], axis=1)[:, 0]
+    hi = np.take_along_axis(grid, upper[:, None], axis=1)[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where(hi > lo, np.clip((values - lo) / (hi - lo), 0.0, 1.0), 1.0)
+    rank = np.where(position == 0, 0.0, (upper - 1 + fraction) / (points - 1))
+    no_spread = np.isnan(grid).any(axis=1) | (grid[:, -1] == grid[:, 0])
+    return np.where(no_spread, NEUTRAL_SCORE, rank)
+
+@dataclass
+class SubmarketBenchmarks:
+    """Percentile breakpoints per submarket, computed once and reused for scoring.
+
+    `peer` holds, for each metric in PEER_METRICS, a (submarkets x grid)
+    array of percentiles over the properties of that submarket. `market`
+    holds the percentile rank of each submarket's market data among all
+    submarkets.
+    """
+    submarkets: List[str]
+    peer: Dict[str, np.ndarray]
+    market: Dict[str, np.ndarray]
+    market_data: Dict[str, Dict]
+
+    @classmethod
+    def build(cls, metrics: Sequence, submarkets: Sequence[str],
+              markets: Mapping[str, Dict]) -> "SubmarketBenchmarks":
+        codes, names = pd.factorize(pd.Series(submarkets, dtype=object))
+        names = list(names) + [name for name in markets if name not in set(names)]
+        missing = [name for name in names if name not in markets]
+        if missing:
+            raise ValueError(f"No market data for submarkets: {missing}")
+
+        peer = {}
+        for name in PEER_METRICS:
+            frame = pd.DataFrame({"code": codes, "value": metric_column(metrics, name)})
+            quantiles = frame.groupby("code")["value"].quantile(PERCENTILE_GRID / 100).unstack()
+            peer[name] = quantiles.reindex(range(len(names))).to_numpy()
+
+        return cls(names, peer, *cls._market_ranks(names, markets))
+
+    @staticmethod
+    def _market_ranks(names: Sequence[str], markets: Mapping[str, Dict]):
+        market = {}
+        for name in MARKET_METRICS:
+            values = pd.Series([markets[sub].get(name, np.nan) for sub in names], dtype=float)
+            peers = values.count()
+            rank = (values.rank() - 1) / (peers - 1) if peers > 1 else values * np.nan
+            market[name] = rank.fillna(NEUTRAL_SCORE).to_numpy()
+        return market, {name: dict(markets[name]) for name in names}
+
+    def with_markets(self, markets: Mapping[str, Dict]) -> "SubmarketBenchmarks":
+        """Benchmarks for new market data, reusing the property-derived peer breakpoints."""
+        return SubmarketBenchmarks(self.submarkets, self.peer, *self._market_ranks(self.submarkets, markets))
+
+    def codes(self, submarkets: Sequence[str]) -> np.ndarray:
+        index = {name: code for code, name in enumerate(self.submarkets)}
+        unknown = sorted({name for name in submarkets if name not in index})
+        if unknown:
+            raise ValueError(f"Unknown submarkets: {unknown}")
+        return np.fromiter((index[name] for name in submarkets), dtype=int, count=len(submarkets))
+
+@dataclass
+class RiskScores:
+    """Component risk scores in [0, 1], one entry per property."""
+    supply: np.ndarray
+    demand: np.ndarray
+    cap_rate: np.ndarray
+    age: np.ndarray
+    tenant: np.ndarray
+    capex: np.ndarray
+    cap_rate_spread: np.ndarray
+    effective_age: np.ndarray
+    occupancy: np.ndarray
+    financial: Optional[Dict[str, np.ndarray]] = None
+    # False for `score_standalone`: scored against thresholds, not peers
+    relative: bool = True
+
+    def risk_score(self) -> np.ndarray:
+        """Mean of all nine components, as `_calculate_risk_score` computes it."""
+        components = [self.supply, self.demand, self.cap_rate, self.age, self.tenant, self.capex]
+        if self.financial is None:
+            defaults = [risk["score"] for risk in DEFAULT_FINANCIAL_RISKS.values()]
+            return (np.sum(components, axis=0) + sum(defaults)) / (len(components) + len(defaults))
+        components += list(self.financial.values())
+        return np.mean(components, axis=0)
+
+def _renovation_years(metrics: Sequence) -> np.ndarray:
+    if hasattr(metrics, 'column'):
+        return metric_column(metrics, 'renovation_year')
+    return np.fromiter((m.renovation_year or 0 for m in metrics), dtype=float, count=len(metrics))
+
+def _age_scores(metrics: Sequence, year: int):
+    """Effective age (years since construction or renovation) and its score."""
+    effective_age = year - np.maximum(metric_column(metrics, 'year_built'), _renovation_years(metrics))
+    return effective_age, np.clip(effective_age / MAX_BUILDING_AGE, 0.0, 1.0)
+
+def _market_column(markets: Sequence[Dict], name: str) -> np.ndarray:
+    return np.fromiter((m.get(name, np.nan) for m in markets), dtype=float, count=len(markets))
+
+def _ramp(values: np.ndarray, riskless: float, risky: float) -> np.ndarray:
+    """0 at `riskless`, 1 at `risky`, linear in between; NEUTRAL_SCORE for missing values."""
+    with np.errstate(invalid='ignore'):
+        scores = np.clip((values - riskless) / (risky - riskless), 0.0, 1.0)
+    return np.where(np.isnan(values), NEUTRAL_SCORE, scores)
+
+def score_standalone(metrics: Sequence, markets: Sequence[Dict],
+                     financial: Optional[Dict[str, np.ndarray]] = None,
+                     as_of_year: Optional[int] = None) -> RiskScores:
+    """Risk scores for properties judged on their own market data, without peers.
+
+    `markets` holds one market dict per property. Components use fixed
+    thresholds where `score_properties` uses ranks:
+
+    - supply: new supply, fully risky at HIGH_NEW_SUPPLY_SF
+    - demand: vacancy up to HIGH_VACANCY_RATE and rent growth across RENT_GROWTH_RANGE
+    - cap rate: cap rate below the market's, fully risky CAP_RATE_SPREAD_RANGE under it
+    - age: years since construction or last renovation, out of 50
+    - tenant: occupancy below the market's (1 - vacancy rate)
+    - capex: half age, half neutral as there are no peer rents
+
+    Missing market fields score NEUTRAL_SCORE.
+    """
+    year = as_of_year or datetime.now().year
+    cap_rate = metric_column(metrics, 'cap_rate')
+    occupancy = metric_column(metrics, 'occupancy')
+    effective_age, age = _age_scores(metrics, year)
+
+    vacancy_rate = _market_column(markets, 'vacancy_rate')
+    growth_floor, growth_ceiling = RENT_GROWTH_RANGE
+    market_occupancy = 1 - np.where(np.isnan(vacancy_rate), DEFAULT_VACANCY_RATE, vacancy_rate)
+    cap_rate_spread = cap_rate - _market_column(markets, 'market_cap_rate')
+
+    return RiskScores(
+        supply=_ramp(_market_column(markets, 'new_supply'), 0.0, HIGH_NEW_SUPPLY_SF),
+        demand=(_ramp(vacancy_rate, 0.0, HIGH_VACANCY_RATE)
+                + _ramp(_market_column(markets, 'rent_growth'), growth_ceiling, growth_floor)) / 2,
+        cap_rate=_ramp(cap_rate_spread, CAP_RATE_SPREAD_RANGE, -CAP_RATE_SPREAD_RANGE),
+        age=age,
+        tenant=_ramp(market_occupancy - occupancy, -OCCUPANCY_GAP_RANGE, OCCUPANCY_GAP_RANGE),
+        capex=(age + NEUTRAL_SCORE) / 2,
+        cap_rate_spread=cap_rate_spread,
+        effective_age=effective_age,
+        occupancy=occupancy,
+        financial=financial,
+        relative=False
+    )
+
+def score_properties(metrics: Sequence, submarkets: Sequence[str], benchmarks: SubmarketBenchmarks,
+                     financial: Optional[Dict[str, np.ndarray]] = None,
+                     as_of_year: Optional[int] = None) -> RiskScores:
+    """Market and property risk scores for a whole portfolio in one pass.
+
+    - supply: the submarket's new supply, ranked among submarkets
+    - demand: high vacancy and weak rent growth relative to other submarkets
+    - cap rate: properties priced at a tighter cap rate than their peers
+    - age: years since construction or last renovation, out of 50
+    - tenant: vacancy relative to submarket peers
+    - capex: half age, half rent below submarket peers
+
+    `financial` optionally carries leverage/refinance/interest-rate score
+    arrays from `debt.financial_risk_scores`.
+    """
+    codes = benchmarks.codes(submarkets)
+    year = as_of_year or datetime.now().year
+    cap_rate = metric_column(metrics, 'cap_rate')
+    occupancy = metric_column(metrics, 'occupancy')
+    rent_per_sf = metric_column(metrics, 'rent_per_sf')
+
+    effective_age, age = _age_scores(metrics, year)
+
+    market_cap_rate = _market_column([benchmarks.market_data[name] for name in benchmarks.submarkets],
+                                     'market_cap_rate')[codes]
+    peer = {name: benchmarks.peer[name][codes] for name in PEER_METRICS}
+    market = {name: benchmarks.market[name][codes] for name in MARKET_METRICS}
+
+    return RiskScores(
+        supply=market['new_supply'],
+        demand=(market['vacancy_rate'] + 1 - market['rent_growth']) / 2,
+        cap_rate=1 - _percentile_rank(peer['cap_rate'], cap_rate),
+        age=age,
+        tenant=1 - _percentile_rank(peer['occupancy'], occupancy),
+        capex=(age + 1 - _percentile_rank(peer['rent_per_sf'], rent_per_sf)) / 2,
+        cap_rate_spread=cap_rate - market_cap_rate,
+        effective_age=effective_age,
+        occupancy=occupancy,
+        financial=financial
+    )
+
+def _assessments(scores: np.ndarray, factors: Sequence[str]) -> List[Dict]:
+    levels = risk_levels(scores).tolist()
+    return [
+        {"level": level, "factors": [factor], "score": score}
+        for level, factor, score in zip(levels, factors, scores.tolist())
+    ]
+
+def risk_analyses(scores: RiskScores, financial_risks: Optional[Sequence[Dict]] = None) -> List[Dict]:
+    """Per-property RiskAnalysis dicts in the shape `_assess_risks` returns.
+
+    `financial_risks` optionally holds one {"leverage_risk", ...} dict per
+    property, as produced by `debt.loan_risks`. Every result gets its own
+    mitigants, recommendations and default financial risks.
+    """
+    n = len(scores.supply)
+    if scores.relative:
+        supply = _assessments(scores.supply, [f"New supply rank: {v:.0%}" for v in scores.supply.tolist()])
+        demand = _assessments(scores.demand, ["Vacancy and rent growth vs. other submarkets"] * n)
+        capex = _assessments(scores.capex, ["Building age and rent vs. peers"] * n)
+    else:
+        supply = _assessments(scores.supply, [f"New supply vs. {HIGH_NEW_SUPPLY_SF:,} sf"] * n)
+        demand = _assessments(scores.demand, ["Vacancy and rent growth vs. thresholds"] * n)
+        capex = _assessments(scores.capex, ["Building age"] * n)
+    cap_rate = _assessments(scores.cap_rate, [
+        "Market cap rate spread: n/a" if np.isnan(v) else f"Market cap rate spread: {v * 1e4:+.0f}bp"
+        for v in scores.cap_rate_spread.tolist()])
+    age = _assessments(scores.age, [f"Effective age: {v:.0f} years" for v in scores.effective_age.tolist()])
+    tenant = _assessments(scores.tenant, [f"Occupancy: {v:.0%}" for v in scores.occupancy.tolist()])
+    risk_score = scores.risk_score().tolist()
+
+    analyses = []
+    for i in range(len(risk_score)):
+        analyses.append({
+            "risk_factors": {
+                "market_risks": {"supply_risk": supply[i], "demand_risk": demand[i], "cap_rate_risk": cap_rate[i]},
+                "property_risks": {"age_risk": age[i], "tenant_risk": tenant[i], "capex_risk": capex[i]},
+                "financial_risks": financial_risks[i] if financial_risks is not None else default_financial_risks()
+            },
+            "risk_score": risk_score[i],
+            "mitigants": mitigants(),
+            "recommendations": recommendations()
+        })
+    return analyses
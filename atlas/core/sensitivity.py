@@ -0,0 +1,145 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+import numpy as np
+from atlas.core.dcf import (
+    project_cash_flows, npv_batch, irr_batch, implied_value,
+    DEFAULT_VACANCY_RATE, DISCOUNT_RATE, EXIT_CAP_SPREAD, PROJECTION_YEARS
+)
+
+logger = logging.getLogger(__name__)
+
+SENSITIVITY_PARAMETERS = ('rent_growth', 'vacancy_rate', 'exit_cap_rate', 'discount_rate')
+
+# Half-width of the default sweep around the base value of each parameter
+DEFAULT_SPANS = {
+    'rent_growth': 0.02,
+    'vacancy_rate': 0.05,
+    'exit_cap_rate': 0.01,
+    'discount_rate': 0.02
+}
+DEFAULT_POINTS = 5
+
+def base_parameters(market: Dict, discount_rate: float = DISCOUNT_RATE) -> Dict[str, float]:
+    return {
+        'rent_growth': market['rent_growth'],
+        'vacancy_rate': market.get('vacancy_rate', DEFAULT_VACANCY_RATE),
+        'exit_cap_rate': market['market_cap_rate'] + EXIT_CAP_SPREAD,
+        'discount_rate': discount_rate
+    }
+
+def parameter_values(base: Dict[str, float], ranges: Optional[Dict[str, Sequence[float]]] = None,
+                     points: int = DEFAULT_POINTS) -> Dict[str, np.ndarray]:
+    """Sweep values per parameter: the given range, or a default span around base."""
+    ranges = ranges or {}
+    unknown = set(ranges) - set(SENSITIVITY_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sensitivity parameters: {sorted(unknown)}")
+
+    values = {}
+    for name in SENSITIVITY_PARAMETERS:
+        if name in ranges:
+            values[name] = np.asarray(ranges[name], dtype=float)
+        else:
+            span = DEFAULT_SPANS[name]
+            values[name] = np.linspace(base[name] - span, base[name] + span, points)
+    values['vacancy_rate'] = np.clip(values['vacancy_rate'], 0.0, None)
+    return values
+
+def evaluate_grid(base_revenue: float, purchase_price: float, parameters: Dict[str, np.ndarray],
+                  years: int = PROJECTION_YEARS) -> Dict[str, np.ndarray]:
+    """NPV and IRR for broadcastable parameter arrays in a single pass.
+
+    Each entry of `parameters` is either a scalar or an array laid out on
+    its own axis, so the result has one axis per varied parameter. IRR
+    does not depend on the discount rate and is solved once per distinct
+    cash-flow vector, then broadcast.
+    """
+    fcf = project_cash_flows(
+        base_revenue,
+        parameters['rent_growth'],
+        parameters['vacancy_rate'],
+        parameters['exit_cap_rate'],
+        years=years
+    )["fcf"]
+    fcf[..., 0] -= purchase_price
+
+    npv = npv_batch(fcf, parameters['discount_rate'])
+    irr = irr_batch(fcf.reshape(-1, years)).reshape(fcf.shape[:-1])
+    return {"npv": npv, "irr": np.broadcast_to(irr, npv.shape)}
+
+def _on_axis(values: np.ndarray, axis: int, ndim: int) -> np.ndarray:
+    shape = [1] * ndim
+    shape[axis] = values.size
+    return values.reshape(shape)
+
+def sensitivity_analysis(metrics, market: Dict, ranges: Optional[Dict[str, Sequence[float]]] = None,
+                         grids: Sequence[Tuple[str, str]] = (), purchase_price: Optional[float] = None,
+                         discount_rate: float = DISCOUNT_RATE, points: int = DEFAULT_POINTS,
+                         years: int = PROJECTION_YEARS) -> Dict:
+    """Tornado and heatmap sensitivities of NPV/IRR for one property.
+
+    Args:
+        metrics: PropertyMetrics for the property
+        market: Market dict supplying the base rent growth, vacancy and cap rate
+        ranges: Values to sweep per parameter; missing parameters use a
+            default span around their base value
+        grids: Parameter pairs to evaluate as 2-D heatmaps
+        purchase_price: t=0 outflow; None uses noi / cap_rate
+        discount_rate: Base discount rate
+        points: Sweep size for parameters without an explicit range
+        years: Projection horizon in years
+
+    Returns:
+        Dict with the base case, tornado entries sorted by NPV swing, and
+        one NPV/IRR grid per requested parameter pair
+    """
+    base = base_parameters(market, discount_rate)
+    values = parameter_values(base, ranges, points)
+    base_revenue = metrics.rent_per_sf * metrics.square_footage
+    price = implied_value(metrics) if purchase_price is None else purchase_price
+
+    base_case = evaluate_grid(base_revenue, price, base, years)
+    base_npv = float(base_case["npv"])
+
+    tornado: List[Dict] = []
+    for name in SENSITIVITY_PARAMETERS:
+        result = evaluate_grid(base_revenue, price, {**base, name: values[name]}, years)
+        tornado.append({
+            "parameter": name,
+            "values": values[name].tolist(),
+            "npv": result["npv"].tolist(),
+            "irr": result["irr"].tolist(),
+            "npv_low": float(result["npv"].min()),
+            "npv_high": float(result["npv"].max()),
+            "swing": float(result["npv"].max() - result["npv"].min())
+        })
+    tornado.sort(key=lambda entry: entry["swing"], reverse=True)
+
+    heatmaps: List[Dict] = []
+    for x, y in grids:
+        if x not in SENSITIVITY_PARAMETERS or y not in SENSITIVITY_PARAMETERS or x == y:
+            raise ValueError(f"Invalid sensitivity grid: ({x}, {y})")
+        result = evaluate_grid(base_revenue, price, {
+            **base,
+            x: _on_axis(values[x], 0, 2),
+            y: _on_axis(values[y], 1, 2)
+        }, years)
+        heatmaps.append({
+            "x": x,
+            "y": y,
+            "x_values": values[x].tolist(),
+            "y_values": values[y].tolist(),
+            "npv": result["npv"].tolist(),
+            "irr": result["irr"].tolist()
+        })
+
+    return {
+        "base": {
+            "parameters": base,
+            "purchase_price": price,
+            "npv": base_npv,
+            "irr": float(base_case["irr"])
+        },
+        "tornado": tornado,
+        "grids": heatmaps
+    }
@@ -0,0 +1,218 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, replace
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import numpy as np
+from atlas.core.dcf import (
+    project_cash_flows, npv_batch, irr_batch, implied_value,
+    DEFAULT_VACANCY_RATE, DISCOUNT_RATE, EXIT_CAP_SPREAD, PROJECTION_YEARS
+)
+
+logger = logging.getLogger(__name__)
+
+SCENARIO_VARIABLES = ('rent_growth', 'vacancy_rate', 'exit_cap_rate')
+
+@dataclass
+class Distribution:
+    """Marginal distribution for one simulated DCF input.
+
+    kind is one of "normal", "uniform", "triangular" or "fixed". Normal
+    draws use mean/std, uniform draws use low/high and triangular draws
+    use low/mean/high with mean as the mode. Every draw is clipped to
+    [low, high].
+    """
+    kind: str = "normal"
+    mean: float = 0.0
+    std: float = 0.0
+    low: float = -np.inf
+    high: float = np.inf
+
+    def from_standard_normal(self, z: np.ndarray) -> np.ndarray:
+        if self.kind == "normal":
+            return np.clip(self.mean + self.std * z, self.low, self.high)
+        if self.kind == "fixed":
+            return np.full(z.shape, self.mean)
+        raise ValueError(f"Correlated draws require normal distributions, got {self.kind}")
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        if self.kind == "normal":
+            return self.from_standard_normal(rng.standard_normal(size))
+        if self.kind == "uniform":
+            return rng.uniform(self.low, self.high, size)
+        if self.kind == "triangular":
+            return rng.triangular(self.low, self.mean, self.high, size)
+        if self.kind == "fixed":
+            return np.full(size, self.mean)
+        raise ValueError(f"Unknown distribution kind: {self.kind}")
+
+@dataclass
+class SimulationConfig:
+    """Monte Carlo settings for the DCF model.
+
+    Distributions left as None are centered on the market inputs the
+    deterministic model uses. `correlation` is an optional 3x3 matrix over
+    (rent_growth, vacancy_rate, exit_cap_rate) for jointly normal draws.
+    `purchase_price` is the t=0 outflow; None uses the property's implied
+    value, noi / cap_rate.
+    """
+    n_scenarios: int = 100_000
+    chunk_size: int = 25_000
+    seed: Optional[int] = None
+    rent_growth: Optional[Distribution] = None
+    vacancy_rate: Optional[Distribution] = None
+    exit_cap_rate: Optional[Distribution] = None
+    correlation: Optional[np.ndarray] = None
+    purchase_price: Optional[float] = None
+    discount_rate: float = DISCOUNT_RATE
+    years: int = PROJECTION_YEARS
+    percentiles: Tuple[float, ...] = (5, 25, 50, 75, 95)
+    histogram_bins: int = 50
+
+    def distributions(self, market: Dict) -> Dict[str, Distribution]:
+        defaults = {
+            'rent_growth': Distribution(mean=market['rent_growth'], std=0.01, low=-0.99),
+            'vacancy_rate': Distribution(
+                mean=market.get('vacancy_rate', DEFAULT_VACANCY_RATE), std=0.02, low=0.0, high=0.95
+            ),
+            'exit_cap_rate': Distribution(
+                mean=market['market_cap_rate'] + EXIT_CAP_SPREAD, std=0.005, low=0.01
+            )
+        }
+        return {name: getattr(self, name) or defaults[name] for name in SCENARIO_VARIABLES}
+
+@dataclass
+class SimulationResult:
+    n_scenarios: int
+    npv_mean: float
+    npv_percentiles: Dict[float, float]
+    irr_percentiles: Dict[float, float]
+    probability_of_loss: float
+    irr_defined: float
+    histogram_counts: np.ndarray
+    histogram_edges: np.ndarray
+    npv: Optional[np.ndarray] = field(default=None, repr=False)
+    irr: Optional[np.ndarray] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict:
+        return {
+            "n_scenarios": self.n_scenarios,
+            "npv_mean": self.npv_mean,
+            "npv_percentiles": self.npv_percentiles,
+            "irr_percentiles": self.irr_percentiles,
+            "probability_of_loss": self.probability_of_loss,
+            "irr_defined": self.irr_defined,
+            "histogram": {
+                "counts": self.histogram_counts.tolist(),
+                "bin_edges": self.histogram_edges.tolist()
+            }
+        }
+
+def _draw_scenarios(distributions: Dict[str, Distribution], correlation: Optional[np.ndarray],
+                    rng: np.random.Generator, size: int) -> Dict[str, np.ndarray]:
+    if correlation is None:
+        return {name: distributions[name].sample(rng, size) for name in SCENARIO_VARIABLES}
+
+    cholesky = np.linalg.cholesky(np.asarray(correlation, dtype=float))
+    z = rng.standard_normal((size, len(SCENARIO_VARIABLES))) @ cholesky.T
+    return {
+        name: distributions[name].from_standard_normal(z[:, i])
+        for i, name in enumerate(SCENARIO_VARIABLES)
+    }
+
+def _check_sizes(config: SimulationConfig) -> None:
+    if config.n_scenarios <= 0 or config.chunk_size <= 0:
+        raise ValueError("Scenario count and chunk size must be positive")
+
+def _purchase_price(metrics, config: SimulationConfig) -> float:
+    if config.purchase_price is not None:
+        return config.purchase_price
+    return implied_value(metrics)
+
+def scenario_cash_flows(metrics, market: Dict, config: Optional[SimulationConfig] = None) -> Iterator[np.ndarray]:
+    """Yield (chunk x years) FCF paths, net of the purchase price, one chunk at a time."""
+    config = config or SimulationConfig()
+    _check_sizes(config)
+
+    rng = np.random.default_rng(config.seed)
+    distributions = config.distributions(market)
+    base_revenue = metrics.rent_per_sf * metrics.square_footage
+    purchase_price = _purchase_price(metrics, config)
+
+    for start in range(0, config.n_scenarios, config.chunk_size):
+        stop = min(start + config.chunk_size, config.n_scenarios)
+        draws = _draw_scenarios(distributions, config.correlation, rng, stop - start)
+        fcf = project_cash_flows(
+            base_revenue,
+            draws['rent_growth'],
+            draws['vacancy_rate'],
+            draws['exit_cap_rate'],
+            years=config.years
+        )["fcf"]
+        fcf[:, 0] -= purchase_price
+        yield fcf
+
+def simulate_property(metrics, market: Dict, config: Optional[SimulationConfig] = None,
+                      keep_samples: bool = False) -> SimulationResult:
+    """Monte Carlo NPV/IRR distribution for one property.
+
+    Scenarios are evaluated `chunk_size` at a time, so peak memory is set
+    by the chunk's (chunk_size x years) projection arrays rather than by
+    the total scenario count.
+    """
+    config = config or SimulationConfig()
+    _check_sizes(config)
+    npv = np.empty(config.n_scenarios)
+    irr = np.empty(config.n_scenarios)
+    start = 0
+    for fcf in scenario_cash_flows(metrics, market, config):
+        stop = start + len(fcf)
+        npv[start:stop] = npv_batch(fcf, config.discount_rate)
+        irr[start:stop] = irr_batch(fcf)
+        start = stop
+
+    defined = ~np.isnan(irr)
+    irr_percentiles = np.percentile(irr[defined], config.percentiles) if defined.any() \
+        else np.full(len(config.percentiles), np.nan)
+    counts, edges = np.histogram(npv, bins=config.histogram_bins)
+
+    return SimulationResult(
+        n_scenarios=config.n_scenarios,
+        npv_mean=float(npv.mean()),
+        npv_percentiles=dict(zip(config.percentiles, np.percentile(npv, config.percentiles).tolist())),
+        irr_percentiles=dict(zip(config.percentiles, irr_percentiles.tolist())),
+        probability_of_loss=float((npv < 0).mean()),
+        irr_defined=float(defined.mean()),
+        histogram_counts=counts,
+        histogram_edges=edges,
+        npv=npv if keep_samples else None,
+        irr=irr if keep_samples else None
+    )
+
+def _simulate_task(args) -> SimulationResult:
+    return simulate_property(*args)
+
+def simulate_portfolio(metrics: Sequence, market, config: Optional[SimulationConfig] = None,
+                       processes: Optional[int] = None) -> List[SimulationResult]:
+    """Simulate every property, optionally spread across a process pool.
+
+    Each property gets an independent seed spawned from `config.seed`, so
+    results are reproducible and do not depend on `processes`. With
+    `processes=None` everything runs in the calling process.
+    """
+    config = config or SimulationConfig()
+    markets = [market] * len(metrics) if isinstance(market, dict) else list(market)
+    if len(markets) != len(metrics):
+        raise ValueError(f"Expected {len(metrics)} market entries, got {len(markets)}")
+
+    seeds = np.random.SeedSequence(config.seed).spawn(len(metrics))
+    tasks = [
+        (m, mkt, replace(config, seed=seed))
+        for m, mkt, seed in zip(metrics, markets, seeds)
+    ]
+
+    if not processes or processes <= 1:
+        return [_simulate_task(task) for task in tasks]
+
+    logger.info(f"Simulating {len(tasks)} properties across {processes} processes")
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_simulate_task, tasks, chunksize=max(1, len(tasks) // (processes * 4))))
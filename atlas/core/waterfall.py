@@ -0,0 +1,182 @@
+from typing import Dict, List, Optional, Sequence
+from dataclasses import dataclass
+import logging
+import numpy as np
+from atlas.core.irr import solve_irr
+from atlas.core.simulation import SimulationConfig, scenario_cash_flows
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LP_EQUITY_SHARE = 0.9
+
+@dataclass
+class WaterfallTier:
+    """One tier of a distribution waterfall.
+
+    The tier splits cash `lp_share` / `1 - lp_share` between LP and GP
+    until it is closed, either by the LP reaching an IRR of `hurdle`, or,
+    for a GP catch-up tier, by the GP holding `catch_up` of all profits.
+    The last tier has neither and splits everything that is left.
+    """
+    lp_share: float
+    hurdle: Optional[float] = None
+    catch_up: Optional[float] = None
+
+DEFAULT_TIERS = (
+    WaterfallTier(lp_share=DEFAULT_LP_EQUITY_SHARE, hurdle=0.08),
+    WaterfallTier(lp_share=0.0, catch_up=0.2),
+    WaterfallTier(lp_share=0.8, hurdle=0.12),
+    WaterfallTier(lp_share=0.7)
+)
+
+@dataclass
+class WaterfallResult:
+    """LP/GP cash flows with the same shape as the deal cash flows.
+
+    `tier_cash` holds the deal cash paid through each tier, stacked on a
+    leading tier axis. Contributions are negative in the cash flows.
+    """
+    lp_cash_flows: np.ndarray
+    gp_cash_flows: np.ndarray
+    tier_cash: np.ndarray
+    lp_irr: np.ndarray
+    gp_irr: np.ndarray
+    lp_multiple: np.ndarray
+    gp_multiple: np.ndarray
+    gp_promote: np.ndarray
+
+def _validate_tiers(tiers: Sequence[WaterfallTier]) -> None:
+    if not tiers:
+        raise ValueError("Waterfall needs at least one tier")
+    for i, tier in enumerate(tiers):
+        if not 0 <= tier.lp_share <= 1:
+            raise ValueError("Tier LP share must be between 0 and 1")
+        last = i == len(tiers) - 1
+        if last and (tier.hurdle is not None or tier.catch_up is not None):
+            raise ValueError("The last waterfall tier must not have a hurdle or catch-up")
+        if not last and (tier.hurdle is None) == (tier.catch_up is None):
+            raise ValueError("Each tier but the last needs exactly one of hurdle or catch_up")
+        if tier.hurdle is not None and tier.lp_share == 0:
+            raise ValueError("A hurdle tier must pay the LP")
+        if tier.catch_up is not None and not 0 < tier.catch_up < 1 - tier.lp_share:
+            raise ValueError("Catch-up share must be positive and below the GP share of the tier")
+
+def _fill_tier(needed: np.ndarray, available: np.ndarray) -> np.ndarray:
+    """Cash paid into a tier per period, without iterating over periods.
+
+    `needed` is the per-period increase of what the tier is owed and
+    `available` the cash reaching it. The owed balance follows the
+    Lindley recursion W_t = max(0, W_{t-1} + needed_t - available_t),
+    whose closed form is S_t - min(0, min_{s<=t} S_s) for the cumulative
+    sum S, so the whole schedule falls out of a cumsum and a running
+    minimum along the period axis.
+    """
+    cumulative = np.cumsum(needed - available, axis=-1)
+    owed = cumulative - np.minimum(np.minimum.accumulate(cumulative, axis=-1), 0.0)
+    owed_before = np.concatenate([np.zeros_like(owed[..., :1]), owed[..., :-1]], axis=-1)
+    return np.clip(owed_before + needed, 0.0, available)
+
+def run_waterfall(cash_flows: np.ndarray, tiers: Sequence[WaterfallTier] = DEFAULT_TIERS,
+                  lp_equity_share: float = DEFAULT_LP_EQUITY_SHARE) -> WaterfallResult:
+    """Split deal cash flows between LP and GP through a tiered waterfall.
+
+    Args:
+        cash_flows: Deal-level FCF with periods on the last axis; any
+            leading axes (paths, deals) are processed together
+        tiers: Waterfall tiers in payment order
+        lp_equity_share: LP share of capital contributions (negative FCF)
+
+    Hurdle tiers track the LP's account compounded at the hurdle rate;
+    working in values discounted at that rate turns the account into a
+    plain running balance, so each tier is solved for every period at
+    once. A LP balance already above its hurdle does not carry forward
+    as credit against later contributions.
+    """
+    _validate_tiers(tiers)
+    if not 0 < lp_equity_share <= 1:
+        raise ValueError("LP equity share must be in (0, 1]")
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    periods = np.arange(cash_flows.shape[-1])
+
+    contributions = np.maximum(-cash_flows, 0.0)
+    lp_contributions = contributions * lp_equity_share
+    gp_contributions = contributions - lp_contributions
+    remaining = np.maximum(cash_flows, 0.0)
+    lp_distributions = np.zeros_like(remaining)
+    gp_distributions = np.zeros_like(remaining)
+
+    tier_cash = []
+    for tier in tiers:
+        if tier.hurdle is not None:
+            discount = (1 + tier.hurdle) ** -periods
+            needed = (lp_contributions - lp_distributions) * discount / tier.lp_share
+            paid = _fill_tier(needed, remaining * discount) / discount
+        elif tier.catch_up is not None:
+            gp_share = 1 - tier.lp_share
+            lp_profit = np.cumsum(lp_distributions - lp_contributions, axis=-1)
+            gp_profit = np.cumsum(gp_distributions - gp_contributions, axis=-1)
+            # Tier cash after which the GP holds `catch_up` of total profit
+            target = np.maximum(
+                (tier.catch_up * (lp_profit + gp_profit) - gp_profit) / (gp_share - tier.catch_up), 0.0
+            )
+            needed = np.diff(target, axis=-1, prepend=0.0)
+            paid = _fill_tier(needed, remaining)
+        else:
+            paid = remaining
+
+        lp_distributions = lp_distributions + paid * tier.lp_share
+        gp_distributions = gp_distributions + paid * (1 - tier.lp_share)
+        remaining = remaining - paid
+        tier_cash.append(paid)
+
+    lp_cash_flows = lp_distributions - lp_contributions
+    gp_cash_flows = gp_distributions - gp_contributions
+    flat_shape = (-1, cash_flows.shape[-1])
+    lead_shape = cash_flows.shape[:-1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lp_multiple = lp_distributions.sum(axis=-1) / lp_contributions.sum(axis=-1)
+        gp_multiple = gp_distributions.sum(axis=-1) / gp_contributions.sum(axis=-1)
+
+    return WaterfallResult(
+        lp_cash_flows=lp_cash_flows,
+        gp_cash_flows=gp_cash_flows,
+        tier_cash=np.stack(tier_cash),
+        lp_irr=solve_irr(lp_cash_flows.reshape(flat_shape)).rate.reshape(lead_shape),
+        gp_irr=solve_irr(gp_cash_flows.reshape(flat_shape)).rate.reshape(lead_shape),
+        lp_multiple=lp_multiple,
+        gp_multiple=gp_multiple,
+        gp_promote=gp_distributions.sum(axis=-1) - (1 - lp_equity_share) * cash_flows.clip(0).sum(axis=-1)
+    )
+
+def _percentiles(values: np.ndarray, percentiles: Sequence[float]) -> Dict[float, float]:
+    defined = values[~np.isnan(values)]
+    if not len(defined):
+        return {p: float('nan') for p in percentiles}
+    return dict(zip(percentiles, np.percentile(defined, percentiles).tolist()))
+
+def simulate_waterfall(metrics, market: Dict, tiers: Sequence[WaterfallTier] = DEFAULT_TIERS,
+                       config: Optional[SimulationConfig] = None,
+                       lp_equity_share: float = DEFAULT_LP_EQUITY_SHARE) -> Dict:
+    """LP/GP return distributions of one deal across Monte Carlo FCF paths."""
+    config = config or SimulationConfig()
+    results: List[WaterfallResult] = [
+        run_waterfall(fcf, tiers, lp_equity_share)
+        for fcf in scenario_cash_flows(metrics, market, config)
+    ]
+    combined = {
+        name: np.concatenate([getattr(result, name) for result in results])
+        for name in ("lp_irr", "gp_irr", "lp_multiple", "gp_multiple", "gp_promote")
+    }
+    hurdles = [tier.hurdle for tier in tiers if tier.hurdle is not None]
+    return {
+        "n_scenarios": config.n_scenarios,
+        "lp_irr_percentiles": _percentiles(combined["lp_irr"], config.percentiles),
+        "gp_irr_percentiles": _percentiles(combined["gp_irr"], config.percentiles),
+        "lp_multiple_mean": float(np.nanmean(combined["lp_multiple"])),
+        "gp_multiple_mean": float(np.nanmean(combined["gp_multiple"])),
+        "gp_promote_mean": float(combined["gp_promote"].mean()),
+        "hurdle_probabilities": {
+            hurdle: float((combined["lp_irr"] >= hurdle - 1e-9).mean()) for hurdle in hurdles
+        }
+    }
@@ -5,13 +5,14 @@ from datetime import datetime
 from typing import Dict, Optional
 from dotenv import load_dotenv
 import logging
+from atlas.clients.ratelimit import rate_governor
+from atlas.clients.resilience import is_retryable, resilience
 
 load_dotenv()  # Load environment variables
 
-class ImageCollector:
-    MAX_RETRIES = 3
-    RETRY_DELAY = 1
+MAPS_HOST = "maps.googleapis.com"
 
+class ImageCollector:
     def __init__(self, config: Dict):
         self.api_key = config['google_maps_api_key']
         self.cache_dir = config['cache_dir']
@@ -20,7 +21,8 @@ class ImageCollector:
 
     async def collect_images(self, address: str, include_45deg: bool = False) -> Dict[str, str]:
         try:
-            geocode_result = await self.client.geocode(address)
+            async with rate_governor.slot("google_maps"):
+                geocode_result = await self.client.geocode(address)
             if not geocode_result:
                 raise ValueError(f"Could not geocode address: {address}")
             
@@ -68,15 +70,17 @@ class ImageCollector:
             if os.path.exists(cache_path):
                 return cache_path
 
-            # Fetch new image with retry logic
-            for attempt in range(self.MAX_RETRIES):
+            # Fetch new image, retried with jittered backoff behind the Maps circuit breaker
+            async def fetch() -> bytes:
                 try:
-                    image_data = await self._fetch_image(image_type, location)
-                    break
+                    async with rate_governor.slot("google_maps"):
+                        return await self._fetch_image(image_type, location)
                 except Exception as e:
-                    if attempt == self.MAX_RETRIES - 1:
-                        raise
-                    await asyncio.sleep(self.RETRY_DELAY * (attempt + 1))
+                    if "OVER_QUERY_LIMIT" in str(e):
+                        rate_governor.limiter("google_maps").on_throttled()
+                    raise
+
+            image_data = await resilience.call(MAPS_HOST, fetch, retryable=self._retryable)
 
             # Ensure the cache directory exists
             os.makedirs(self.cache_dir, exist_ok=True)
@@ -90,6 +94,12 @@ class ImageCollector:
         except Exception as e:
             raise Exception(f"Failed to fetch and cache {image_type} image: {str(e)}")
 
+    @staticmethod
+    def _retryable(error: BaseException) -> bool:
+        message = str(error)
+        return (is_retryable(error) or "OVER_QUERY_LIMIT" in message
+                or "UNKNOWN_ERROR" in message or "Timeout" in type(error).__name__)
+
     async def _fetch_image(self, image_type: str, location: dict) -> bytes:
         if image_type in ['satellite', '45deg']:
             return await self.client.static_map(
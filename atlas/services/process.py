@@ -3,6 +3,7 @@ import logging
 import pdfplumber
 from atlas.clients.unstructured import UnstructuredClient
 from atlas.core.config import AIConfig
+from atlas.core.extraction import DOCUMENT_METRICS, MetricExtractionEngine
 import asyncio
 from atlas.core.metrics_wrapper import track_api_error, track_request
 
@@ -41,11 +42,7 @@ class ProcessingService:
 
 class PDFProcessor:
     def __init__(self):
-        self.metrics_patterns = {
-            'square_footage': r'(\d+,?\d*)\s*(?:square\s*feet|sq\s*ft|sf)',
-            'far': r'far\s*(?:of)?\s*([\d.]+)',
-            # Your existing patterns
-        }
+        self.metrics_engine = MetricExtractionEngine(metrics=DOCUMENT_METRICS)
 
     async def process(self, pdf_url: str) -> Dict:
         """Tiered PDF processing approach"""
@@ -63,6 +60,11 @@ class PDFProcessor:
             logger.error(f"PDF processing error: {e}")
             return {}
 
+    def _extract_basic_metrics(self, pdf) -> Dict:
+        """Best value per document metric, from one scan over the text of all pages."""
+        text = "\n".join(page.extract_text() or "" for page in pdf.pages)
+        return self.metrics_engine.values(text)
+
 class PropertyProcessor:
     def __init__(self, config=None):
         self.config = config
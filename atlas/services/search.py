@@ -4,7 +4,7 @@ import logging
 from atlas.core.config import AIConfig
 from atlas.core.logging import setup_logging
 from atlas.core.metrics_wrapper import track_api_error
-from atlas.clients import TavilyClient, SerperClient, SerpApiClient
+from atlas.clients import HedgedSearch, QueryResult, ResponseCache, TavilyClient, SerperClient, SerpApiClient
 
 logger = logging.getLogger(__name__)
 
@@ -13,9 +13,32 @@ class SearchService:
     
     def __init__(self, config: AIConfig):
         self.config = config
-        self.tavily_client = TavilyClient(config)
-        self.serper_client = SerperClient(config)
-        self.serpapi_client = SerpApiClient(config)
+        # Shared by all providers so repeat lookups of an address cost no API calls
+        self.response_cache = ResponseCache(getattr(config, 'response_cache_path', None))
+        self.tavily_client = TavilyClient(config, cache=self.response_cache)
+        self.serper_client = SerperClient(config, cache=self.response_cache)
+        self.serpapi_client = SerpApiClient(config, cache=self.response_cache)
+        # Serper and SerpAPI both return Google organic results, so each backs up the other
+        if getattr(config, 'search_hedging', False):
+            self.government_search = HedgedSearch(self.serper_client, self.serpapi_client)
+            self.market_search = HedgedSearch(self.serpapi_client, self.serper_client)
+        else:
+            self.government_search = self.serper_client
+            self.market_search = self.serpapi_client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP clients (of the running loop) and the response cache."""
+        pools = {id(client.pool): client.pool
+                 for client in (self.tavily_client, self.serper_client, self.serpapi_client)}
+        for pool in pools.values():
+            await pool.aclose()
+        self.response_cache.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
         
     async def search_property(self, address: str) -> Dict:
         search_tasks = [
@@ -35,7 +58,7 @@ class SearchService:
             f"site:globest.com {address} office market",
             f"site:costar.com {address} transaction"
         ]
-        return await self.tavily_client.search(news_queries)
+        return self._collect(await self.tavily_client.search_many(news_queries))
         
     async def _fetch_government_data(self, address: str) -> Dict:
         # Use Serper for government sites
@@ -44,7 +67,7 @@ class SearchService:
             f"site:.gov {address} building permit",
             f"site:.gov {address} tax assessment"
         ]
-        return await self.serper_client.search(gov_queries)
+        return self._collect(await self.government_search.search_many(gov_queries))
         
     async def _fetch_market_reports(self, address: str) -> Dict:
         # Use SerpAPI for broker reports
@@ -52,7 +75,16 @@ class SearchService:
             f"site:cbre.com OR site:jll.com {self._extract_submarket(address)} office market report filetype:pdf",
             f"site:cushmanwakefield.com {self._extract_submarket(address)} market analysis filetype:pdf"
         ]
-        return await self.serpapi_client.search(market_queries)
+        return self._collect(await self.market_search.search_many(market_queries))
+
+    def _collect(self, results: List[QueryResult]) -> Dict:
+        """Combined hits of a multi-query search; failed queries are reported, not raised."""
+        for failed in (r for r in results if not r.ok):
+            logger.warning(f"Search query failed: {failed.query}: {failed.error}")
+        return {
+            "results": [hit for r in results if r.ok for hit in r.result],
+            "errors": {r.query: str(r.error) for r in results if not r.ok}
+        }
 
     def _merge_results(self, results: List[Dict]) -> Dict:
         """Merges and deduplicates results from different services"""
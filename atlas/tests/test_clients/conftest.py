@@ -0,0 +1,14 @@
+import pytest
+
+class Clock:
+    """Manually advanced stand-in for `time.monotonic`."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return Clock()
@@ -0,0 +1,85 @@
+import json
+import random
+import pytest
+from atlas.clients.batch import LLMBatcher
+from atlas.clients.fake import FakeLLMClient, echo_batch
+from atlas.clients.llm import llm_response_cache
+
+def upper(address):
+    return address.upper()
+
+@pytest.mark.asyncio
+async def test_items_are_packed_and_mapped_back():
+    llm = FakeLLMClient(echo_batch(upper))
+    addresses = [f"{i} main st, houston, tx" for i in range(1000)]
+    batcher = LLMBatcher(llm, "Standardize each address.", '"<address>"', batch_size=50)
+    results = await batcher.run(addresses)
+
+    assert [r.result for r in results] == [a.upper() for a in addresses]
+    assert len(llm.requests) == 20
+    assert batcher.stats() == {"round_trips": 20, "retried": 0}
+
+@pytest.mark.asyncio
+async def test_reply_order_and_extra_text_do_not_matter():
+    def shuffled(request):
+        answers = json.loads(echo_batch(upper)(request))
+        random.Random(7).shuffle(answers)
+        return "Here are the results:\n" + json.dumps(answers) + "\nLet me know if you need more."
+
+    results = await LLMBatcher(FakeLLMClient(shuffled), "Standardize.", '"<address>"').run(["a st", "b ave", "c blvd"])
+    assert [r.result for r in results] == ["A ST", "B AVE", "C BLVD"]
+
+@pytest.mark.asyncio
+async def test_only_unanswered_items_are_retried():
+    def drop_odd_ids_first(request):
+        answers = json.loads(echo_batch(upper)(request))
+        if request.temperature == 0:
+            answers = [a for a in answers if a["id"] % 2 == 0]
+        return json.dumps(answers)
+
+    llm = FakeLLMClient(drop_odd_ids_first)
+    batcher = LLMBatcher(llm, "Standardize.", '"<address>"', batch_size=4)
+    results = await batcher.run([f"{i} elm st" for i in range(8)])
+
+    assert all(r.ok for r in results)
+    assert batcher.stats() == {"round_trips": 3, "retried": 4}
+    retried = json.loads(llm.requests[-1].prompt.split("\n\n")[1].split("\n", 1)[1])
+    assert [entry["id"] for entry in retried] == [1, 3, 5, 7]
+
+@pytest.mark.asyncio
+async def test_failed_batches_and_invalid_answers():
+    calls = []
+
+    def flaky(request):
+        calls.append(1)
+        if len(calls) == 1:
+            return "I cannot help with that."
+        return json.dumps([{"id": 0, "result": {"valid": True, "issues": []}}, {"id": 1, "result": "yes"}])
+
+    batcher = LLMBatcher(FakeLLMClient(flaky), "Validate.", '{"valid": bool, "issues": []}',
+                         max_attempts=2, validate=lambda item, result: isinstance(result, dict))
+    results = await batcher.run([{"cap_rate": 0.06}, {"cap_rate": 6.0}])
+
+    assert results[0].result == {"valid": True, "issues": []}
+    assert not results[1].ok
+    assert "No valid answer" in str(results[1].error)
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_provider_errors_are_reported_per_item():
+    def down(request):
+        raise Exception("Claude request failed: 529 overloaded")
+
+    results = await LLMBatcher(FakeLLMClient(down), "Standardize.", '"<address>"', max_attempts=2).run(["a st"])
+    assert "overloaded" in str(results[0].error)
+
+@pytest.mark.asyncio
+async def test_retries_bypass_cached_replies():
+    def truncated(request):
+        if request.temperature == 0:
+            return '[{"id": 0, "result": "A ST"}, {"id": 1'
+        return echo_batch(upper)(request)
+
+    llm = FakeLLMClient(truncated, cache=llm_response_cache())
+    results = await LLMBatcher(llm, "Standardize.", '"<address>"').run(["a st", "b ave"])
+    assert [r.result for r in results] == ["A ST", "B AVE"]
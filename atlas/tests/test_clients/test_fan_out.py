@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from atlas.core.config import AIConfig
+from atlas.clients.base import fan_out
+from atlas.clients.serper import SerperClient
+
+@pytest.mark.asyncio
+async def test_results_keep_query_and_capture_errors():
+    async def search(query):
+        await asyncio.sleep(0.01 if query == "slow" else 0)
+        if query == "bad":
+            raise Exception("Serper request failed: 500")
+        return [query]
+
+    results = [r async for r in fan_out(search, ["slow", "bad", "fast"])]
+    # Yielded as they complete, each tagged with its input position
+    assert [r.query for r in results][-1] == "slow"
+    by_index = sorted(results, key=lambda r: r.index)
+    assert [r.query for r in by_index] == ["slow", "bad", "fast"]
+    assert by_index[0].ok and by_index[0].result == ["slow"]
+    assert not by_index[1].ok and "500" in str(by_index[1].error)
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    running = 0
+    peak = 0
+
+    async def search(query):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.005)
+        running -= 1
+        return [query]
+
+    results = [r async for r in fan_out(search, range(10), max_concurrency=3)]
+    assert len(results) == 10
+    assert peak == 3
+
+    with pytest.raises(ValueError):
+        async for _ in fan_out(search, ["q"], max_concurrency=0):
+            pass
+
+@pytest.mark.asyncio
+async def test_leaving_early_cancels_remaining_queries():
+    cancelled = []
+
+    async def search(query):
+        try:
+            await asyncio.sleep(0 if query == "first" else 1)
+        except asyncio.CancelledError:
+            cancelled.append(query)
+            raise
+        return [query]
+
+    stream = fan_out(search, ["first", "second", "third"])
+    async for result in stream:
+        assert result.query == "first"
+        break
+    await stream.aclose()
+    assert sorted(cancelled) == ["second", "third"]
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient')
+async def test_client_search_many_runs_queries_concurrently(mock_client):
+    mock_client_instance = AsyncMock()
+    mock_client.return_value.__aenter__.return_value = mock_client_instance
+
+    async def post(url, json=None, headers=None):
+        await asyncio.sleep(0.01)
+        response = MagicMock()
+        response.status_code = 400 if "permit" in json["q"] else 200
+        response.json.return_value = {"organic": [{"title": json["q"]}]}
+        return response
+    mock_client_instance.post.side_effect = post
+
+    client = SerperClient(AIConfig(serper_api_key="test-key"))
+    queries = ["site:.gov 123 Main St zoning", "site:.gov 123 Main St building permit",
+               "site:.gov 123 Main St tax assessment"]
+    results = await client.search_many(queries)
+
+    assert [r.query for r in results] == queries
+    assert results[0].result == [{"title": queries[0]}]
+    assert not results[1].ok
+    assert mock_client_instance.post.call_count == 3
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from atlas.clients.base import BaseClient
+from atlas.clients.hedge import HedgedSearch
+from atlas.clients.latency import LatencyHistogram, ProviderLatencies
+
+class FakeSearchClient(BaseClient):
+    def __init__(self, provider, delay, latencies, error=None):
+        super().__init__("test-key", latencies=latencies)
+        self.provider = provider
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def search(self, query, **kwargs):
+        self.calls += 1
+
+        async def fetch():
+            try:
+                await asyncio.sleep(self.delay)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+            if self.error:
+                raise Exception(self.error)
+            return [{"title": f"{self.provider}: {query}"}]
+        return await self._cached(query, kwargs, fetch)
+
+def test_histogram_quantiles_follow_recent_latency():
+    histogram = LatencyHistogram(window=100)
+    assert histogram.quantile(0.95) is None
+    for _ in range(95):
+        histogram.observe(0.1)
+    for _ in range(5):
+        histogram.observe(2.0)
+    assert 0.1 <= histogram.quantile(0.5) < 0.12
+    assert 0.1 <= histogram.quantile(0.95) < 0.12
+    assert 2.0 <= histogram.quantile(0.99) < 2.4
+
+    # Old samples fade once the provider slows down
+    for _ in range(400):
+        histogram.observe(1.0)
+    assert 1.0 <= histogram.quantile(0.5) < 1.2
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    latencies = ProviderLatencies()
+    primary = FakeSearchClient("serper", 0.001, latencies)
+    secondary = FakeSearchClient("serpapi", 0.001, latencies)
+    hedged = HedgedSearch(primary, secondary, latencies, default_delay=0.2)
+
+    assert await hedged.search("site:.gov 123 Main St zoning") == [{"title": "serper: site:.gov 123 Main St zoning"}]
+    assert secondary.calls == 0
+    assert latencies.histogram("serper").samples == 1
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled():
+    latencies = ProviderLatencies()
+    primary = FakeSearchClient("serper", 1.0, latencies)
+    secondary = FakeSearchClient("serpapi", 0.001, latencies)
+    # Learned p95 of the primary sets the hedge delay
+    for _ in range(50):
+        latencies.observe("serper", 0.01)
+    hedged = HedgedSearch(primary, secondary, latencies, min_delay=0.001)
+    assert hedged.hedge_delay() < 0.012
+
+    assert await hedged.search("zoning") == [{"title": "serpapi: zoning"}]
+    # The loser is cancelled in the background; give it a few loop turns
+    await asyncio.sleep(0.01)
+    assert primary.cancelled == 1
+    assert hedged.stats()["secondary_wins"] == 1
+    # The cancelled call still counts towards the primary's tail
+    assert latencies.histogram("serper").samples == 51
+
+@pytest.mark.asyncio
+async def test_failing_primary_falls_over_without_waiting():
+    latencies = ProviderLatencies()
+    primary = FakeSearchClient("serpapi", 0, latencies, error="SerpAPI request failed: 503")
+    secondary = FakeSearchClient("serper", 0.001, latencies)
+    hedged = HedgedSearch(primary, secondary, latencies, default_delay=10)
+
+    result = await asyncio.wait_for(hedged.search("market report"), timeout=1)
+    assert result == [{"title": "serper: market report"}]
+
+    secondary.error = "Serper request failed: 500"
+    with pytest.raises(Exception, match="503"):
+        await hedged.search("another report")
+
+@pytest.mark.asyncio
+async def test_search_many_hedges_each_query():
+    latencies = ProviderLatencies()
+    primary = FakeSearchClient("serper", 0.001, latencies)
+    secondary = FakeSearchClient("serpapi", 0.001, latencies)
+    results = await HedgedSearch(primary, secondary, latencies).search_many(["zoning", "permit"])
+    assert [r.result for r in results] == [[{"title": "serper: zoning"}], [{"title": "serper: permit"}]]
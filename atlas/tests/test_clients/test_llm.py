@@ -0,0 +1,183 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from atlas.core.config import AIConfig
+from atlas.clients.llm import LLMClient, LLMRequest, llm_response_cache
+from atlas.clients.claude import ClaudeClient
+
+class FakeLLM(LLMClient):
+    def __init__(self, delay=0.01, **kwargs):
+        super().__init__("fake-model", **kwargs)
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.closed_streams = 0
+
+    async def _complete(self, request):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return f"{request.model}: {request.prompt}"
+
+    async def _stream(self, request):
+        try:
+            for word in request.prompt.split():
+                await asyncio.sleep(0)
+                yield word + " "
+        finally:
+            self.closed_streams += 1
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_per_model():
+    llm = FakeLLM(max_concurrency={"fake-model": 2, "other-model": 3})
+    await asyncio.gather(*[llm.complete(f"prompt {i}") for i in range(6)])
+    assert llm.peak == 2
+
+    llm.peak = 0
+    await asyncio.gather(*[llm.complete("a") for _ in range(3)], *[llm.complete("b", model="other-model") for _ in range(3)])
+    assert llm.peak == 5
+
+@pytest.mark.asyncio
+async def test_other_work_proceeds_during_generation():
+    llm = FakeLLM(delay=0.05)
+    generation = asyncio.ensure_future(llm.complete("summarize the rent roll"))
+    ticks = 0
+    while not generation.done():
+        ticks += 1
+        await asyncio.sleep(0.005)
+    assert ticks > 3
+    assert generation.result() == "fake-model: summarize the rent roll"
+
+@pytest.mark.asyncio
+async def test_stream_yields_chunks_and_closes_early():
+    llm = FakeLLM()
+    chunks = [chunk async for chunk in llm.stream("cap rate is 6.5 percent")]
+    assert "".join(chunks) == "cap rate is 6.5 percent "
+
+    stream = llm.stream("one two three four")
+    async for chunk in stream:
+        break
+    await stream.aclose()
+    assert llm.closed_streams == 2
+    assert llm.in_flight["fake-model"] == 0
+
+@pytest.mark.asyncio
+async def test_cancellation_releases_the_slot():
+    llm = FakeLLM(delay=10, max_concurrency={"fake-model": 1})
+    stuck = asyncio.ensure_future(llm.complete("long report"))
+    await asyncio.sleep(0.01)
+    stuck.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await stuck
+
+    llm.delay = 0
+    assert await asyncio.wait_for(llm.complete("next"), timeout=1) == "fake-model: next"
+
+@pytest.mark.asyncio
+async def test_complete_many_keeps_order():
+    results = await FakeLLM().complete_many(["first", "second", "third"])
+    assert [r.result for r in results] == ["fake-model: first", "fake-model: second", "fake-model: third"]
+
+@pytest.mark.asyncio
+async def test_claude_client_uses_async_sdk():
+    client = ClaudeClient(AIConfig(claude_api_key="test-key"))
+    client.client = SimpleNamespace(messages=SimpleNamespace(create=AsyncMock(return_value=SimpleNamespace(
+        content=[SimpleNamespace(type="text", text="NOI is "), SimpleNamespace(type="text", text="$1.2M")]
+    ))))
+    assert await client.generate({"address": "123 Main St"}) == "NOI is $1.2M"
+    kwargs = client.client.messages.create.call_args.kwargs
+    assert kwargs["temperature"] == 0.0
+    assert "CRE analyst" in kwargs["system"]
+
+class CountingLLM(FakeLLM):
+    def __init__(self, **kwargs):
+        super().__init__(delay=0, **kwargs)
+        self.calls = 0
+
+    async def _complete(self, request):
+        self.calls += 1
+        return await super()._complete(request)
+
+    async def _stream(self, request):
+        self.calls += 1
+        async for chunk in super()._stream(request):
+            yield chunk
+
+@pytest.mark.asyncio
+async def test_temperature_zero_completions_are_cached():
+    llm = CountingLLM(cache=llm_response_cache())
+    first = await llm.complete("Fix this address:\n    123 Main St Houston")
+    # Same prompt up to whitespace
+    assert await llm.complete("Fix this address: 123 Main St   Houston") == first
+    assert llm.calls == 1
+
+    # Sampled, different model or different limits: not reused
+    await llm.complete("Fix this address: 123 Main St Houston", temperature=0.7)
+    await llm.complete("Fix this address: 123 Main St Houston", temperature=0.7)
+    await llm.complete("Fix this address: 123 Main St Houston", model="other-model")
+    await llm.complete("Fix this address: 123 Main St Houston", max_tokens=10)
+    assert llm.calls == 5
+    stats = llm.cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 3
+
+@pytest.mark.asyncio
+async def test_cache_persists_across_runs(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    async with CountingLLM(cache=llm_response_cache(path)) as first_run:
+        await first_run.complete("Summarize the lease abstract")
+    assert first_run.cache._db is None
+
+    async with CountingLLM(cache=llm_response_cache(path)) as second_run:
+        assert await second_run.complete("Summarize the lease abstract") == "fake-model: Summarize the lease abstract"
+        assert second_run.calls == 0
+        assert second_run.cache.stats()["disk_hits"] == 1
+
+def test_cache_size_is_capped(tmp_path):
+    cache = llm_response_cache(str(tmp_path / "llm.sqlite"), max_entries=2)
+    for i in range(4):
+        cache.set("anthropic", f"prompt-{i}", f"answer {i}")
+    assert cache.disk_size() == 2
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_completed_streams_are_cached():
+    llm = CountingLLM(cache=llm_response_cache())
+    assert "".join([c async for c in llm.stream("noi grew four percent")]) == "noi grew four percent "
+    assert [c async for c in llm.stream("noi grew four percent")] == ["noi grew four percent "]
+    assert llm.calls == 1
+
+    # An abandoned stream is not cached
+    stream = llm.stream("vacancy rose two points")
+    async for _ in stream:
+        break
+    await stream.aclose()
+    assert llm.cache.get("llm", LLMRequest("vacancy rose two points", "fake-model").cache_key()) is None
+
+@pytest.mark.asyncio
+async def test_throttled_stream_does_not_trip_the_breaker(monkeypatch):
+    from atlas.clients import claude
+    from atlas.clients.resilience import CircuitBreaker, Resilience
+    layer = Resilience(failure_threshold=1)
+    monkeypatch.setattr(claude, "resilience", layer)
+
+    class Throttled(Exception):
+        status_code = 429
+
+    class FailingStream:
+        async def __aenter__(self):
+            raise Throttled("rate_limit_error")
+
+        async def __aexit__(self, *args):
+            return False
+
+    client = ClaudeClient(AIConfig(claude_api_key="test-key"))
+    client.client = SimpleNamespace(messages=SimpleNamespace(stream=lambda **kwargs: FailingStream()))
+    with pytest.raises(Throttled):
+        async for _ in client.stream("rent comps"):
+            pass
+    assert layer.breaker(claude.ANTHROPIC_HOST).state == CircuitBreaker.CLOSED
@@ -0,0 +1,53 @@
+import logging
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from atlas.core.config import AIConfig
+from atlas.clients.base import ConnectionPoolManager, PoolLimits, http_pool
+from atlas.clients.serper import SerperClient
+from atlas.clients.serpapi import SerpApiClient
+
+@pytest.mark.asyncio
+async def test_pool_reuses_one_client_per_host():
+    pool = ConnectionPoolManager(host_limits={"https://api.tavily.com": PoolLimits(max_connections=4)})
+    search = await pool.client("https://google.serper.dev/search")
+    assert await pool.client("https://google.serper.dev/other") is search
+    tavily = await pool.client("https://api.tavily.com/search")
+    assert tavily is not search
+    assert pool.limits_for("https://api.tavily.com").max_connections == 4
+    assert pool.limits_for("https://google.serper.dev") == pool.default_limits
+
+    await pool.aclose()
+    assert search.is_closed and tavily.is_closed
+    assert await pool.client("https://google.serper.dev/search") is not search
+    await pool.aclose()
+
+@pytest.mark.asyncio
+async def test_http2_falls_back_without_h2(caplog):
+    pool = ConnectionPoolManager(PoolLimits(http2=True))
+    with patch("importlib.util.find_spec", return_value=None), caplog.at_level(logging.WARNING):
+        client = await pool.client("https://serpapi.com/search")
+    assert "HTTP/2 requested" in caplog.text
+    assert not client.is_closed
+    await pool.aclose()
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient')
+async def test_clients_share_pooled_connections(mock_client):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"organic": [], "organic_results": []}
+    mock_client_instance = AsyncMock()
+    mock_client.return_value.__aenter__.return_value = mock_client_instance
+    mock_client_instance.post.return_value = mock_response
+    mock_client_instance.get.return_value = mock_response
+
+    config = AIConfig(serper_api_key="test-key", serpapi_api_key="test-key")
+    for _ in range(3):
+        await SerperClient(config).search("test query")
+    await SerpApiClient(config).search("test query")
+
+    # One client per host, however many requests and client instances
+    assert mock_client.call_count == 2
+    assert mock_client_instance.post.call_count == 3
+    await http_pool.aclose()
+    assert mock_client_instance.__aexit__.await_count == 2
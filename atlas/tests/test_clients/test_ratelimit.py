@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, MagicMock, AsyncMock
+from atlas.core.config import AIConfig
+from atlas.clients.ratelimit import ProviderLimiter, RateGovernor, RateLimit, TokenBucket, parse_retry_after
+from atlas.clients.resilience import Resilience, RetryPolicy
+from atlas.clients.serper import SerperClient
+
+def test_token_bucket_burst_then_steady_rate(clock):
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Further reservations queue up at 1 / rate apart
+    assert [bucket.reserve() for _ in range(3)] == [0.5, 1.0, 1.5]
+    clock.now += 10.0
+    assert bucket.reserve() == 0.0
+    assert bucket.tokens == 2.0
+
+def test_pause_and_adaptive_rate(clock):
+    limiter = ProviderLimiter("serpapi", RateLimit(rate=4.0, burst=4), clock)
+    assert limiter.on_throttled("3") == 3.0
+    assert limiter.rate == 2.0
+    assert limiter.bucket.reserve() == pytest.approx(3.5)
+
+    for _ in range(100):
+        limiter.observe(200)
+    assert limiter.rate == 4.0
+    limiter.observe(503)
+    limiter.observe(404)
+    assert limiter.stats()["throttled"] == 1
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None, default=2.0) == 2.0
+    assert parse_retry_after("soon", default=2.0) == 2.0
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(later, usegmt=True)) <= 30
+
+@pytest.mark.asyncio
+async def test_max_in_flight():
+    governor = RateGovernor({"unstructured": RateLimit(rate=1000.0, burst=100, max_in_flight=2)})
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        limiter = governor.limiter("unstructured")
+        async with governor.slot("unstructured"):
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[request() for _ in range(8)])
+    assert peak == 2
+    assert governor.stats()["unstructured"]["requests"] == 8
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient')
+async def test_client_adapts_to_429(mock_client):
+    mock_response = MagicMock()
+    mock_response.status_code = 429
+    mock_response.headers = {"Retry-After": "0.05"}
+    mock_response.text = "Too Many Requests"
+    mock_client_instance = AsyncMock()
+    mock_client.return_value.__aenter__.return_value = mock_client_instance
+    mock_client_instance.post.return_value = mock_response
+
+    governor = RateGovernor()
+    client = SerperClient(AIConfig(serper_api_key="test-key"))
+    client.governor = governor
+    # Retries are covered in test_resilience; here one 429 should throttle once
+    client.resilience = Resilience(retry=RetryPolicy(max_attempts=1))
+    with pytest.raises(Exception, match="Too Many Requests"):
+        await client.search("test query")
+
+    limiter = governor.limiter("serper")
+    assert limiter.throttled == 1
+    assert limiter.rate == 5.0
+    # The next request waits out the Retry-After pause
+    assert limiter.bucket.reserve() > 0.04
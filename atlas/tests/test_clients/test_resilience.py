@@ -0,0 +1,196 @@
+import asyncio
+import pytest
+import httpx
+from unittest.mock import patch, MagicMock, AsyncMock
+from atlas.core.config import AIConfig
+from atlas.clients.resilience import (CircuitBreaker, CircuitOpenError, Resilience, RetryBudget,
+                                      RetryPolicy, is_retryable)
+from atlas.clients.ratelimit import RateGovernor, RateLimit
+from atlas.clients.serper import SerperClient
+
+def recording_sleep():
+    delays = []
+
+    async def sleep(seconds):
+        delays.append(seconds)
+    return sleep, delays
+
+def test_full_jitter_stays_within_exponential_cap():
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+    for attempt in range(6):
+        cap = min(4.0, 0.5 * 2 ** attempt)
+        assert all(0 <= policy.delay(attempt) <= cap for _ in range(50))
+    # Retry-After is a floor
+    assert policy.delay(0, "3") >= 3
+
+def test_retryable_classification():
+    assert is_retryable(httpx.ConnectError("refused"))
+    request = httpx.Request("GET", "https://api.example.com")
+    assert is_retryable(httpx.HTTPStatusError("", request=request, response=httpx.Response(503, request=request)))
+    assert not is_retryable(httpx.HTTPStatusError("", request=request, response=httpx.Response(404, request=request)))
+    assert not is_retryable(ValueError("bad input"))
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried():
+    sleep, delays = recording_sleep()
+    layer = Resilience(sleep=sleep)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise httpx.ConnectError("connection reset")
+        return "ok"
+
+    assert await layer.call("api.tavily.com", flaky) == "ok"
+    assert len(delays) == 2
+    assert layer.breaker("api.tavily.com").state == CircuitBreaker.CLOSED
+
+    async def bad_request():
+        raise ValueError("invalid query")
+    with pytest.raises(ValueError):
+        await layer.call("api.tavily.com", bad_request)
+    assert len(delays) == 2
+
+def test_retry_budget_caps_retries():
+    budget = RetryBudget(ratio=0.5, reserve=2)
+    assert budget.try_spend() and budget.try_spend()
+    assert not budget.try_spend()
+    budget.deposit()
+    budget.deposit()
+    assert budget.try_spend()
+    assert budget.exhausted == 1
+
+@pytest.mark.asyncio
+async def test_budget_limits_retries_during_an_outage():
+    sleep, delays = recording_sleep()
+    layer = Resilience(sleep=sleep, budget_reserve=3, failure_threshold=100)
+
+    async def down():
+        raise httpx.ConnectTimeout("timed out")
+    for _ in range(10):
+        with pytest.raises(httpx.ConnectTimeout):
+            await layer.call("serpapi.com", down)
+    # 3 reserved retries plus 0.2 per request, instead of 2 retries for each of the 10 calls
+    assert len(delays) <= 5
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_recovers(clock):
+    sleep, _ = recording_sleep()
+    layer = Resilience(retry=RetryPolicy(max_attempts=1), failure_threshold=3, reset_timeout=30,
+                       clock=clock, sleep=sleep)
+    calls = []
+
+    async def down():
+        calls.append(1)
+        raise httpx.ConnectError("refused")
+    for _ in range(3):
+        with pytest.raises(httpx.ConnectError):
+            await layer.call("google.serper.dev", down)
+
+    with pytest.raises(CircuitOpenError):
+        await layer.call("google.serper.dev", down)
+    assert len(calls) == 3
+    # Other hosts are unaffected
+    async def up():
+        return "ok"
+    assert await layer.call("serpapi.com", up) == "ok"
+
+    # After the timeout one trial call goes through; its success closes the circuit
+    clock.now += 31
+    assert await layer.call("google.serper.dev", up) == "ok"
+    assert layer.breaker("google.serper.dev").state == CircuitBreaker.CLOSED
+
+def test_half_open_failure_reopens(clock):
+    breaker = CircuitBreaker("api.anthropic.com", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.on_failure()
+    clock.now += 11
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.on_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_sync_calls_share_the_layer(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    layer = Resilience()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("reset")
+        return "ok"
+    assert layer.call_sync("nominatim.openstreetmap.org", flaky) == "ok"
+    assert layer.retries == 1
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient')
+async def test_client_retries_server_errors(mock_client):
+    failed = MagicMock(status_code=503, headers={}, text="Service Unavailable")
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"organic": [{"title": "Result 1"}]}
+    mock_client_instance = AsyncMock()
+    mock_client.return_value.__aenter__.return_value = mock_client_instance
+    mock_client_instance.post.side_effect = [failed, ok]
+
+    sleep, delays = recording_sleep()
+    client = SerperClient(AIConfig(serper_api_key="test-key"))
+    client.resilience = Resilience(sleep=sleep)
+    assert await client.search("retry query") == [{"title": "Result 1"}]
+    assert mock_client_instance.post.call_count == 2
+    assert len(delays) == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_trial_does_not_wedge_the_breaker(clock):
+    layer = Resilience(retry=RetryPolicy(max_attempts=1), failure_threshold=1, reset_timeout=30, clock=clock)
+
+    async def down():
+        raise httpx.ConnectError("refused")
+    with pytest.raises(httpx.ConnectError):
+        await layer.call("h", down)
+
+    clock.now += 31
+
+    async def slow():
+        await asyncio.sleep(10)
+    trial = asyncio.ensure_future(layer.call("h", slow))
+    await asyncio.sleep(0)
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    async def ok():
+        return "ok"
+    assert await layer.call("h", ok) == "ok"
+    assert layer.breaker("h").state == CircuitBreaker.CLOSED
+
+def test_interrupted_sync_call_releases_the_trial(clock):
+    breaker_layer = Resilience(retry=RetryPolicy(max_attempts=1), failure_threshold=1, reset_timeout=30,
+                               clock=clock)
+    breaker_layer.breaker("h").on_failure()
+    clock.now += 31
+
+    def interrupted():
+        raise KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        breaker_layer.call_sync("h", interrupted)
+    assert breaker_layer.call_sync("h", lambda: "ok") == "ok"
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient')
+async def test_each_retry_takes_a_rate_limit_token(mock_client):
+    failed = MagicMock(status_code=503, headers={}, text="Service Unavailable")
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"organic": [{"title": "Result 1"}]}
+    mock_client_instance = AsyncMock()
+    mock_client.return_value.__aenter__.return_value = mock_client_instance
+    mock_client_instance.post.side_effect = [failed, failed, ok]
+
+    sleep, _ = recording_sleep()
+    governor = RateGovernor({"serper": RateLimit(rate=1000.0, burst=1, max_in_flight=1)})
+    client = SerperClient(AIConfig(serper_api_key="test-key"))
+    client.governor = governor
+    client.resilience = Resilience(sleep=sleep)
+    assert await client.search("token per attempt") == [{"title": "Result 1"}]
+    assert governor.limiter("serper").requests == 3
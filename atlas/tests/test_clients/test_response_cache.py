@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from atlas.core.config import AIConfig
+from atlas.clients.cache import ResponseCache
+from atlas.clients.serper import SerperClient
+
+def counting_fetch(values):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return values[len(calls) - 1]
+    return fetch, calls
+
+@pytest.mark.asyncio
+async def test_memory_hits_and_query_normalization():
+    cache = ResponseCache()
+    fetch, calls = counting_fetch([["result"]])
+    assert await cache.get_or_fetch("serper", "Dallas  Office", {"num": 10}, fetch) == ["result"]
+    assert await cache.get_or_fetch("serper", "dallas office", {"num": 10}, fetch) == ["result"]
+    assert len(calls) == 1
+
+    # Different params or providers are separate entries
+    other, other_calls = counting_fetch([["fewer"], ["serpapi"]])
+    assert await cache.get_or_fetch("serper", "dallas office", {"num": 5}, other) == ["fewer"]
+    assert await cache.get_or_fetch("serpapi", "dallas office", {"num": 10}, other) == ["serpapi"]
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 3
+
+@pytest.mark.asyncio
+async def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    first = ResponseCache(path)
+    fetch, calls = counting_fetch([[{"title": "Report"}]])
+    await first.get_or_fetch("tavily", "query", None, fetch)
+    first.close()
+
+    second = ResponseCache(path)
+    assert await second.get_or_fetch("tavily", "query", None, fetch) == [{"title": "Report"}]
+    assert await second.get_or_fetch("tavily", "query", None, fetch) == [{"title": "Report"}]
+    assert len(calls) == 1
+    assert second.stats()["disk_hits"] == 1
+    assert second.stats()["memory_hits"] == 1
+    second.close()
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate(clock):
+    cache = ResponseCache(ttls={"serper": 100}, stale_while_revalidate=50, clock=clock)
+    fetch, calls = counting_fetch(["v1", "v2", "v3"])
+    await cache.get_or_fetch("serper", "q", None, fetch)
+
+    clock.now += 120
+    # Stale: served at once, refreshed in the background
+    assert await cache.get_or_fetch("serper", "q", None, fetch) == "v1"
+    assert await cache.get_or_fetch("serper", "q", None, fetch) == "v1"
+    await asyncio.sleep(0)
+    assert len(calls) == 2
+    assert await cache.get_or_fetch("serper", "q", None, fetch) == "v2"
+
+    # Past the stale window the caller waits for a fresh response
+    clock.now += 1000
+    assert await cache.get_or_fetch("serper", "q", None, fetch) == "v3"
+    assert cache.stats()["refreshes"] == 1
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    cache = ResponseCache()
+
+    async def failing():
+        raise Exception("Serper request failed: 500")
+    with pytest.raises(Exception, match="500"):
+        await cache.get_or_fetch("serper", "q", None, failing)
+    assert cache.get("serper", "q") is None
+
+def test_size_caps(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"), max_memory_entries=2, max_disk_entries=3)
+    for i in range(5):
+        cache.set("serper", f"query {i}", [i])
+    assert len(cache.memory) == 2
+    assert cache.disk_size() == 3
+    assert cache.get("serper", "query 0") is None
+    assert cache.get("serper", "query 4").value == [4]
+    cache.close()
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient')
+async def test_client_repeat_searches_hit_cache(mock_client):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"organic": [{"title": "Result 1"}]}
+    mock_client_instance = AsyncMock()
+    mock_client.return_value.__aenter__.return_value = mock_client_instance
+    mock_client_instance.post.return_value = mock_response
+
+    client = SerperClient(AIConfig(serper_api_key="test-key"), cache=ResponseCache())
+    first = await client.search("Test Query")
+    second = await client.search("test query")
+    assert first == second == [{"title": "Result 1"}]
+    assert mock_client_instance.post.call_count == 1
+    await client.search("test query", num_results=5)
+    assert mock_client_instance.post.call_count == 2
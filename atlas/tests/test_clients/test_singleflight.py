@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from atlas.core.config import AIConfig
+from atlas.clients.singleflight import SingleFlight
+from atlas.clients.serpapi import SerpApiClient
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_upstream_call():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"results": len(calls)}
+
+    results = await asyncio.gather(*[flights.do("report", fetch) for _ in range(10)])
+    assert results == [{"results": 1}] * 10
+    assert flights.stats() == {"calls": 10, "upstream_calls": 1, "coalesced": 9, "saved_ratio": 0.9}
+
+    # Finished flights are forgotten
+    assert flights.in_flight() == 0
+    assert await flights.do("report", fetch) == {"results": 2}
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    flights = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise Exception("SerpAPI request failed: 503")
+
+    results = await asyncio.gather(*[flights.do("q", fetch) for _ in range(3)], return_exceptions=True)
+    assert all("503" in str(result) for result in results)
+    assert flights.upstream_calls == 1
+
+@pytest.mark.asyncio
+async def test_cancelling_one_caller_keeps_the_call_for_others():
+    flights = SingleFlight()
+    started = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(flights.do("q", fetch))
+    second = asyncio.ensure_future(flights.do("q", fetch))
+    await started.wait()
+    first.cancel()
+    assert await second == "done"
+
+    # With every caller gone the upstream call is cancelled too
+    lone = asyncio.ensure_future(flights.do("q2", fetch))
+    await asyncio.sleep(0)
+    lone.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await lone
+    await asyncio.sleep(0)
+    assert flights.in_flight() == 0
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient')
+async def test_identical_client_searches_are_coalesced(mock_client):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"organic_results": [{"title": "Market report"}]}
+    mock_client_instance = AsyncMock()
+    mock_client.return_value.__aenter__.return_value = mock_client_instance
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return mock_response
+    mock_client_instance.get.side_effect = slow_get
+
+    flights = SingleFlight()
+    config = AIConfig(serpapi_api_key="test-key")
+    clients = [SerpApiClient(config), SerpApiClient(config)]
+    for client in clients:
+        client.flights = flights
+    query = "site:cbre.com uptown office market report filetype:pdf"
+    results = await asyncio.gather(*[client.search(query) for client in clients for _ in range(3)])
+
+    assert all(result == [{"title": "Market report"}] for result in results)
+    assert mock_client_instance.get.call_count == 1
+    assert flights.stats()["coalesced"] == 5
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from atlas.core.config import AIConfig
 from atlas.clients.unstructured import UnstructuredClient
 
@@ -91,3 +91,23 @@ async def test_unstructured_connection_error(mock_post):
     client = UnstructuredClient(config=AIConfig(unstructured_api_key="test-key"))
     with pytest.raises(Exception, match="Unstructured request failed: Connection error"):
         await client.extract_text("test content")
+
+@pytest.mark.asyncio
+async def test_unstructured_extract_many_keeps_order_and_errors():
+    client = UnstructuredClient(config=AIConfig(unstructured_api_key="test-key"))
+
+    async def send(method, url, json, **kwargs):
+        response = MagicMock()
+        response.status_code = 400 if json["content"] == "corrupt file" else 200
+        response.text = "Invalid file format"
+        response.json.return_value = [{"text": json["content"].upper()}]
+        return response
+
+    with patch.object(client, "_send", AsyncMock(side_effect=send)) as mock_send:
+        results = await client.extract_many(["first file", "corrupt file", "third file"])
+        assert await client.search("fourth file") == "FOURTH FILE"
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert [result.result for result in results] == ["FIRST FILE", None, "THIRD FILE"]
+    assert "Invalid file format" in str(results[1].error)
+    assert mock_send.await_count == 4
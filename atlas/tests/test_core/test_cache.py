@@ -0,0 +1,87 @@
+import pytest
+from atlas.core.cache import LRUCache, content_hash
+from atlas.core.cre_analysis import CREAnalysisService, PropertyMetrics
+from atlas.core.config import AIConfig
+
+@pytest.fixture
+def sample_property_data():
+    return {
+        "financial_text": "The property has an NOI of $500,000",
+        "year_built": "2010",
+        "property_type": "Office",
+        "occupancy": "95%",
+        "rent": "$30 per square foot"
+    }
+
+@pytest.fixture
+def sample_market_data():
+    return {
+        "market_cap_rate": 0.05,
+        "vacancy_rate": 0.07,
+        "rent_growth": 0.03
+    }
+
+def test_content_hash_is_order_independent():
+    metrics = PropertyMetrics(500000, 0.05, 0.95, 50000, 30, "Office", 2010, None)
+    assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+    assert content_hash(metrics) == content_hash(PropertyMetrics(500000, 0.05, 0.95, 50000, 30, "Office", 2010, None))
+    assert content_hash(metrics) != content_hash(PropertyMetrics(500001, 0.05, 0.95, 50000, 30, "Office", 2010, None))
+
+def test_lru_eviction_and_stats():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts "b", the least recently used
+
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "size": 2,
+        "max_entries": 2,
+        "hit_rate": 0.5
+    }
+
+def test_invalidate_tag():
+    cache = LRUCache()
+    cache.put("a", 1, tag="market-1")
+    cache.put("b", 2, tag="market-1")
+    cache.put("c", 3, tag="market-2")
+
+    assert cache.invalidate_tag("market-1") == 2
+    assert len(cache) == 1
+    assert cache.invalidate_tag("market-1") == 0
+
+@pytest.mark.asyncio
+async def test_analyze_property_is_memoized(sample_property_data, sample_market_data, monkeypatch):
+    cre_service = CREAnalysisService(AIConfig())
+    calls = 0
+    original = cre_service._assess_risks
+
+    async def counting_assess_risks(*args):
+        nonlocal calls
+        calls += 1
+        return await original(*args)
+
+    monkeypatch.setattr(cre_service, "_assess_risks", counting_assess_risks)
+    first = await cre_service.analyze_property(sample_property_data, sample_market_data)
+    second = await cre_service.analyze_property(dict(sample_property_data), dict(sample_market_data))
+
+    assert calls == 1
+    assert second["risk_assessment"] is first["risk_assessment"]
+    assert cre_service.cache_stats()["hits"] == 1
+
+    assert cre_service.invalidate_cache(sample_market_data) == 1
+    await cre_service.analyze_property(sample_property_data, sample_market_data)
+    assert calls == 2
+
+@pytest.mark.asyncio
+async def test_cache_can_be_disabled(sample_property_data, sample_market_data):
+    cre_service = CREAnalysisService(AIConfig(), cache_size=0)
+    await cre_service.analyze_property(sample_property_data, sample_market_data)
+    await cre_service.analyze_property(sample_property_data, sample_market_data)
+    assert cre_service.cache_stats()["size"] == 0
+    assert cre_service.cache_stats()["hits"] == 0
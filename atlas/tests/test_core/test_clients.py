@@ -0,0 +1,23 @@
+import pytest
+from atlas.core.clients import ClaudeClient
+from atlas.core.config import AIConfig
+from atlas.clients.fake import FakeLLMClient, echo_batch
+
+def verdict(metrics):
+    cap_rate = metrics.get("cap_rate")
+    if cap_rate is not None and not 0 < cap_rate < 0.2:
+        return {"valid": False, "issues": ["cap rate out of range"]}
+    return {"valid": True, "issues": []}
+
+@pytest.mark.asyncio
+async def test_validate_metrics_batches_metric_sets():
+    llm = FakeLLMClient(echo_batch(verdict))
+    client = ClaudeClient(AIConfig(), llm=llm)
+    metric_sets = [{"noi": 1_000_000 + i, "cap_rate": 0.065} for i in range(249)] + [{"cap_rate": 6.5}]
+
+    verdicts = await client.validate_metrics(metric_sets)
+    assert len(llm.requests) == 3
+    assert verdicts[0] == {"valid": True, "issues": []}
+    assert verdicts[-1]["valid"] is False
+
+    assert await client.validate_metrics({"cap_rate": 0.07}) == {"valid": True, "issues": []}
@@ -0,0 +1,117 @@
+import tracemalloc
+import pytest
+import numpy as np
+import pandas as pd
+from atlas.core.cre_analysis import CREAnalysisService, PropertyMetrics
+from atlas.core.columnar import PropertyMetricsTable, PROPERTY_DTYPE
+from atlas.core.config import AIConfig
+from atlas.core.dcf import DCFBatch, generate_dcf_batch
+
+@pytest.fixture
+def records():
+    return [
+        PropertyMetrics(500000, 0.05, 0.95, 50000, 30.0, "Office", 2010, None),
+        PropertyMetrics(1200000, 0.06, 0.9, 120000, 42.5, "Retail", 1995, 2015),
+        PropertyMetrics(90000, 0.07, 0.8, 8000, 18.0, "Office", 1980, None)
+    ]
+
+@pytest.fixture
+def market_data():
+    return {
+        "market_cap_rate": 0.05,
+        "vacancy_rate": 0.07,
+        "rent_growth": 0.03
+    }
+
+def test_round_trip_records(records):
+    table = PropertyMetricsTable.from_records(records)
+    assert len(table) == 3
+    assert table.to_records() == records
+    assert table.property_types == ["Office", "Retail"]
+    assert table.nbytes == 3 * PROPERTY_DTYPE.itemsize
+    assert table[1:].to_records() == records[1:]
+
+def test_from_dataframe(records):
+    df = pd.DataFrame([r.__dict__ for r in records])
+    table = PropertyMetricsTable.from_dataframe(df)
+
+    assert table.to_records() == records
+    assert np.array_equal(table.column("square_footage"), [50000, 120000, 8000])
+    assert table.property_type_labels().tolist() == ["Office", "Retail", "Office"]
+    pd.testing.assert_frame_equal(
+        table.to_dataframe()[["noi", "property_type"]], df[["noi", "property_type"]], check_dtype=False
+    )
+
+    with pytest.raises(ValueError, match="Missing required columns"):
+        PropertyMetricsTable.from_dataframe(df.drop(columns=["noi"]))
+
+@pytest.mark.parametrize("column, value, message", [
+    ("year_built", 40000, "outside the int16 range"),
+    ("square_footage", 3_000_000_000, "outside the int32 range"),
+    ("square_footage", 50000.5, "whole numbers"),
+    ("renovation_year", -40000, "outside the int16 range"),
+    ("year_built", None, "missing"),
+    ("noi", "n/a", "must be numeric")
+])
+def test_narrow_columns_are_not_truncated(records, column, value, message):
+    df = pd.DataFrame([r.__dict__ for r in records])
+    df[column] = df[column].astype(object)
+    df.loc[1, column] = value
+    with pytest.raises(ValueError, match=message):
+        PropertyMetricsTable.from_dataframe(df)
+
+    rows = [dict(r.__dict__) for r in records]
+    rows[1][column] = value
+    if value is not None:
+        with pytest.raises(ValueError, match=message):
+            PropertyMetricsTable.from_records(rows)
+
+def test_table_plugs_into_dcf_batch(records, market_data):
+    table = PropertyMetricsTable.from_records(records)
+    from_table = generate_dcf_batch(table, market_data)
+    from_records = generate_dcf_batch(records, market_data)
+    assert np.array_equal(from_table.fcf, from_records.fcf)
+    assert np.array_equal(from_table.npv, from_records.npv)
+
+@pytest.mark.asyncio
+async def test_table_plugs_into_service(records, market_data):
+    cre_service = CREAnalysisService(AIConfig())
+    table = PropertyMetricsTable.from_records(records)
+
+    results = await cre_service.analyze_portfolio(table, market_data)
+    assert isinstance(results, DCFBatch)
+    assert len(results) == 3
+    # Compared without the metrics: IRR is NaN for these cash flows
+    projections = [result["projections"] for result in results.to_dicts()]
+    assert [result["projections"] for result in results] == projections
+    assert results[-1]["projections"] == projections[2]
+    assert [result["projections"] for result in results[1:]] == projections[1:]
+    with pytest.raises(IndexError):
+        results[3]
+
+    risks = await cre_service._assess_risks(table[2], market_data, results[2])
+    assert "risk_score" in risks
+
+def test_columnar_portfolio_is_ten_times_smaller(market_data):
+    n = 20_000
+    rng = np.random.default_rng(0)
+    records = [PropertyMetrics(float(noi), 0.05, 0.9, int(sf), float(rent), "Office", 1990, None)
+               for noi, sf, rent in zip(rng.uniform(1e5, 1e7, n), rng.integers(1000, 100000, n),
+                                        rng.uniform(10, 60, n))]
+
+    tracemalloc.start()
+    try:
+        objects = [PropertyMetrics(**r.__dict__) for r in records]
+        results = generate_dcf_batch(objects, market_data).to_dicts()
+        object_bytes = tracemalloc.get_traced_memory()[0]
+        del objects, results
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        table = PropertyMetricsTable.from_records(records)
+        batch = generate_dcf_batch(table, market_data)
+        columnar_bytes = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+
+    assert len(batch) == n
+    assert object_bytes >= 10 * columnar_bytes
@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+from atlas.core.cre_analysis import CREAnalysisService, PropertyMetrics
+from atlas.core.config import AIConfig
+
+@pytest.fixture
+def cre_service():
+    return CREAnalysisService(AIConfig())
+
+@pytest.fixture
+def sample_property_data():
+    return {
+        "financial_text": "The property has an NOI of $500,000",
+        "year_built": "2010",
+        "property_type": "Office",
+        "occupancy": "95%",
+        "rent": "$30 per square foot"
+    }
+
+@pytest.fixture
+def sample_market_data():
+    return {
+        "market_cap_rate": 0.05,
+        "vacancy_rate": 0.07,
+        "rent_growth": 0.03
+    }
+
+@pytest.mark.asyncio
+async def test_assess_risks_runs_financial_assessors_concurrently(cre_service, monkeypatch):
+    running = 0
+    peak = 0
+
+    async def slow_assessor(dcf):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"level": "low", "factors": [], "score": 0.1}
+
+    for name in ("_assess_leverage_risk", "_assess_refinance_risk", "_assess_interest_rate_risk"):
+        monkeypatch.setattr(cre_service, name, slow_assessor)
+
+    metrics = PropertyMetrics(500000, 0.05, 0.95, 50000, 30, "Office", 2010, None)
+    risks = await cre_service._assess_risks(metrics, {}, {})
+    assert peak == 3
+    assert risks["risk_factors"]["financial_risks"]["refinance_risk"]["score"] == 0.1
+
+@pytest.mark.asyncio
+async def test_analyze_many_isolates_errors(cre_service, sample_property_data, sample_market_data):
+    properties = [sample_property_data, {"property_type": "Office"}, sample_property_data]
+    results = [item async for item in cre_service.analyze_many(properties, sample_market_data)]
+
+    assert sorted(item["index"] for item in results) == [0, 1, 2]
+    by_index = {item["index"]: item for item in results}
+    assert by_index[1]["result"] is None
+    assert "Missing required fields" in by_index[1]["error"]
+    assert by_index[0]["error"] is None
+    assert "dcf_model" in by_index[2]["result"]
+
+@pytest.mark.asyncio
+async def test_analyze_many_bounds_concurrency(cre_service, sample_market_data, monkeypatch):
+    running = 0
+    peak = 0
+
+    async def fake_analyze(property_data, market_data):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 * property_data["delay"])
+        running -= 1
+        return property_data["delay"]
+
+    monkeypatch.setattr(cre_service, "analyze_property", fake_analyze)
+    properties = [{"delay": d} for d in (5, 1, 3, 1, 2, 1)]
+    results = [item async for item in cre_service.analyze_many(properties, sample_market_data, max_concurrency=2)]
+
+    assert peak == 2
+    assert len(results) == 6
+    assert results[0]["index"] == 1  # fastest result is streamed first
+
+    with pytest.raises(ValueError, match="max_concurrency"):
+        async for _ in cre_service.analyze_many(properties, sample_market_data, max_concurrency=0):
+            pass
+
+@pytest.mark.asyncio
+async def test_analyze_many_stopped_early_leaves_no_tasks(cre_service, sample_market_data, monkeypatch):
+    async def slow_analyze(property_data, market_data):
+        await asyncio.sleep(0 if property_data["fast"] else 10)
+        return property_data
+
+    monkeypatch.setattr(cre_service, "analyze_property", slow_analyze)
+    properties = [{"fast": True}] + [{"fast": False}] * 3
+    before = asyncio.all_tasks()
+
+    stream = cre_service.analyze_many(properties, sample_market_data, max_concurrency=4)
+    first = await stream.__anext__()
+    await stream.aclose()
+
+    assert first["index"] == 0
+    assert asyncio.all_tasks() == before
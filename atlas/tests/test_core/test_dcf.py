@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+import numpy_financial as npf
+import pandas as pd
+from atlas.core.cre_analysis import CREAnalysisService, PropertyMetrics
+from atlas.core.config import AIConfig
+from atlas.core.dcf import generate_dcf_batch, irr_batch, npv_batch
+
+@pytest.fixture
+def cre_service():
+    return CREAnalysisService(AIConfig())
+
+@pytest.fixture
+def portfolio():
+    return [
+        PropertyMetrics(
+            noi=500000,
+            cap_rate=0.05,
+            occupancy=0.95,
+            square_footage=square_footage,
+            rent_per_sf=rent_per_sf,
+            property_type="Office",
+            year_built=2010,
+            renovation_year=None
+        )
+        for square_footage, rent_per_sf in [(50000, 30), (120000, 42.5), (8000, 18)]
+    ]
+
+@pytest.fixture
+def market_data():
+    return {
+        "market_cap_rate": 0.05,
+        "vacancy_rate": 0.07,
+        "rent_growth": 0.03
+    }
+
+def test_generate_dcf_batch_shapes(portfolio, market_data):
+    batch = generate_dcf_batch(portfolio, market_data)
+    assert len(batch) == 3
+    assert batch.fcf.shape == (3, 10)
+    assert batch.revenue[0, 0] == pytest.approx(30 * 50000 * 0.93)
+    assert batch.terminal_value[0] == pytest.approx(batch.noi[0, -1] / 0.055)
+    assert np.allclose(batch.npv, npv_batch(batch.fcf))
+
+def test_generate_dcf_batch_per_property_market(portfolio, market_data):
+    markets = [market_data, {**market_data, "rent_growth": 0.0}, market_data]
+    batch = generate_dcf_batch(portfolio, markets)
+    assert batch.growth_rate.tolist() == [0.03, 0.0, 0.03]
+    assert np.allclose(batch.revenue[1], batch.revenue[1, 0])
+
+    with pytest.raises(ValueError, match="Expected 3 market entries"):
+        generate_dcf_batch(portfolio, markets[:2])
+
+def reference_dcf(metrics, market):
+    """The original per-property pandas model, kept as an independent reference."""
+    dcf = pd.DataFrame(index=range(10))
+    growth_rate = market['rent_growth']
+    vacancy_rate = market.get('vacancy_rate', 0.05)
+    dcf['revenue'] = metrics.rent_per_sf * metrics.square_footage * (1 - vacancy_rate) * (1 + growth_rate) ** dcf.index
+    dcf['opex'] = -dcf['revenue'] * 0.4
+    dcf['capex'] = -dcf['revenue'] * 0.02
+    dcf['noi'] = dcf['revenue'] + dcf['opex']
+    dcf['fcf'] = dcf['noi'] + dcf['capex']
+    exit_cap_rate = market['market_cap_rate'] + 0.005
+    dcf.loc[9, 'fcf'] += dcf['noi'].iloc[-1] / exit_cap_rate
+    return {
+        "projections": dcf.to_dict(),
+        "assumptions": {"growth_rate": growth_rate, "vacancy_rate": vacancy_rate,
+                        "exit_cap_rate": exit_cap_rate, "cap_ex_percent": 0.02},
+        "metrics": {"npv": npf.npv(0.08, dcf['fcf']), "irr": npf.irr(dcf['fcf']),
+                    "equity_multiple": dcf['fcf'][1:].sum() / abs(dcf['fcf'][0])}
+    }
+
+@pytest.mark.asyncio
+async def test_analyze_portfolio_matches_reference_model(cre_service, portfolio, market_data):
+    markets = [market_data, {**market_data, "rent_growth": 0.0, "vacancy_rate": 0.12}, market_data]
+    results = await cre_service.analyze_portfolio(portfolio, markets)
+    assert len(results) == len(portfolio)
+
+    for metrics, market, result in zip(portfolio, markets, results):
+        expected = reference_dcf(metrics, market)
+        assert result["assumptions"] == pytest.approx(expected["assumptions"])
+        for column, values in expected["projections"].items():
+            assert list(result["projections"][column].values()) == pytest.approx(list(values.values()), rel=1e-12)
+        for name, value in expected["metrics"].items():
+            # No acquisition outflow in the model, so both IRRs are NaN
+            assert result["metrics"][name] == pytest.approx(value, rel=1e-9, nan_ok=True)
+
+def test_irr_batch_matches_numpy_financial():
+    rng = np.random.default_rng(7)
+    cash_flows = rng.normal(size=(200, 10))
+    cash_flows[:, 0] = -np.abs(cash_flows[:, 0]) * 5
+    cash_flows[0] = np.abs(cash_flows[0])  # no sign change -> NaN
+
+    expected = np.array([npf.irr(row) for row in cash_flows])
+    assert np.isnan(irr_batch(cash_flows)[0])
+    assert np.allclose(irr_batch(cash_flows), expected, equal_nan=True)
@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+import numpy_financial as npf
+from atlas.core.cre_analysis import CREAnalysisService, Loan
+from atlas.core.config import AIConfig
+from atlas.core.debt import LoanBook, amortization_schedule, debt_metrics, financial_risk_scores
+
+@pytest.fixture
+def sample_property_data():
+    return {
+        "financial_text": "The property has an NOI of $500,000",
+        "year_built": "2010",
+        "property_type": "Office",
+        "occupancy": "95%",
+        "rent": "$30 per square foot"
+    }
+
+@pytest.fixture
+def sample_market_data():
+    return {
+        "market_cap_rate": 0.05,
+        "vacancy_rate": 0.07,
+        "rent_growth": 0.03
+    }
+
+def test_fixed_loan_matches_annuity():
+    book = LoanBook.from_loans([Loan(1_000_000, 0.06, term_years=10, amortization_years=30)])
+    schedule = amortization_schedule(book, years=10)
+
+    payment = -npf.pmt(0.06, 30, 1_000_000)
+    assert np.allclose(schedule.debt_service[0], payment)
+    assert schedule.balloon[0] == pytest.approx(-npf.fv(0.06, 10, -payment, 1_000_000))
+    assert schedule.balance[0, -1] == 0
+
+def test_io_period_floating_cap_and_maturity():
+    book = LoanBook.from_loans([
+        {"principal": 1_000_000, "rate": 0.06, "term_years": 5, "io_years": 2},
+        {"principal": 1_000_000, "rate": 0.02, "term_years": 10, "amortization_years": 0,
+         "floating": True, "rate_cap": 0.065}
+    ])
+    schedule = amortization_schedule(book, years=10, index_rates=np.linspace(0.03, 0.06, 10))
+
+    assert schedule.debt_service[0, :2].tolist() == [60000, 60000]
+    assert schedule.debt_service[0, 2] > 60000
+    assert schedule.debt_service[0, 5:].sum() == 0
+    assert schedule.balloon[0] < 1_000_000
+    assert schedule.rate[1, 0] == pytest.approx(0.05)
+    assert schedule.rate[1, -1] == pytest.approx(0.065)
+    assert schedule.balloon[1] == 1_000_000
+
+    with pytest.raises(ValueError, match="Interest-only period"):
+        LoanBook.from_loans([Loan(1_000_000, 0.06, term_years=2, io_years=3)])
+
+def test_metrics_and_scores_for_a_book():
+    book = LoanBook.from_loans([
+        Loan(5_000_000, 0.05, term_years=10),
+        Loan(9_000_000, 0.03, term_years=5, amortization_years=0, floating=True)
+    ])
+    metrics = debt_metrics(book, noi=[600_000, 600_000], value=[10_000_000, 10_000_000])
+
+    assert metrics.ltv.tolist() == [0.5, 0.9]
+    assert metrics.debt_yield[0] == pytest.approx(0.12)
+    assert metrics.shocked_min_dscr[1] < metrics.min_dscr[1] < 1
+    assert metrics.shocked_min_dscr[0] == metrics.min_dscr[0]
+
+    scores = financial_risk_scores(metrics.min_dscr, metrics.ltv, metrics.refi_coverage,
+                                   metrics.shocked_min_dscr, metrics.floating)
+    for name in ("leverage", "refinance", "interest_rate"):
+        assert scores[name][0] < scores[name][1]
+        assert ((scores[name] >= 0) & (scores[name] <= 1)).all()
+
+@pytest.mark.asyncio
+async def test_risk_assessors_use_loan(sample_property_data, sample_market_data):
+    cre_service = CREAnalysisService(AIConfig())
+    without_loan = await cre_service.analyze_property(sample_property_data, sample_market_data)
+    loan = {"principal": 9_000_000, "rate": 0.03, "term_years": 5, "floating": True}
+    with_loan = await cre_service.analyze_property(dict(sample_property_data, loan=loan), sample_market_data)
+
+    financial = with_loan["risk_assessment"]["risk_factors"]["financial_risks"]
+    assert financial["leverage_risk"]["level"] == "high"
+    assert "Floating rate debt" in financial["interest_rate_risk"]["factors"]
+    assert with_loan["dcf_model"]["debt"]["metrics"]["ltv"] == pytest.approx(0.9)
+    assert "debt" not in without_loan["dcf_model"]
+
+@pytest.mark.asyncio
+async def test_analyze_debt_for_loan_book():
+    cre_service = CREAnalysisService(AIConfig())
+    rng = np.random.default_rng(0)
+    n = 20000
+    loans = LoanBook.from_loans(
+        Loan(float(p), float(r), term_years=int(t)) for p, r, t in
+        zip(rng.uniform(1e6, 5e7, n), rng.uniform(0.02, 0.07, n), rng.integers(3, 12, n))
+    )
+    results = await cre_service.analyze_debt(loans, loans.principal * 0.09, loans.principal / 0.65)
+
+    assert len(results) == n
+    assert set(results[0]["risks"]) == {"leverage_risk", "refinance_risk", "interest_rate_risk"}
@@ -0,0 +1,81 @@
+import pickle
+import re
+import pytest
+from atlas.core.config import AIConfig
+from atlas.core.cre_analysis import CREAnalysisService
+from atlas.core.extraction import METRIC_PATTERNS, MetricExtractionEngine, MetricPattern
+from atlas.core.extractors import PropertyMetricsExtractor
+
+DOCUMENT = (
+    "Offering memorandum. The building totals 250,000 square feet with a FAR of 4.5 "
+    "and 14 ft ceiling heights; typical 25,000 sf floor plate, 45 ft deep.\n"
+    "Currently 92.5% leased. In-place NOI: $1,250,000 at a cap rate of 5.25%."
+)
+
+def test_single_scan_matches_individual_patterns():
+    engine = MetricExtractionEngine()
+    texts = [DOCUMENT, DOCUMENT.lower(), "NOI $12 " * 50 + "far of 2.0", "no metrics here", ""]
+    for text in texts:
+        found = {(m.metric, m.start, m.end) for m in engine.extract(text)}
+        expected = {
+            (p.metric, m.start(), m.end())
+            for p in METRIC_PATTERNS
+            for m in re.finditer(p.regex, text, p.flags)
+            if m.group(1).replace(',', '').replace('.', '')
+        }
+        assert found == expected
+
+def test_values_offsets_and_confidence():
+    engine = MetricExtractionEngine()
+    best = engine.best(DOCUMENT)
+
+    assert best["noi"].value == 1250000
+    assert best["cap_rate"].value == pytest.approx(0.0525)
+    assert best["occupancy"].value == pytest.approx(0.925)
+    assert best["floor_plate"].value == 25000
+    assert best["ceiling_height"].value == 14
+    assert best["floor_depth"].value == 45
+    assert DOCUMENT[best["noi"].start:best["noi"].end] == best["noi"].text
+
+    # Values outside the plausible range keep a reduced confidence
+    low = engine.best("Going-in cap rate of 55%")["cap_rate"]
+    assert low.confidence < best["cap_rate"].confidence
+
+    assert engine.values("nothing to see")["noi"] is None
+    with pytest.raises(ValueError, match="No patterns registered"):
+        MetricExtractionEngine(metrics=["parking_ratio"])
+
+def test_patterns_only_run_near_their_literals():
+    engine = MetricExtractionEngine([MetricPattern('ceiling_height', r'(\d+)\s*ft\s*ceiling', ('ceiling',),
+                                                   before=20)])
+    # The match would have to start outside the window before the literal
+    assert engine.best("14" + " " * 40 + "ft ceiling") == {}
+    assert engine.best("14 ft ceiling")["ceiling_height"].value == 14
+    noi = MetricExtractionEngine([MetricPattern('noi', r'NOI.*?\$?([\d,]+)', ('NOI',), after=20)])
+    assert noi.best("x" * 10000 + "NOI $100")["noi"].start == 10000
+
+@pytest.mark.parametrize("gap", [195, 197, 199, 250])
+def test_numbers_crossing_the_window_edge_stay_whole(gap):
+    cre_service = CREAnalysisService(AIConfig())
+    text = "NOI" + " " * gap + "$1,234,567"
+    assert re.search(r'NOI.*?\$?([\d,]+)', text).group(1) == "1,234,567"
+    assert cre_service._extract_noi(text) == 1234567
+
+def test_extract_many_ships_to_worker_processes():
+    engine = MetricExtractionEngine()
+    texts = [DOCUMENT.replace("1,250,000", str(n)) for n in range(1000, 1010)]
+    results = engine.extract_many(texts)
+    assert [r[-2].value for r in results] == list(range(1000, 1010))
+    # The pool path sends the bound `extract` to the workers
+    assert pickle.loads(pickle.dumps(engine)).extract_many(texts) == results
+
+def test_extractors_use_engine():
+    cre_service = CREAnalysisService(AIConfig())
+    assert cre_service._extract_noi("Net operating income (NOI) was $ 980,000") == 980000
+    with pytest.raises(ValueError, match="Could not extract NOI"):
+        cre_service._extract_noi("No income figures disclosed")
+
+    physical = PropertyMetricsExtractor(AIConfig())._extract_physical_metrics(
+        {"description": DOCUMENT, "units": 12})
+    assert physical["ceiling_height"]["value"] == 14
+    assert physical["window_line"] is None
@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+import numpy_financial as npf
+from atlas.core.cre_analysis import CREAnalysisService
+from atlas.core.config import AIConfig
+from atlas.core.irr import solve_irr
+
+@pytest.fixture
+def conventional_flows():
+    rng = np.random.default_rng(3)
+    cash_flows = rng.uniform(0.5, 2.0, size=(500, 10)) * np.arange(1, 11)
+    cash_flows[:, 0] = -rng.uniform(5, 40, size=500)
+    return cash_flows
+
+def test_solve_irr_matches_numpy_financial(conventional_flows):
+    result = solve_irr(conventional_flows)
+    expected = np.array([npf.irr(row) for row in conventional_flows])
+
+    assert result.converged.all()
+    assert result.iterations.max() < 20
+    assert np.allclose(result.rate, expected, rtol=0, atol=1e-8)
+
+def test_solve_irr_docstring_examples():
+    rows = [
+        [-100, 39, 59, 55, 20],
+        [-100, 0, 0, 74],
+        [-100, 100, 0, -7],
+        [-100, 100, 0, 7],
+        [-5, 10.5, 1, -8, 1]
+    ]
+    for row in rows:
+        assert solve_irr(row).rate[0] == pytest.approx(npf.irr(row), abs=1e-8)
+
+def test_solve_irr_multiple_sign_changes_pick_npf_root():
+    rng = np.random.default_rng(9)
+    cash_flows = rng.normal(size=(300, 8))
+    result = solve_irr(cash_flows)
+    expected = np.array([npf.irr(row) for row in cash_flows])
+
+    assert np.array_equal(np.isnan(result.rate), np.isnan(expected))
+    assert np.allclose(result.rate, expected, rtol=0, atol=1e-8, equal_nan=True)
+    assert np.array_equal(result.converged, ~np.isnan(expected))
+
+def test_solve_irr_reports_undefined_rows():
+    cash_flows = np.array([
+        [100.0, 10.0, 10.0],
+        [-100.0, 60.0, 60.0],
+        [-100.0, np.nan, 60.0]
+    ])
+    result = solve_irr(cash_flows)
+    assert result.converged.tolist() == [False, True, False]
+    assert np.isnan(result.rate[0]) and np.isnan(result.rate[2])
+
+def test_calculate_irr_no_longer_defaults_to_zero():
+    cre_service = CREAnalysisService(AIConfig())
+    assert np.isnan(cre_service._calculate_irr([100.0, 10.0, 10.0]))
+    assert cre_service._calculate_irr([-100, 39, 59, 55, 20]) == pytest.approx(0.28095, abs=1e-5)
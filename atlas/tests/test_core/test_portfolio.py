@@ -0,0 +1,91 @@
+import pytest
+import numpy as np
+from atlas.core.cre_analysis import CREAnalysisService, PropertyMetrics
+from atlas.core.config import AIConfig
+from atlas.core.dcf import generate_dcf_batch
+from atlas.core.portfolio import IncrementalPortfolio
+
+@pytest.fixture
+def metrics():
+    return [
+        PropertyMetrics(500000, 0.05, 0.95, 50000, 30, "Office", 2010, None),
+        PropertyMetrics(1200000, 0.06, 0.9, 120000, 42, "Retail", 1995, 2015),
+        PropertyMetrics(90000, 0.07, 0.8, 8000, 18, "Office", 1980, None),
+        PropertyMetrics(300000, 0.055, 0.92, 25000, 26, "Industrial", 2005, None)
+    ]
+
+@pytest.fixture
+def markets():
+    return {
+        "downtown": {"market_cap_rate": 0.05, "vacancy_rate": 0.07, "rent_growth": 0.03},
+        "suburban": {"market_cap_rate": 0.065, "vacancy_rate": 0.1, "rent_growth": 0.02}
+    }
+
+SUBMARKETS = ["downtown", "suburban", "downtown", "suburban"]
+
+def full_rebuild(metrics, markets):
+    return generate_dcf_batch(metrics, [markets[name] for name in SUBMARKETS])
+
+def assert_matches(portfolio, expected):
+    for name in ("revenue", "noi", "fcf", "terminal_value", "npv", "irr", "equity_multiple"):
+        np.testing.assert_allclose(getattr(portfolio.batch, name), getattr(expected, name), rtol=1e-12)
+
+def test_cap_rate_update_only_touches_terminal_value(metrics, markets):
+    portfolio = IncrementalPortfolio(metrics, SUBMARKETS, markets)
+    revenue = portfolio.revenue.copy()
+
+    rows = portfolio.update_markets({"suburban": {"market_cap_rate": 0.07}})
+
+    assert rows["revenue"].tolist() == []
+    assert rows["terminal_value"].tolist() == [1, 3]
+    assert rows["valuation"].tolist() == [1, 3]
+    assert np.array_equal(portfolio.revenue, revenue)
+    markets["suburban"]["market_cap_rate"] = 0.07
+    assert_matches(portfolio, full_rebuild(metrics, markets))
+
+def test_growth_update_matches_full_rebuild(metrics, markets):
+    portfolio = IncrementalPortfolio(metrics, SUBMARKETS, markets)
+    rows = portfolio.update_markets({
+        "downtown": {"rent_growth": 0.04},
+        "suburban": {"absorption_rate": 0.2}
+    })
+
+    assert rows["revenue"].tolist() == [0, 2]
+    assert rows["risk"].tolist() == [0, 1, 2, 3]
+    assert portfolio.recomputed["valuation"] == 2
+    markets["downtown"]["rent_growth"] = 0.04
+    assert_matches(portfolio, full_rebuild(metrics, markets))
+
+def test_unchanged_or_unknown_updates(metrics, markets):
+    portfolio = IncrementalPortfolio(metrics, SUBMARKETS, markets)
+    rows = portfolio.update_markets({"downtown": dict(markets["downtown"])})
+    assert all(len(indices) == 0 for indices in rows.values())
+
+    with pytest.raises(ValueError, match="Unknown submarket"):
+        portfolio.update_markets({"midtown": {"rent_growth": 0.01}})
+    # A bad name later in the update must not leave the earlier ones applied
+    with pytest.raises(ValueError, match="Unknown submarket: midtown"):
+        portfolio.update_markets({"downtown": {"rent_growth": 0.05}, "midtown": {"rent_growth": 0.01}})
+    assert portfolio.markets["downtown"] == markets["downtown"]
+    assert_matches(portfolio, full_rebuild(metrics, markets))
+    with pytest.raises(ValueError, match="No market data"):
+        IncrementalPortfolio(metrics, SUBMARKETS, {"downtown": markets["downtown"]})
+
+@pytest.mark.asyncio
+async def test_service_refreshes_risks_of_affected_properties(metrics, markets):
+    cre_service = CREAnalysisService(AIConfig())
+    portfolio = await cre_service.build_portfolio(metrics, SUBMARKETS, markets)
+    risks = list(portfolio.risks)
+    assert all(risk is not None for risk in risks)
+
+    await cre_service.update_portfolio_market(portfolio, {"downtown": {"market_cap_rate": 0.045}})
+    assert portfolio.risks[1] is risks[1]
+    assert portfolio.risks[0] is not risks[0]
+
+    with pytest.raises(ValueError, match="Market cap rate must be positive"):
+        await cre_service.update_portfolio_market(portfolio, {"downtown": {"market_cap_rate": 0}})
+    npv = portfolio.batch.npv.copy()
+    with pytest.raises(ValueError, match="Unknown submarket"):
+        await cre_service.update_portfolio_market(portfolio, {"suburban": {"rent_growth": 0.05},
+                                                              "midtown": {"rent_growth": 0.01}})
+    assert np.array_equal(portfolio.batch.npv, npv)
@@ -0,0 +1,86 @@
+import pytest
+import numpy as np
+from atlas.core.cre_analysis import CREAnalysisService, PropertyMetrics
+from atlas.core.config import AIConfig
+from atlas.core.dcf import npv_batch, npv_from_assumptions, project_cash_flows
+from atlas.core.portfolio_risk import aggregate_portfolio_risk, array_chunks, correlated_npv_scenarios
+from atlas.core.simulation import SimulationConfig
+
+@pytest.fixture
+def scenarios():
+    rng = np.random.default_rng(11)
+    common = rng.standard_normal((5000, 1))
+    return 100 * (0.6 * common + 0.8 * rng.standard_normal((5000, 6))) + 10
+
+GROUPS = ["a", "a", "b", "b", "c", "c"]
+
+def test_closed_form_npv_matches_projection():
+    rng = np.random.default_rng(0)
+    inputs = [rng.uniform(1e5, 1e7, 100), rng.uniform(-0.02, 0.08, 100),
+              rng.uniform(0, 0.2, 100), rng.uniform(0.04, 0.08, 100)]
+    expected = npv_batch(project_cash_flows(*inputs)["fcf"])
+    assert np.allclose(npv_from_assumptions(*inputs), expected, rtol=1e-12)
+    # Growth equal to the discount rate takes the degenerate annuity branch
+    assert npv_from_assumptions(1e6, 0.08, 0.05, 0.05) == pytest.approx(
+        npv_batch(project_cash_flows(1e6, 0.08, 0.05, 0.05)["fcf"][None])[0])
+
+def test_matches_dense_computation(scenarios):
+    result = aggregate_portfolio_risk(array_chunks(scenarios, chunk_size=333), GROUPS, confidence=0.95)
+
+    portfolio = scenarios.sum(axis=1)
+    worst = np.sort(portfolio)[:250]
+    assert result.cvar == pytest.approx(-worst.mean())
+    assert result.var == pytest.approx(-worst.max())
+    assert result.asset_contributions.sum() == pytest.approx(result.cvar)
+    assert np.allclose(result.asset_expected_pnl, scenarios.mean(axis=0))
+
+    grouped = np.stack([scenarios[:, [0, 1]].sum(1), scenarios[:, [2, 3]].sum(1), scenarios[:, [4, 5]].sum(1)], axis=1)
+    assert np.allclose(result.group_covariance, np.cov(grouped, rowvar=False))
+    assert result.std == pytest.approx(portfolio.std(ddof=1))
+    assert result.group_contributions.sum() == pytest.approx(result.std)
+    assert result.diversification_benefit > 0
+
+def test_chunking_does_not_change_results(scenarios):
+    small = aggregate_portfolio_risk(array_chunks(scenarios, chunk_size=7), GROUPS)
+    large = aggregate_portfolio_risk(array_chunks(scenarios), GROUPS)
+    assert small.cvar == pytest.approx(large.cvar)
+    assert np.allclose(small.asset_contributions, large.asset_contributions)
+
+    with pytest.raises(ValueError, match="Expected 5 assets"):
+        aggregate_portfolio_risk(array_chunks(scenarios), GROUPS[:5])
+
+def test_market_correlation_increases_tail_risk():
+    metrics = [PropertyMetrics(500000, 0.05, 0.95, 50000, 30, "Office", 2010, None)] * 20
+    submarkets = [f"s{i % 10}" for i in range(20)]
+    markets = {f"s{i}": {"market_cap_rate": 0.05, "vacancy_rate": 0.07, "rent_growth": 0.03} for i in range(10)}
+    config = SimulationConfig(n_scenarios=4000, chunk_size=512, seed=5)
+
+    independent = aggregate_portfolio_risk(
+        correlated_npv_scenarios(metrics, submarkets, markets, config, market_correlation=0.0), submarkets)
+    correlated = aggregate_portfolio_risk(
+        correlated_npv_scenarios(metrics, submarkets, markets, config, market_correlation=0.9), submarkets)
+
+    assert correlated.std > 2 * independent.std
+    assert correlated.group_correlation[0, 1] > 0.8
+    assert abs(independent.group_correlation[0, 1]) < 0.1
+
+@pytest.mark.asyncio
+async def test_service_portfolio_risk():
+    cre_service = CREAnalysisService(AIConfig())
+    metrics = [
+        PropertyMetrics(500000, 0.05, 0.95, 50000, 30, "Office", 2010, None),
+        PropertyMetrics(1200000, 0.06, 0.9, 120000, 42, "Retail", 1995, 2015),
+        PropertyMetrics(300000, 0.055, 0.92, 25000, 26, "Office", 2005, None)
+    ]
+    markets = {
+        "downtown": {"market_cap_rate": 0.05, "vacancy_rate": 0.07, "rent_growth": 0.03},
+        "suburban": {"market_cap_rate": 0.065, "vacancy_rate": 0.1, "rent_growth": 0.02}
+    }
+    config = SimulationConfig(n_scenarios=2000, seed=1)
+    report = await cre_service.portfolio_risk(metrics, ["downtown", "suburban", "downtown"], markets,
+                                              config=config, group_by="property_type")
+
+    assert set(report["groups"]) == {"Office", "Retail"}
+    assert sum(report["asset_cvar_contributions"]) == pytest.approx(report["cvar"])
+    with pytest.raises(ValueError, match="Unknown risk grouping"):
+        await cre_service.portfolio_risk(metrics, ["downtown"] * 3, markets, group_by="city")
@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+from atlas.core.cre_analysis import CREAnalysisService, PropertyMetrics
+from atlas.core.config import AIConfig
+from atlas.core.dcf import npv_batch
+from atlas.core.rates import rate_shock_analysis, standard_shocks
+
+@pytest.fixture
+def cash_flows():
+    rng = np.random.default_rng(7)
+    return rng.uniform(1e5, 1e6, size=(50, 10))
+
+def test_scenarios_match_direct_discounting(cash_flows):
+    result = rate_shock_analysis(cash_flows, zero_rates=0.08)
+
+    assert np.allclose(result.base_npv, npv_batch(cash_flows, 0.08))
+    up = result.scenarios.index("parallel_+100bp")
+    assert np.allclose(result.npv[:, up], npv_batch(cash_flows, 0.09))
+    assert np.allclose(result.portfolio_npv, result.npv.sum(axis=0))
+    assert (result.pnl[:, up] < 0).all()
+
+def test_duration_and_convexity(cash_flows):
+    result = rate_shock_analysis(cash_flows)
+
+    # A zero-coupon flow at period t has modified duration t / (1 + r)
+    zero = np.zeros((1, 10))
+    zero[0, 5] = 1.0
+    single = rate_shock_analysis(zero, zero_rates=0.05)
+    assert single.duration[0] == pytest.approx(5 / 1.05, rel=1e-6)
+    assert single.convexity[0] == pytest.approx(5 * 6 / 1.05 ** 2, rel=1e-4)
+
+    assert (result.duration > 0).all() and (result.convexity > 0).all()
+    assert np.allclose(result.key_rate_durations.sum(axis=1), result.duration, rtol=1e-3)
+    weights = result.base_npv / result.base_npv.sum()
+    assert result.portfolio_duration == pytest.approx(weights @ result.duration)
+    assert np.allclose(result.portfolio_key_rate_durations, weights @ result.key_rate_durations)
+    assert result.portfolio_key_rate_durations.sum() == pytest.approx(result.portfolio_duration, rel=1e-3)
+
+def test_steepener_and_custom_shocks():
+    shocks = standard_shocks(10, sizes_bp=(50,))
+    assert len(shocks) == 5
+    assert shocks["steepener_50bp"][0] == pytest.approx(-0.005)
+    assert shocks["flattener_50bp"][-1] == pytest.approx(-0.005)
+
+    result = rate_shock_analysis(np.ones((2, 10)), shocks={"up": 0.01})
+    assert result.scenarios == ["up"]
+    assert result.npv.shape == (2, 1)
+
+@pytest.mark.asyncio
+async def test_service_rate_shock():
+    cre_service = CREAnalysisService(AIConfig())
+    metrics = [
+        PropertyMetrics(500000, 0.05, 0.95, 50000, 30, "Office", 2010, None),
+        PropertyMetrics(1200000, 0.06, 0.9, 120000, 42, "Retail", 1995, 2015)
+    ]
+    market = {"market_cap_rate": 0.05, "vacancy_rate": 0.07, "rent_growth": 0.03}
+    report = await cre_service.rate_shock(metrics, market)
+
+    assert len(report["assets"]) == 2
+    assert report["scenarios"]["base"]["portfolio_pnl"] == pytest.approx(0.0)
+    assert report["scenarios"]["parallel_+200bp"]["portfolio_pnl"] < 0
+    assert report["portfolio_duration"] > 0
+    # One key-rate duration per projection year, for the portfolio and every asset
+    assert len(report["portfolio_key_rate_durations"]) == 10
+    assert sum(report["portfolio_key_rate_durations"]) == pytest.approx(report["portfolio_duration"], rel=1e-3)
+    assert all(len(asset["key_rate_durations"]) == 10 for asset in report["assets"])
@@ -0,0 +1,76 @@
+import pytest
+import numpy as np
+import pandas as pd
+from atlas.core.cre_analysis import CREAnalysisService, Lease, RentRoll
+from atlas.core.config import AIConfig
+from atlas.core.rent_roll import annual_revenue, monthly_rent, generate_rent_roll_dcf
+
+@pytest.fixture
+def market_data():
+    return {
+        "market_cap_rate": 0.05,
+        "vacancy_rate": 0.07,
+        "rent_growth": 0.03
+    }
+
+def test_contract_term_steps_and_free_rent():
+    rent_roll = RentRoll.from_leases([
+        Lease(1200, 10, expiration_month=24, start_month=-6, escalation=0.1, renewal_probability=1.0),
+        Lease(1200, 10, expiration_month=36, free_rent_months=2, escalation=0.0)
+    ])
+    rent = monthly_rent(rent_roll, 36)
+
+    # Anniversary steps fall 6 and 18 months into the analysis
+    assert rent[0, [0, 5, 6, 17, 18]].tolist() == pytest.approx([1000, 1000, 1100, 1100, 1210])
+    # A certain renewal rolls straight onto market rent
+    assert rent[0, 24] == pytest.approx(1000)
+    assert rent[1, :2].tolist() == [0, 0]
+    assert rent[1, 2] == pytest.approx(1000)
+
+def test_rollover_is_probability_weighted():
+    rent_roll = RentRoll.from_leases([
+        {"square_footage": 1200, "rent_per_sf": 10, "expiration_month": 12, "start_month": -12,
+         "escalation": 0.0, "renewal_probability": 0.5, "downtime_months": 6, "market_rent_per_sf": 20}
+    ])
+    rent = monthly_rent(rent_roll, 36)[0]
+
+    assert rent[11] == pytest.approx(1000)
+    assert rent[12] == pytest.approx(1000)   # half renews at 2000/month
+    assert rent[21] == pytest.approx(2000)   # re-let after downtime and free rent
+    assert annual_revenue(rent_roll, years=3).shape == (3,)
+
+def test_from_dataframe_defaults_and_validation():
+    df = pd.DataFrame({"square_footage": [1000, 2000], "rent_per_sf": [20, 30], "expiration_month": [12, 60]})
+    rent_roll = RentRoll.from_dataframe(df)
+    assert rent_roll.market_rent_per_sf.tolist() == [20, 30]
+    assert rent_roll.downtime_months.tolist() == [6, 6]
+
+    with pytest.raises(ValueError, match="Missing required lease columns"):
+        RentRoll.from_dataframe(df.drop(columns=["expiration_month"]))
+    with pytest.raises(ValueError, match="Renewal probability"):
+        RentRoll.from_dataframe(df.assign(renewal_probability=1.5))
+
+def test_fully_leased_building_matches_flat_growth(market_data):
+    # A single long lease without escalations gives flat revenue and no vacancy
+    rent_roll = RentRoll.from_leases([Lease(12000, 30, expiration_month=240, escalation=0.0)])
+    dcf = generate_rent_roll_dcf(rent_roll, market_data)
+
+    assert np.allclose(dcf.revenue[0], 360000)
+    assert dcf.vacancy_rate[0] == 0
+    assert dcf.noi[0, -1] == pytest.approx(360000 * 0.6)
+    assert dcf.fcf[0, -1] == pytest.approx(360000 * 0.58 + 360000 * 0.6 / 0.055)
+
+@pytest.mark.asyncio
+async def test_service_analyze_rent_roll(market_data):
+    cre_service = CREAnalysisService(AIConfig())
+    rng = np.random.default_rng(0)
+    leases = [
+        Lease(float(rng.integers(1000, 20000)), float(rng.uniform(20, 50)),
+              expiration_month=int(rng.integers(1, 120)), start_month=int(rng.integers(-60, 0)))
+        for _ in range(500)
+    ]
+    result = await cre_service.analyze_rent_roll(leases, market_data)
+
+    assert len(result["projections"]["revenue"]) == 10
+    assert 0 < result["assumptions"]["vacancy_rate"] < 1
+    assert np.isfinite(result["metrics"]["npv"])
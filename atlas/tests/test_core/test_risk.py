@@ -0,0 +1,154 @@
+import time
+import pytest
+import numpy as np
+from atlas.core.cre_analysis import CREAnalysisService, PropertyMetrics, Loan
+from atlas.core.columnar import PropertyMetricsTable, PROPERTY_DTYPE
+from atlas.core.config import AIConfig
+from atlas.core.risk import SubmarketBenchmarks, score_properties, risk_analyses, _percentile_rank
+
+@pytest.fixture
+def markets():
+    return {
+        "downtown": {"market_cap_rate": 0.05, "vacancy_rate": 0.12, "rent_growth": 0.01, "new_supply": 900000},
+        "suburban": {"market_cap_rate": 0.065, "vacancy_rate": 0.06, "rent_growth": 0.04, "new_supply": 100000},
+        "airport": {"market_cap_rate": 0.06, "vacancy_rate": 0.08, "rent_growth": 0.02, "new_supply": 300000}
+    }
+
+@pytest.fixture
+def metrics():
+    return [
+        PropertyMetrics(500000, 0.045, 0.97, 50000, 40, "Office", 2018, None),
+        PropertyMetrics(400000, 0.060, 0.80, 50000, 25, "Office", 1975, None),
+        PropertyMetrics(450000, 0.052, 0.90, 50000, 32, "Office", 1975, 2020),
+        PropertyMetrics(300000, 0.070, 0.95, 40000, 20, "Industrial", 1990, None)
+    ]
+
+SUBMARKETS = ["downtown", "downtown", "downtown", "suburban"]
+
+def test_percentile_rank_interpolates():
+    grid = np.tile(np.linspace(0, 100, 21), (4, 1))
+    grid[3] = np.nan
+    ranks = _percentile_rank(grid, np.array([-5.0, 50.0, 102.5, 10.0]))
+    assert ranks.tolist() == [0.0, 0.5, 1.0, 0.5]
+
+def test_scores_follow_inputs(metrics, markets):
+    benchmarks = SubmarketBenchmarks.build(metrics, SUBMARKETS, markets)
+    scores = score_properties(metrics, SUBMARKETS, benchmarks, as_of_year=2025)
+
+    # Downtown has the most new supply and the weakest demand of the three submarkets
+    assert scores.supply.tolist() == [1.0, 1.0, 1.0, 0.0]
+    assert scores.demand[0] == 1.0 and scores.demand[3] == 0.0
+    # Tighter cap rate and lower occupancy than peers are riskier
+    assert scores.cap_rate[0] > scores.cap_rate[2] > scores.cap_rate[1]
+    assert scores.tenant[1] > scores.tenant[0]
+    # Renovation resets the building age
+    assert scores.effective_age[1:3].tolist() == [50, 5]
+    # A submarket with a single property is neutral against itself
+    assert scores.cap_rate[3] == 0.5
+
+    with pytest.raises(ValueError, match="Unknown submarkets"):
+        score_properties(metrics, ["midtown"] * 4, benchmarks)
+
+def test_risk_analyses_shape(metrics, markets):
+    benchmarks = SubmarketBenchmarks.build(metrics, SUBMARKETS, markets)
+    analyses = risk_analyses(score_properties(metrics, SUBMARKETS, benchmarks))
+
+    assert len(analyses) == 4
+    analysis = analyses[1]
+    assert set(analysis) == {"risk_factors", "risk_score", "mitigants", "recommendations"}
+    components = [risk["score"] for group in analysis["risk_factors"].values() for risk in group.values()]
+    assert len(components) == 9
+    assert analysis["risk_score"] == pytest.approx(sum(components) / 9)
+    assert analysis["risk_factors"]["property_risks"]["tenant_risk"]["level"] in ("low", "medium", "high")
+
+@pytest.mark.asyncio
+async def test_results_do_not_share_mutable_state(metrics, markets):
+    cre_service = CREAnalysisService(AIConfig(), cache_size=0)
+    benchmarks = SubmarketBenchmarks.build(metrics, SUBMARKETS, markets)
+    first, second = risk_analyses(score_properties(metrics, SUBMARKETS, benchmarks))[:2]
+    first["mitigants"]["market_mitigants"].append("Edited")
+    first["recommendations"].clear()
+    first["risk_factors"]["financial_risks"]["leverage_risk"]["score"] = 1.0
+    assert "Edited" not in second["mitigants"]["market_mitigants"]
+    assert second["recommendations"]
+    assert second["risk_factors"]["financial_risks"]["leverage_risk"]["score"] == 0.1
+
+    single = await cre_service._assess_risks(metrics[0], markets["downtown"], {})
+    single["mitigants"]["market_mitigants"].clear()
+    again = await cre_service._assess_risks(metrics[0], markets["downtown"], {})
+    assert again["mitigants"]["market_mitigants"]
+
+@pytest.mark.asyncio
+async def test_single_property_scores_follow_inputs(metrics):
+    cre_service = CREAnalysisService(AIConfig(), cache_size=0)
+    cold = {"market_cap_rate": 0.05, "vacancy_rate": 0.04, "rent_growth": 0.05, "new_supply": 0}
+    hot = {"market_cap_rate": 0.05, "vacancy_rate": 0.3, "rent_growth": -0.05, "new_supply": 5000000}
+
+    def scores(risks):
+        return {name: risk["score"] for group in ("market_risks", "property_risks")
+                for name, risk in risks["risk_factors"][group].items()}
+
+    calm = scores(await cre_service._assess_risks(metrics[0], cold, {}))
+    stressed = scores(await cre_service._assess_risks(metrics[0], hot, {}))
+    assert (calm["supply_risk"], stressed["supply_risk"]) == (0.0, 1.0)
+    assert (calm["demand_risk"], stressed["demand_risk"]) == (pytest.approx(0.1), 1.0)
+
+    occupied = PropertyMetrics(500000, 0.045, 0.99, 50000, 40, "Office", 2018, None)
+    half_empty = PropertyMetrics(500000, 0.065, 0.5, 50000, 40, "Office", 2018, None)
+    assert scores(await cre_service._assess_risks(occupied, cold, {}))["tenant_risk"] < 0.5
+    assert scores(await cre_service._assess_risks(half_empty, cold, {}))["tenant_risk"] == 1.0
+    # Bought 50bp inside the market cap rate is riskier than 150bp outside it
+    assert scores(await cre_service._assess_risks(occupied, cold, {}))["cap_rate_risk"] == pytest.approx(0.75)
+    assert scores(await cre_service._assess_risks(half_empty, cold, {}))["cap_rate_risk"] == 0.0
+
+    risks = await cre_service._assess_risks(metrics[0], {"rent_growth": 0.03}, {})
+    cap_rate_risk = risks["risk_factors"]["market_risks"]["cap_rate_risk"]
+    assert cap_rate_risk == {"level": "medium", "factors": ["Market cap rate spread: n/a"], "score": 0.5}
+    components = [risk["score"] for group in risks["risk_factors"].values() for risk in group.values()]
+    assert risks["risk_score"] == pytest.approx(sum(components) / 9)
+
+@pytest.mark.asyncio
+async def test_portfolio_refresh_matches_full_scoring(metrics, markets):
+    cre_service = CREAnalysisService(AIConfig())
+    portfolio = await cre_service.build_portfolio(metrics, SUBMARKETS, markets)
+    peer = portfolio.benchmarks.peer
+    rows = await cre_service.update_portfolio_market(portfolio, {"suburban": {"new_supply": 2000000}})
+    # Peer breakpoints come from the properties alone and are not rebuilt
+    assert portfolio.benchmarks.peer is peer
+    assert portfolio.benchmarks.market_data["suburban"]["new_supply"] == 2000000
+    # Suburban now has the most supply, which changes downtown's rank too
+    assert rows["risk"].tolist() == [0, 1, 2, 3]
+
+    used = {name: dict(markets[name]) for name in ("downtown", "suburban")}
+    used["suburban"]["new_supply"] = 2000000
+    expected = await cre_service.assess_portfolio_risks(metrics, SUBMARKETS, used)
+    assert [risk["risk_score"] for risk in portfolio.risks] == [risk["risk_score"] for risk in expected]
+
+@pytest.mark.asyncio
+async def test_service_scores_portfolio_with_loans(metrics, markets):
+    cre_service = CREAnalysisService(AIConfig())
+    loans = [Loan(noi / cap * 0.85, 0.03, term_years=5, floating=True) for noi, cap in
+             ((m.noi, m.cap_rate) for m in metrics)]
+    analyses = await cre_service.assess_portfolio_risks(metrics, SUBMARKETS, markets, loans=loans)
+
+    leverage = analyses[0]["risk_factors"]["financial_risks"]["leverage_risk"]
+    assert leverage["level"] == "high"
+    assert "Minimum DSCR" in leverage["factors"][0]
+
+def test_scores_large_portfolio_quickly(markets):
+    n = 100_000
+    rng = np.random.default_rng(0)
+    data = np.zeros(n, dtype=PROPERTY_DTYPE)
+    data['noi'] = rng.uniform(1e5, 1e7, n)
+    data['cap_rate'] = rng.uniform(0.04, 0.08, n)
+    data['occupancy'] = rng.uniform(0.6, 1.0, n)
+    data['rent_per_sf'] = rng.uniform(10, 60, n)
+    data['year_built'] = rng.integers(1950, 2024, n)
+    table = PropertyMetricsTable(data, ["Office"])
+    submarkets = rng.choice(list(markets), n).tolist()
+
+    start = time.perf_counter()
+    benchmarks = SubmarketBenchmarks.build(table, submarkets, markets)
+    analyses = risk_analyses(score_properties(table, submarkets, benchmarks))
+    assert len(analyses) == n
+    assert time.perf_counter() - start < 10
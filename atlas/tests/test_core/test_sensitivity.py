@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from atlas.core.cre_analysis import CREAnalysisService, PropertyMetrics
+from atlas.core.config import AIConfig
+from atlas.core.dcf import generate_dcf_batch
+from atlas.core.sensitivity import sensitivity_analysis
+
+@pytest.fixture
+def metrics():
+    return PropertyMetrics(
+        noi=500000,
+        cap_rate=0.05,
+        occupancy=0.95,
+        square_footage=50000,
+        rent_per_sf=30,
+        property_type="Office",
+        year_built=2010,
+        renovation_year=None
+    )
+
+@pytest.fixture
+def market_data():
+    return {
+        "market_cap_rate": 0.05,
+        "vacancy_rate": 0.07,
+        "rent_growth": 0.03
+    }
+
+def test_base_case_matches_dcf_model(metrics, market_data):
+    result = sensitivity_analysis(metrics, market_data, purchase_price=0.0)
+    expected = generate_dcf_batch([metrics], market_data).npv[0]
+    assert result["base"]["npv"] == pytest.approx(expected)
+
+def test_tornado_sorted_by_swing(metrics, market_data):
+    result = sensitivity_analysis(metrics, market_data)
+    swings = [entry["swing"] for entry in result["tornado"]]
+
+    assert len(swings) == 4
+    assert swings == sorted(swings, reverse=True)
+    growth = next(entry for entry in result["tornado"] if entry["parameter"] == "rent_growth")
+    assert growth["npv"] == sorted(growth["npv"])
+
+def test_grid_matches_pointwise_evaluation(metrics, market_data):
+    ranges = {
+        "rent_growth": np.linspace(0.0, 0.05, 6),
+        "exit_cap_rate": np.linspace(0.045, 0.07, 4)
+    }
+    result = sensitivity_analysis(metrics, market_data, ranges, grids=[("rent_growth", "exit_cap_rate")])
+    grid = np.array(result["grids"][0]["npv"])
+    assert grid.shape == (6, 4)
+
+    point_market = {**market_data, "rent_growth": 0.02, "market_cap_rate": 0.07 - 0.005}
+    point = sensitivity_analysis(metrics, point_market)
+    assert grid[2, 3] == pytest.approx(point["base"]["npv"])
+
+def test_invalid_parameters(metrics, market_data):
+    with pytest.raises(ValueError, match="Unknown sensitivity parameters"):
+        sensitivity_analysis(metrics, market_data, {"noi": [1, 2]})
+    with pytest.raises(ValueError, match="Invalid sensitivity grid"):
+        sensitivity_analysis(metrics, market_data, grids=[("rent_growth", "rent_growth")])
+
+@pytest.mark.asyncio
+async def test_sensitivity_service(metrics, market_data):
+    service = CREAnalysisService(AIConfig())
+    result = await service.sensitivity(metrics, market_data, grids=[("vacancy_rate", "discount_rate")])
+    assert {"base", "tornado", "grids"} <= result.keys()
+    assert np.array(result["grids"][0]["irr"]).shape == (5, 5)
+
+    with pytest.raises(ValueError, match="Market cap rate must be positive"):
+        await service.sensitivity(metrics, {**market_data, "market_cap_rate": 0})
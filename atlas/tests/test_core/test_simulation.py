@@ -0,0 +1,76 @@
+import pytest
+import numpy as np
+from atlas.core.cre_analysis import CREAnalysisService, PropertyMetrics
+from atlas.core.config import AIConfig
+from atlas.core.dcf import generate_dcf_batch
+from atlas.core.simulation import Distribution, SimulationConfig, simulate_property, simulate_portfolio
+
+@pytest.fixture
+def metrics():
+    return PropertyMetrics(
+        noi=500000,
+        cap_rate=0.05,
+        occupancy=0.95,
+        square_footage=50000,
+        rent_per_sf=30,
+        property_type="Office",
+        year_built=2010,
+        renovation_year=None
+    )
+
+@pytest.fixture
+def market_data():
+    return {
+        "market_cap_rate": 0.05,
+        "vacancy_rate": 0.07,
+        "rent_growth": 0.03
+    }
+
+def test_simulation_is_reproducible_and_chunked(metrics, market_data):
+    config = SimulationConfig(n_scenarios=5000, chunk_size=700, seed=11)
+    first = simulate_property(metrics, market_data, config, keep_samples=True)
+    second = simulate_property(metrics, market_data, config, keep_samples=True)
+
+    assert first.npv.shape == (5000,)
+    assert first.histogram_counts.sum() == 5000
+    assert np.array_equal(first.npv, second.npv)
+    assert first.npv_percentiles[5] < first.npv_percentiles[50] < first.npv_percentiles[95]
+
+def test_simulation_fixed_distributions_match_point_estimate(metrics, market_data):
+    config = SimulationConfig(
+        n_scenarios=10,
+        seed=1,
+        rent_growth=Distribution(kind="fixed", mean=0.03),
+        vacancy_rate=Distribution(kind="fixed", mean=0.07),
+        exit_cap_rate=Distribution(kind="fixed", mean=0.055),
+        purchase_price=0.0
+    )
+    result = simulate_property(metrics, market_data, config, keep_samples=True)
+    assert np.ptp(result.npv) == 0
+    assert result.npv[0] == pytest.approx(generate_dcf_batch([metrics], market_data).npv[0])
+    assert result.probability_of_loss == 0.0
+
+def test_simulation_probability_of_loss(metrics, market_data):
+    config = SimulationConfig(n_scenarios=2000, seed=5, purchase_price=1e9)
+    result = simulate_property(metrics, market_data, config)
+    assert result.probability_of_loss == 1.0
+
+def test_correlated_draws_require_normal(metrics, market_data):
+    config = SimulationConfig(
+        n_scenarios=100,
+        rent_growth=Distribution(kind="uniform", low=0.0, high=0.05),
+        correlation=np.eye(3)
+    )
+    with pytest.raises(ValueError, match="require normal distributions"):
+        simulate_property(metrics, market_data, config)
+
+@pytest.mark.asyncio
+async def test_simulate_portfolio_service(metrics, market_data):
+    service = CREAnalysisService(AIConfig())
+    config = SimulationConfig(n_scenarios=1000, seed=3)
+    results = await service.simulate_portfolio([metrics, metrics], market_data, config)
+
+    assert len(results) == 2
+    assert results[0]["npv_mean"] != results[1]["npv_mean"]
+    assert [r.npv_mean for r in simulate_portfolio([metrics, metrics], market_data, config)] == \
+        [r["npv_mean"] for r in results]
@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+from atlas.core.cre_analysis import CREAnalysisService, PropertyMetrics
+from atlas.core.config import AIConfig
+from atlas.core.simulation import SimulationConfig
+from atlas.core.waterfall import DEFAULT_TIERS, WaterfallTier, run_waterfall
+
+def reference_waterfall(cash_flows, tiers, lp_equity_share):
+    """Period-by-period waterfall used to check the vectorized version."""
+    balances = [0.0] * len(tiers)
+    lp = np.zeros(len(cash_flows))
+    gp = np.zeros(len(cash_flows))
+    lp_profit = gp_profit = 0.0
+    for t, cash_flow in enumerate(cash_flows):
+        contribution = max(-cash_flow, 0.0)
+        lp[t] -= contribution * lp_equity_share
+        gp[t] -= contribution * (1 - lp_equity_share)
+        lp_profit -= contribution * lp_equity_share
+        gp_profit -= contribution * (1 - lp_equity_share)
+        for k, tier in enumerate(tiers):
+            if tier.hurdle is not None:
+                balances[k] = balances[k] * (1 + tier.hurdle) + contribution * lp_equity_share
+        cash = max(cash_flow, 0.0)
+        for k, tier in enumerate(tiers):
+            if tier.hurdle is not None:
+                paid = min(cash, max(balances[k], 0.0) / tier.lp_share)
+            elif tier.catch_up is not None:
+                gp_share = 1 - tier.lp_share
+                target = (tier.catch_up * (lp_profit + gp_profit) - gp_profit) / (gp_share - tier.catch_up)
+                paid = min(cash, max(target, 0.0))
+            else:
+                paid = cash
+            cash -= paid
+            lp[t] += paid * tier.lp_share
+            gp[t] += paid * (1 - tier.lp_share)
+            lp_profit += paid * tier.lp_share
+            gp_profit += paid * (1 - tier.lp_share)
+            for j, other in enumerate(tiers):
+                if other.hurdle is not None:
+                    balances[j] -= paid * tier.lp_share
+        balances = [max(b, 0.0) for b in balances]
+    return lp, gp
+
+@pytest.fixture
+def paths():
+    rng = np.random.default_rng(3)
+    cash_flows = rng.uniform(0, 2e6, size=(200, 10))
+    cash_flows[:, 0] = -1e7
+    cash_flows[:, -1] += rng.uniform(0, 2e7, size=200)
+    return cash_flows
+
+def test_matches_period_by_period_reference(paths):
+    result = run_waterfall(paths, DEFAULT_TIERS, lp_equity_share=0.9)
+
+    for i in range(0, 200, 17):
+        lp, gp = reference_waterfall(paths[i], DEFAULT_TIERS, 0.9)
+        np.testing.assert_allclose(result.lp_cash_flows[i], lp, atol=1e-6)
+        np.testing.assert_allclose(result.gp_cash_flows[i], gp, atol=1e-6)
+
+    assert np.allclose(result.lp_cash_flows + result.gp_cash_flows, paths)
+    assert np.allclose(result.tier_cash.sum(axis=0), paths.clip(0))
+
+def test_hurdle_and_catch_up_are_hit_exactly():
+    cash_flows = np.array([-1000.0, 0, 0, 0, 3000.0])
+    tiers = [WaterfallTier(lp_share=1.0, hurdle=0.08), WaterfallTier(lp_share=0.0)]
+    result = run_waterfall(cash_flows, tiers, lp_equity_share=1.0)
+    assert result.lp_irr == pytest.approx(0.08)
+
+    tiers = [
+        WaterfallTier(lp_share=1.0, hurdle=0.08),
+        WaterfallTier(lp_share=0.0, catch_up=0.2),
+        WaterfallTier(lp_share=0.8)
+    ]
+    result = run_waterfall(cash_flows, tiers, lp_equity_share=1.0)
+    gp_share = result.gp_cash_flows.sum() / cash_flows.sum()
+    assert gp_share == pytest.approx(0.2)
+
+def test_many_deals_and_paths_at_once(paths):
+    stacked = np.stack([paths, paths * 1.1])
+    result = run_waterfall(stacked)
+
+    assert result.lp_irr.shape == (2, 200)
+    assert result.tier_cash.shape == (4, 2, 200, 10)
+    assert np.allclose(result.lp_irr[0], run_waterfall(paths).lp_irr, equal_nan=True)
+
+def test_invalid_tiers():
+    with pytest.raises(ValueError, match="last waterfall tier"):
+        run_waterfall(np.ones(3), [WaterfallTier(lp_share=1.0, hurdle=0.08)])
+    with pytest.raises(ValueError, match="exactly one"):
+        run_waterfall(np.ones(3), [WaterfallTier(lp_share=0.5), WaterfallTier(lp_share=0.5)])
+    with pytest.raises(ValueError, match="Catch-up"):
+        run_waterfall(np.ones(3), [WaterfallTier(lp_share=0.9, catch_up=0.2), WaterfallTier(lp_share=0.5)])
+
+@pytest.mark.asyncio
+async def test_service_waterfall_over_simulation():
+    cre_service = CREAnalysisService(AIConfig())
+    metrics = PropertyMetrics(500000, 0.05, 0.95, 50000, 30, "Office", 2010, None)
+    market = {"market_cap_rate": 0.05, "vacancy_rate": 0.07, "rent_growth": 0.03}
+    config = SimulationConfig(n_scenarios=2000, chunk_size=500, seed=1, purchase_price=8_000_000)
+
+    summary = await cre_service.equity_waterfall(metrics, market, config=config)
+    assert summary["n_scenarios"] == 2000
+    assert set(summary["hurdle_probabilities"]) == {0.08, 0.12}
+    assert summary["hurdle_probabilities"][0.08] >= summary["hurdle_probabilities"][0.12]
+    assert summary["lp_irr_percentiles"][50] <= summary["gp_irr_percentiles"][50]
@@ -0,0 +1,37 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from atlas import ATLAS
+from atlas.core.config import AIConfig
+from atlas.clients.base import ConnectionPoolManager
+from atlas.services.search import SearchService
+
+@pytest.fixture
+def config(tmp_path):
+    return AIConfig(tavily_api_key="test-key", serper_api_key="test-key", serpapi_api_key="test-key",
+                    response_cache_path=str(tmp_path / "responses.sqlite"))
+
+@pytest.mark.asyncio
+async def test_search_service_closes_pool_and_cache(config):
+    pool = ConnectionPoolManager()
+    async with SearchService(config) as service:
+        for client in (service.tavily_client, service.serper_client, service.serpapi_client):
+            client.pool = pool
+        http = await pool.client("https://api.tavily.com/search")
+
+    assert http.is_closed
+    assert service.response_cache._db is None
+
+@pytest.mark.asyncio
+async def test_atlas_closes_everything(monkeypatch):
+    atlas = ATLAS.__new__(ATLAS)
+    atlas.search = Mock(aclose=AsyncMock())
+    atlas.claude = Mock(aclose=AsyncMock())
+    pool_close = AsyncMock()
+    monkeypatch.setattr("atlas.http_pool.aclose", pool_close)
+
+    async with atlas:
+        pass
+
+    atlas.search.aclose.assert_awaited_once()
+    atlas.claude.aclose.assert_awaited_once()
+    pool_close.assert_awaited_once()
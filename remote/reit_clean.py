@@ -1,3 +1,4 @@
+import asyncio
 import json
 import pandas as pd
 from geopy.geocoders import Nominatim
@@ -8,9 +9,14 @@ from typing import Dict, List, Optional, Tuple
 import re
 import os
 from anthropic import Anthropic
-import backoff
 import anthropic
 from dotenv import load_dotenv
+from atlas.clients.ratelimit import rate_governor
+from atlas.clients.claude import ClaudeClient
+from atlas.clients.batch import LLMBatcher
+from atlas.clients.llm import LLMClient, LLMRequest, llm_response_cache
+from atlas.clients.resilience import CircuitOpenError, is_retryable, resilience
+from atlas.core.config import AIConfig
 
 # Load environment variables
 load_dotenv()
@@ -26,6 +32,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CLAUDE_MODEL = "claude-3-sonnet-20240229"
+
+ADDRESS_BATCH_SIZE = 50
+ADDRESS_BATCH_INSTRUCTIONS = """Fix and standardize each address for geocoding.
+Rules:
+1. Remove any template variables like {city}
+2. Remove descriptive text (e.g. "where companies", "is situated")
+3. Ensure street number, name and type are present
+4. Add city, state and zip if known
+5. Use standard USPS abbreviations
+6. Answer null if the address is invalid, incomplete or contains template variables"""
+ADDRESS_RESULT_FORMAT = '"<corrected address, e.g. 123 Main St, Houston, TX 77002>" or null'
+
+def _valid_enrichment(address: str, result) -> bool:
+    return result is None or isinstance(result, str)
+
 class REITCleaner:
     def __init__(self, input_file: str, output_file: str):
         self.input_file = input_file
@@ -42,6 +64,9 @@ class REITCleaner:
         if not api_key:
             raise ValueError("CLAUDE_API_KEY environment variable not set")
         self.claude = Anthropic(api_key=api_key)
+        self.ai_config = AIConfig(claude_api_key=api_key)
+        # Completions reused across runs: the same messy addresses come back every crawl
+        self.llm_cache = llm_response_cache(os.getenv('ATLAS_LLM_CACHE', 'reit_llm_cache.sqlite'))
         
         # Market coordinates remain the same
         self.market_coords = {
@@ -241,13 +266,22 @@ class REITCleaner:
         else:
             self._geocoded_cache = {}
 
+        def geocode_once(addr: str):
+            # One Nominatim token per attempt, retries included
+            with rate_governor.sync_slot("nominatim"):
+                return self.geolocator.geocode(f"{addr}, United States")
+
         def try_geocode(addr: str) -> Optional[Tuple[float, float]]:
             try:
-                location = self.geolocator.geocode(f"{addr}, United States")
+                location = resilience.call_sync(
+                    "nominatim.openstreetmap.org",
+                    lambda: geocode_once(addr),
+                    retryable=lambda e: isinstance(e, GeocoderTimedOut)
+                )
                 if location:
                     return location.latitude, location.longitude
                 return None
-            except (GeocoderTimedOut, GeocoderServiceError):
+            except (GeocoderTimedOut, GeocoderServiceError, CircuitOpenError):
                 return None
 
         # First attempt: Try original cleaned address
@@ -335,16 +369,8 @@ class REITCleaner:
         ]
         return any(re.search(pattern, address, re.IGNORECASE) for pattern in problematic_patterns)
 
-    @backoff.on_exception(backoff.expo, Exception, max_tries=3)
-    def enrich_address_with_claude(self, address: str) -> Optional[str]:
-        """Use Claude to fix problematic addresses"""
-        try:
-            response = self.claude.beta.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=1000,
-                messages=[{
-                    "role": "user",
-                    "content": f"""Fix and standardize this address for geocoding. If the address is invalid or contains template variables, return None.
+    def _address_prompt(self, address: str) -> str:
+        return f"""Fix and standardize this address for geocoding. If the address is invalid or contains template variables, return None.
 
                     Input address: {address}
                     
@@ -362,18 +388,62 @@ class REITCleaner:
                     "1000 Park Ave, New York, NY 10028"
                     None
                     """
-                }]
-            )
-            
-            cleaned = response.content[0].text.strip().strip('"')
-            if cleaned.lower() == 'none' or '{' in cleaned:
-                return None
-            return cleaned
+
+    @staticmethod
+    def _parse_enriched(text: str) -> Optional[str]:
+        cleaned = text.strip().strip('"')
+        if cleaned.lower() == 'none' or '{' in cleaned:
+            return None
+        return cleaned
+
+    def enrich_address_with_claude(self, address: str) -> Optional[str]:
+        """Use Claude to fix problematic addresses (blocking; see `enrich_addresses`)"""
+        request = LLMRequest(self._address_prompt(address), CLAUDE_MODEL, max_tokens=1000, temperature=0.0)
+        cached = self.llm_cache.lookup(ClaudeClient.provider, request.cache_key())
+        if cached is not None:
+            return self._parse_enriched(cached)
+        try:
+            def create():
+                # One token per attempt, retries included
+                rate_governor.limiter("anthropic").acquire_sync()
+                return self.claude.beta.messages.create(
+                    model=request.model,
+                    max_tokens=request.max_tokens,
+                    temperature=request.temperature,
+                    messages=request.messages()
+                )
+            response = resilience.call_sync("api.anthropic.com", create,
+                                            retryable=lambda e: is_retryable(e) or isinstance(e, anthropic.APIConnectionError))
+            text = response.content[0].text
+            self.llm_cache.set(ClaudeClient.provider, request.cache_key(), text)
+            return self._parse_enriched(text)
             
         except Exception as e:
             logger.warning(f"Claude API error: {str(e)}")
             return None
 
+    async def enrich_address_async(self, address: str, llm: ClaudeClient) -> Optional[str]:
+        """Non-blocking `enrich_address_with_claude`"""
+        try:
+            return self._parse_enriched(
+                await llm.complete(self._address_prompt(address), max_tokens=1000, temperature=0.0)
+            )
+        except Exception as e:
+            logger.warning(f"Claude API error: {str(e)}")
+            return None
+
+    async def enrich_addresses(self, addresses: List[str], llm: Optional[LLMClient] = None) -> Dict[str, Optional[str]]:
+        """Enrich many addresses, ADDRESS_BATCH_SIZE per Claude call"""
+        llm = llm or ClaudeClient(self.ai_config, model=CLAUDE_MODEL, cache=self.llm_cache)
+        batcher = LLMBatcher(llm, ADDRESS_BATCH_INSTRUCTIONS, ADDRESS_RESULT_FORMAT,
+                             batch_size=ADDRESS_BATCH_SIZE, validate=_valid_enrichment)
+        results = await batcher.run(addresses)
+        logger.info(f"Enriched {len(addresses)} addresses in {batcher.round_trips} Claude calls")
+        return {
+            result.query: self._parse_enriched(result.result) if result.ok and result.result else None
+            for result in results
+        }
+
     def clean_data(self) -> None:
         logger.info("=" * 50)
         logger.info("Starting REIT data cleaning process")
@@ -421,13 +491,11 @@ class REITCleaner:
         total_to_enrich = len(missing_coords)
         logger.info(f"Starting Claude enrichment for {total_to_enrich} addresses")
         
+        addresses = [address for address in missing_coords['clean_address'].unique() if address]
+        enrichments = asyncio.run(self.enrich_addresses(addresses)) if addresses else {}
         for idx, (i, row) in enumerate(missing_coords.iterrows(), 1):
             logger.info(f"Enriching [{idx}/{total_to_enrich}]: {row['clean_address']}")
-            enriched = self.enrich_address_with_claude(
-                row['clean_address'],
-                row['company'],
-                row['market']
-            )
+            enriched = enrichments.get(row['clean_address'])
             if enriched:
                 logger.info(f"✓ Claude enriched: {row['clean_address']} -> {enriched}")
             else:
@@ -440,6 +508,7 @@ class REITCleaner:
         logger.info(f"Final properties: {len(df)}")
         logger.info(f"Properties with coordinates: {df['latitude'].notna().sum()}")
         logger.info(f"Success rate: {(df['latitude'].notna().sum()/len(df))*100:.1f}%")
+        logger.info(f"LLM cache: {self.llm_cache.stats()}")
         logger.info("=" * 50)
 
 def main():
@@ -8,6 +8,7 @@ from typing import List, Dict
 from dataclasses import dataclass
 from geopy.geocoders import Nominatim
 from dotenv import load_dotenv
+from atlas.clients.ratelimit import rate_governor
 from datetime import datetime
 
 # Configure logging
@@ -87,7 +88,9 @@ class REITAddressFinder:
         }
         
         try:
-            async with session.post(self.tavily_url, json=params, ssl=False) as response:
+            limiter = rate_governor.limiter("tavily")
+            async with limiter.slot(), session.post(self.tavily_url, json=params, ssl=False) as response:
+                limiter.observe(response.status, response.headers.get('Retry-After'))
                 if response.status == 200:
                     data = await response.json()
                     results_count = len(data.get('results', []))
@@ -128,7 +131,6 @@ class REITAddressFinder:
                                     market
                                 )
                                 all_properties.extend(properties)
-                            await asyncio.sleep(2)  # Rate limiting
                         except Exception as e:
                             logger.error(f"Error searching {query}: {e}")
         
@@ -199,7 +201,8 @@ class REITAddressFinder:
                     
                     # Geocode the address
                     try:
-                        location = self.geolocator.geocode(address)
+                        with rate_governor.sync_slot("nominatim"):
+                            location = self.geolocator.geocode(address)
                         if location:
                             property.latitude = location.latitude
                             property.longitude = location.longitude
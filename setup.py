@@ -13,6 +13,7 @@ setup(
         'pytest-mock==3.12.0',
         'pandas==2.1.0',
         'numpy==1.24.0',
+        'numpy-financial==1.0.0',
         'backoff==2.2.1',
         'prometheus-client==0.17.1',
         'httpx==0.27.0'